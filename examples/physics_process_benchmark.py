@@ -0,0 +1,82 @@
+"""
+Benchmark : a lot of falling boxes, with the physics world stepped in the game process
+then in a separate process.
+
+Run with :
+    python physics_process_benchmark.py
+    python physics_process_benchmark.py --process
+"""
+import logging
+import random
+import sys
+import time
+
+import kge
+from kge import *
+
+N_BOXES = 2_000
+N_FRAMES = 120
+
+
+class Box(Entity):
+    """
+    A dynamic box
+    """
+
+    def __init__(self, **_):
+        super().__init__()
+        self.addComponent(RigidBody())
+        self.addComponent(BoxCollider())
+
+
+class Ground(Entity):
+    """
+    A static box under the boxes
+    """
+
+    def __init__(self, **_):
+        super().__init__()
+        self.scale = Vector(200, 1)
+        self.addComponent(RigidBody(RigidBodyType.STATIC))
+        self.addComponent(BoxCollider())
+
+
+class FrameTimer(Behaviour):
+    """
+    Time the frames once the bodies have been created
+    """
+
+    # the number of frames to time, set after creating the behaviour
+    frames = N_FRAMES
+    count = 0
+    start = 0
+
+    def on_update(self, ev: events.Update, dispatch):
+        if Physics.instance.world is None or Physics.instance.world.bodyCount <= N_BOXES:
+            return
+
+        if self.count == 0:
+            self.start = time.perf_counter()
+        self.count += 1
+
+        if self.count == self.frames:
+            elapsed = time.perf_counter() - self.start
+            print(f"{N_BOXES} boxes : {elapsed * 1000 / self.frames:.2f} ms per frame")
+
+
+def setup(scene: Scene):
+    rand = random.Random(0)
+    scene.add(Ground(name="Ground"), Vector(0, -10))
+    scene.addAll(*((Box(name=f"Box {i}"), Vector(rand.uniform(-90, 90), rand.uniform(0, 100)), 0)
+                   for i in range(N_BOXES)))
+
+    timer = Empty(name="Timer")
+    frame_timer = FrameTimer()
+    frame_timer.frames = N_FRAMES - 10
+    timer.addComponent(frame_timer)
+    scene.add(timer)
+
+
+if __name__ == '__main__':
+    kge.run(setup, log_level=logging.WARNING, headless=True, max_frames=N_FRAMES,
+            physics_process="--process" in sys.argv)
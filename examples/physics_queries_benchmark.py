@@ -0,0 +1,95 @@
+"""
+Benchmark : cast a lot of rays and query a lot of regions, like the vision cones
+of many enemies, with the scalar queries in a loop then with the batched queries.
+
+Run with :
+    python physics_queries_benchmark.py
+"""
+import logging
+import math
+import random
+import time
+
+import kge
+from kge import *
+
+N_WALLS = 500
+N_QUERIES = 1_000
+
+
+class Wall(Entity):
+    """
+    A static box with a collider
+    """
+
+    def __init__(self, **_):
+        super().__init__()
+        self.addComponent(RigidBody(RigidBodyType.STATIC))
+        self.addComponent(BoxCollider())
+
+
+class QueryBenchmark(Behaviour):
+    """
+    Run the queries once the walls are in the physics world
+    """
+
+    # the number of queries of each kind, set after creating the behaviour
+    n = N_QUERIES
+    done = False
+
+    def on_update(self, ev: events.Update, dispatch):
+        world = Physics.instance.world
+        if self.done or world is None or world.bodyCount < N_WALLS:
+            return
+        # the colliders are attached to the bodies once they are created
+        if any(not body.fixtures for body in world.bodies):
+            return
+        self.done = True
+
+        rand = random.Random(0)
+        origins = [Vector(rand.uniform(-50, 50), rand.uniform(-50, 50)) for _ in range(self.n)]
+        directions = []
+        for _ in range(self.n):
+            angle = rand.uniform(0, 2 * math.pi)
+            directions.append(Vector(math.cos(angle), math.sin(angle)))
+        sizes = [Vector(4, 4)] * self.n
+
+        start = time.perf_counter()
+        scalar_hits = sum(Physics.ray_cast(o, d, 20).hit for o, d in zip(origins, directions))
+        scalar = time.perf_counter()
+        batch_hits = Physics.ray_cast_many(origins, directions, 20).hits
+        batch = time.perf_counter()
+        print(f"{self.n} ray casts    : loop {(scalar - start) * 1000:.2f} ms ({scalar_hits} hits), "
+              f"batch {(batch - scalar) * 1000:.2f} ms ({batch_hits} hits)")
+
+        start = time.perf_counter()
+        scalar_found = sum(len(Physics.query_region(c, s).colliders) for c, s in zip(origins, sizes))
+        scalar = time.perf_counter()
+        batch_found = sum(len(found) for found in Physics.query_regions(origins, sizes))
+        batch = time.perf_counter()
+        print(f"{self.n} region queries : loop {(scalar - start) * 1000:.2f} ms ({scalar_found} found), "
+              f"batch {(batch - scalar) * 1000:.2f} ms ({batch_found} found)")
+
+        start = time.perf_counter()
+        scalar_found = sum(len(Physics.overlap_circle(c, 2).colliders) for c in origins)
+        scalar = time.perf_counter()
+        batch_found = sum(len(found) for found in Physics.overlap_circles(origins, 2))
+        batch = time.perf_counter()
+        print(f"{self.n} circle overlaps : loop {(scalar - start) * 1000:.2f} ms ({scalar_found} found), "
+              f"batch {(batch - scalar) * 1000:.2f} ms ({batch_found} found)")
+
+
+def setup(scene: Scene):
+    rand = random.Random(1)
+    scene.addAll(*((Wall(name=f"Wall {i}"), Vector(rand.uniform(-50, 50), rand.uniform(-50, 50)), 0)
+                   for i in range(N_WALLS)))
+
+    benchmark = Empty(name="Benchmark")
+    queries = QueryBenchmark()
+    queries.n = N_QUERIES
+    benchmark.addComponent(queries)
+    scene.add(benchmark)
+
+
+if __name__ == '__main__':
+    kge.run(setup, log_level=logging.WARNING, headless=True, max_frames=60)
@@ -0,0 +1,85 @@
+"""
+Benchmark : spawn and destroy a lot of entities, like bullets in a bullet-hell game.
+
+Run with :
+    python spawn_benchmark.py
+"""
+import logging
+import time
+
+import kge
+from kge import *
+
+N_ENTITIES = 10_000
+
+
+class Bullet(Entity):
+    """
+    An entity listening to a few events
+    """
+
+    def on_update(self, ev: events.Update, dispatch):
+        pass
+
+    def on_collision_enter(self, ev: events.CollisionEnter, dispatch):
+        pass
+
+    def on_destroy_entity(self, ev: events.DestroyEntity, dispatch):
+        pass
+
+
+def bench_event_map(n: int = N_ENTITIES):
+    """
+    Register then unregister the events of 'n' entities
+    """
+    scene = Scene()
+    bullets = [Bullet(name=f"Bullet {i}") for i in range(n)]
+
+    start = time.perf_counter()
+    for bullet in bullets:
+        scene.register_events(bullet)
+    registered = time.perf_counter()
+
+    for bullet in bullets:
+        scene.unregister_events(bullet)
+    unregistered = time.perf_counter()
+
+    print(f"register {n} entities   : {(registered - start) * 1000:.2f} ms")
+    print(f"unregister {n} entities : {(unregistered - registered) * 1000:.2f} ms")
+
+
+class Spawner(Behaviour):
+    """
+    Spawn bullets on the first frame, and destroy them on the second one
+    """
+
+    # the number of bullets, set after creating the behaviour
+    n = N_ENTITIES
+    bullets = ()
+    start = 0
+
+    def on_update(self, ev: events.Update, dispatch):
+        if not self.bullets:
+            self.start = time.perf_counter()
+            self.bullets = [Bullet(name=f"Bullet {i}") for i in range(self.n)]
+            for bullet in self.bullets:
+                ev.scene.add(bullet)
+        elif self.start:
+            for bullet in self.bullets:
+                bullet.destroy()
+            print(f"spawn & destroy {self.n} entities in a headless engine : "
+                  f"{(time.perf_counter() - self.start) * 1000:.2f} ms")
+            self.start = 0
+
+
+def setup(scene: Scene):
+    spawner = Empty(name="Spawner")
+    bullets = Spawner()
+    bullets.n = N_ENTITIES
+    spawner.addComponent(bullets)
+    scene.add(spawner)
+
+
+if __name__ == '__main__':
+    bench_event_map()
+    kge.run(setup, log_level=logging.WARNING, headless=True, max_frames=10)
@@ -16,9 +16,20 @@ import io
 version = '1.1'
 
 import logging
+import os
+import sys
 from typing import Callable
 
+import pyglet
+
+# pyglet opens a hidden "shadow" window as soon as GL is imported, which fails without
+# a display (servers, CI) : headless engines never use it, set KGE_HEADLESS to skip it too
+if os.environ.get("KGE_HEADLESS") or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+    pyglet.options['shadow_window'] = False
+
 from kge.audio.audio_manager import Audio
+from kge.resources.cache import Assets
+from kge.resources.preloader import AssetManifest
 from kge.audio.sound import Sound
 from kge.core import events
 from kge.core.behaviour import Behaviour
@@ -26,13 +37,17 @@ from kge.core.camera import Camera
 from kge.core.component import Component
 from kge.core.constants import *
 from kge.core.entity import Entity
+from kge.core.entity_pool import EntityPool
 from kge.core.events import Event
 from kge.core.scene import Scene
+from kge.core.snapshot import Snapshot, SnapshotRecorder
 from kge.core.service_provider import ServiceProvider
 from kge.engine import Engine
 from kge.graphics.animation import Animation, Frame
 from kge.graphics.animator import Animator, ANY
-from kge.graphics.image import Image, TiledImage
+from kge.graphics.atlas import TextureAtlas
+from kge.graphics.texture_cache import TextureCache
+from kge.graphics.image import Image, SpriteSheet, TiledImage
 from kge.graphics.renderer import Window
 from kge.graphics.shapes import (Circle, Triangle, Square, Shape, OutlinedCircle, OutLinedSquare,
                                  OutlinedTriangle)
@@ -65,6 +80,7 @@ __all__ = [
     # Services
     "Physics",
     "Audio",
+    "Assets",
     "Window",
     "Inputs",
     "DebugDraw",
@@ -106,6 +122,10 @@ __all__ = [
     "Sound",
     "Image",
     "TiledImage",
+    "SpriteSheet",
+    "TextureAtlas",
+    "TextureCache",
+    "AssetManifest",
     "Box",
 
     # Physics Components & Utils
@@ -129,6 +149,11 @@ __all__ = [
     "Canvas",
     "Entity",
     "Empty",
+    "EntityPool",
+
+    # Rollback & rewinding
+    "Snapshot",
+    "SnapshotRecorder",
 
     # UI elements
     "Text",
@@ -179,11 +204,15 @@ class Empty(Entity):
         return inst
 
 
-def _make_kwargs(setup, title, engine_opts):
+def _make_kwargs(setup, title, engine_opts, manifest=None):
+    scene_kwargs = {
+        "set_up": setup,
+    }
+    if manifest is not None:
+        scene_kwargs["manifest"] = manifest
+
     kwargs = {
-        "scene_kwargs": {
-            "set_up": setup,
-        },
+        "scene_kwargs": scene_kwargs,
         "window_title": title,
         **engine_opts
     }
@@ -203,6 +232,7 @@ def run(
         fullscreen=False,
         vsync=False,
         pixel_ratio=DEFAULT_PIXEL_RATIO,
+        manifest: AssetManifest = None,
         **engine_opts):
     """
     Run a game.
@@ -215,6 +245,24 @@ def run(
     something is behaving oddly.
 
     starting_scene let's you change the scene used by the engine.
+
+    manifest lists the images & sounds decoded in the background before the
+    scene starts, while the loading screen shows the progress.
+
+    headless=True runs the game without any window (for servers & CI), stop it
+    after a given number of frames with max_frames. Without a display, or with the
+    KGE_HEADLESS environment variable set, kge is imported without creating any GL context.
+
+    physics_process=True steps the physics world in a separate process.
+
+    asset_budget sets the size (in bytes) over which the decoded images and sounds
+    not used by the current scene are evicted, least recently used first.
+
+    texture_atlas=True packs the images of the sprites of each scene in a few textures
+    when it is loaded (of atlas_size pixels, with atlas_padding pixels between the images).
+
+    texture_cache=".texture_cache" keeps the decoded images in this folder, so that the
+    next runs skip decoding them (pre-warm it with 'python -m kge.graphics.texture_cache').
     """
     # output = io.StringIO()
     # if show_log:
@@ -233,11 +281,13 @@ def run(
                      # console_output=output,
                      vsync=vsync,
                      resolution=resolution,
+                     manifest=manifest,
                      **engine_opts) as eng:
         eng.run()
 
 
 def make_engine(setup: Callable[[Scene], None] = None, *,
                 starting_scene=Scene, title="Kiss Game Engine",
+                manifest: AssetManifest = None,
                 **engine_opts):
-    return Engine(starting_scene, **_make_kwargs(setup, title, engine_opts))
+    return Engine(starting_scene, **_make_kwargs(setup, title, engine_opts, manifest))
@@ -4,7 +4,9 @@ from typing import Union
 import pyglet
 
 import kge
+import kge.resources.vfs as vfs
 from kge.resources.assetlib import AbstractAsset
+from kge.resources.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -12,18 +14,40 @@ logger = logging.getLogger(__name__)
 class Sound(AbstractAsset):
     """
     Asset for sound
+
+    Sounds are decoded once and kept in the asset cache, long sounds (like musics)
+    should be streamed :
+        >>> music = Sound("music.ogg", streaming=True)
     """
+    cache_kind = 'sound'
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, streaming: bool = False):
         self.name = name
+        self.streaming = streaming
+
+    def is_loaded(self):
+        return self.streaming or (self.cache_kind, self.name) in cache
 
     def load(self) -> Union[pyglet.media.Source, None]:
         """
         Load and return sound
         """
+        if not self.streaming:
+            source = cache.get(self.cache_kind, self.name)
+            if source is not None:
+                return source
+
+        return self.store(self.read())
+
+    def read(self) -> Union[pyglet.media.Source, None]:
+        """
+        Decode the sound (or open its stream), can be called from a background thread
+        """
         try:
-            return pyglet.media.load(self.name,
-                                         streaming=True)  # type: pyglet.media.Source
+            # Read from the mounted packs first
+            file = vfs.open(self.name) if vfs.find(self.name) is not None else None
+            source = pyglet.media.load(self.name, file=file,
+                                       streaming=self.streaming)  # type: pyglet.media.Source
         except EOFError:
             logger.warning(f"The sound File '{self.name}' is empty, it won't play.")
             return None
@@ -31,6 +55,17 @@ class Sound(AbstractAsset):
             logger.warning(f"The sound File '{self.name}' was not found, it won't play.")
             return None
             # raise OSError(f"The sound File '{self.name}' was not found")
+        return source
+
+    def store(self, source: Union[pyglet.media.Source, None]) -> Union[pyglet.media.Source, None]:
+        """
+        Add a sound decoded by 'read' to the cache
+        """
+        if source is not None and not self.streaming:
+            # size of the decoded samples
+            size = int(source.audio_format.bytes_per_second * (source.duration or 0)) if source.audio_format else 0
+            cache.put(self.cache_kind, self.name, source, size)
+        return source
 
     def play(self, volume: float = 10, loop: bool = False, pitch=1):
         """
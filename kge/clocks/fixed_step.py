@@ -0,0 +1,72 @@
+from kge.core.constants import FIXED_DELTA_TIME, MAX_FIXED_STEPS
+
+
+class FixedStepClock:
+    """
+    An accumulator that converts variable frame times into a number of fixed steps.
+
+    The time left in the accumulator gives the interpolation factor ('alpha') between
+    the previous and the current simulated state.
+    Example:
+        >>> clock = FixedStepClock(1 / 60)
+        >>> for _ in range(clock.advance(dt)):
+        >>>     world.Step(clock.time_step, 10, 10)
+        >>> alpha = clock.alpha
+    """
+
+    def __init__(self, time_step: float = FIXED_DELTA_TIME, max_steps: int = MAX_FIXED_STEPS):
+        if time_step <= 0:
+            raise ValueError("time step should be strictly positive")
+        if max_steps < 1:
+            raise ValueError("there should be at least one step per frame")
+
+        self.time_step = time_step
+        self.max_steps = max_steps
+        self.accumulator = 0.
+        self.dropped_time = 0.
+
+    def advance(self, dt: float) -> int:
+        """
+        Add the time elapsed since the last frame, and return the number of steps to run.
+
+        When more than 'max_steps' are late, the remaining time is dropped
+        in order to avoid the spiral of death.
+        """
+        self.accumulator += dt
+        # the epsilon prevents losing a step to float rounding
+        steps = int(self.accumulator / self.time_step + 1e-9)
+
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.time_step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+            steps = self.max_steps
+
+        self.accumulator -= steps * self.time_step
+
+        # avoid negative remainders due to float rounding
+        if self.accumulator < 0:
+            self.accumulator = 0.
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        The interpolation factor between the previous and the current step, in [0, 1]
+        """
+        return min(self.accumulator / self.time_step, 1.)
+
+    def reset(self):
+        """
+        Empty the accumulator
+        """
+        self.accumulator = 0.
+        self.dropped_time = 0.
+
+
+if __name__ == '__main__':
+    clock = FixedStepClock(1 / 60)
+
+    # a hitch of 250 ms only runs 'MAX_FIXED_STEPS' steps
+    for dt in (1 / 144, 1 / 144, 1 / 30, 0.25):
+        print(f"dt={dt:.4f} steps={clock.advance(dt)} alpha={clock.alpha:.2f} dropped={clock.dropped_time:.4f}")
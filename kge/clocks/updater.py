@@ -32,6 +32,12 @@ class Updater(System):
             self.update_entities, dt
         )
 
+    def fire(self, event: events.Event):
+        """
+        Send an event of the updater (the update and the event after it)
+        """
+        self._dispatch(event)
+
     def update_entities(self, time_delta: float):
         start = time.monotonic()
         dispatch = self._dispatch
@@ -49,7 +55,7 @@ class Updater(System):
             event = self.event_to_dispatch.__call__(time_delta, scene)  # type: Union[events.Update, events.FixedUpdate]
 
             # Dispatch to behaviours
-            self._dispatch(event)
+            self.fire(event)
 
             # Get registered entities for event
             entities = event.scene.registered_entities(event)
@@ -67,7 +73,8 @@ class Updater(System):
                 else:
                     dt = event.fixed_delta_time
 
-                # add the time elapsed in the loop
-                dt += time.monotonic() - start
-                self._dispatch(self.after_event.__call__(
+                # add the time elapsed in the loop, a headless engine stays deterministic
+                if not self.engine.headless:
+                    dt += time.monotonic() - start
+                self.fire(self.after_event.__call__(
                     delta_time=dt, scene=event.scene))
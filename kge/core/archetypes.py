@@ -0,0 +1,227 @@
+from typing import Dict, FrozenSet, Iterator, List, Tuple, Type, Any
+
+from kge.core.component import BaseComponent
+from kge.core.entity import BaseEntity
+from kge.core.transform import Transform
+
+Signature = FrozenSet[Type[BaseComponent]]
+
+
+def signature_of(entity: BaseEntity) -> Signature:
+    """
+    Get the types of the components of an entity, with their base classes
+    """
+    return frozenset(kind for kind, components in entity.components.items() if components)
+
+
+class Archetype:
+    """
+    The entities which share the same component signature.
+
+    Each component type has a dense column aligned with 'entities', columns are
+    created on their first query. Entities are removed by swapping them with the
+    last one, so that rows stay packed.
+
+    A column holds one component per entity : if an entity has many components of
+    a type, only one of them is in the column (use 'getComponents' to get them all).
+    """
+    __slots__ = ("signature", "entities", "columns", "_rows")
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.entities = []  # type: List[BaseEntity]
+        self.columns = {}  # type: Dict[Type[BaseComponent], List[BaseComponent]]
+        self._rows = {}  # type: Dict[BaseEntity, int]
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __repr__(self):
+        names = sorted(kind.__name__ for kind in self.signature if kind is not object)
+        return f"Archetype({', '.join(names)} : {len(self)} entities)"
+
+    @staticmethod
+    def _value(entity: BaseEntity, kind: Type[BaseComponent]) -> BaseComponent:
+        if kind is Transform:
+            return entity._transform
+        return next(iter(entity.components[kind]))
+
+    def matches(self, kinds: Tuple[Type[BaseComponent], ...]) -> bool:
+        """
+        Check if the entities of this archetype have components of all the types given
+        """
+        return all(kind is Transform or kind in self.signature for kind in kinds)
+
+    def column(self, kind: Type[BaseComponent]) -> List[BaseComponent]:
+        """
+        Get the components of type 'kind', in the same order as the entities
+        """
+        try:
+            return self.columns[kind]
+        except KeyError:
+            column = self.columns[kind] = [self._value(e, kind) for e in self.entities]
+            return column
+
+    def add(self, entity: BaseEntity):
+        self._rows[entity] = len(self.entities)
+        self.entities.append(entity)
+        for kind, column in self.columns.items():
+            column.append(self._value(entity, kind))
+
+    def refresh(self, entity: BaseEntity):
+        """
+        Update the row of an entity whose components changed without changing its signature
+        """
+        row = self._rows[entity]
+        for kind, column in self.columns.items():
+            column[row] = self._value(entity, kind)
+
+    def remove(self, entity: BaseEntity):
+        row = self._rows.pop(entity)
+        last = self.entities.pop()
+
+        if last is not entity:
+            # Move the last entity in the hole
+            self.entities[row] = last
+            self._rows[last] = row
+            for column in self.columns.values():
+                column[row] = column.pop()
+        else:
+            for column in self.columns.values():
+                column.pop()
+
+
+class QueryView:
+    """
+    A cached view over the archetypes whose entities have all the component types queried.
+
+    Iterating the view gives a tuple (entity, component1, component2...) per active entity,
+    with one component of each type (see 'Archetype').
+        >>> for entity, transform, rb in scene.query(Transform, RigidBody):
+        >>>     ...
+    """
+
+    def __init__(self, kinds: Tuple[Type[BaseComponent], ...]):
+        self.kinds = kinds
+        self.archetypes = []  # type: List[Archetype]
+
+    def __len__(self):
+        return sum(len(archetype) for archetype in self.archetypes)
+
+    def __repr__(self):
+        return f"QueryView({', '.join(kind.__name__ for kind in self.kinds)} : {len(self)} entities)"
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        for archetype in self.archetypes:
+            columns = [archetype.column(kind) for kind in self.kinds]
+            for row in zip(archetype.entities, *columns):
+                if row[0].is_active:
+                    yield row
+
+    def chunks(self) -> Iterator[Tuple[List[Any], ...]]:
+        """
+        Get the dense columns of each archetype as (entities, components1, components2...),
+        inactive entities are included.
+
+        Don't add or remove components while iterating the columns.
+        """
+        for archetype in self.archetypes:
+            if archetype.entities:
+                yield (archetype.entities, *(archetype.column(kind) for kind in self.kinds))
+
+    def entities(self) -> Iterator[BaseEntity]:
+        """
+        Get the active entities matching the query
+        """
+        for archetype in self.archetypes:
+            for entity in archetype.entities:
+                if entity.is_active:
+                    yield entity
+
+
+class ArchetypeStore:
+    """
+    Group the entities of a scene by component signature.
+
+    The store is created by the scene on its first query, so scenes which never query
+    do not pay for keeping it up to date.
+        >>> store = ArchetypeStore()
+        >>> store.add(player)
+        >>> store.query(Transform, RigidBody)
+        QueryView(Transform, RigidBody : 1 entities)
+    """
+
+    def __init__(self):
+        self._archetypes = {}  # type: Dict[Signature, Archetype]
+        self._locations = {}  # type: Dict[BaseEntity, Archetype]
+        self._queries = {}  # type: Dict[Tuple[Type[BaseComponent], ...], QueryView]
+
+    def __contains__(self, entity: BaseEntity):
+        return entity in self._locations
+
+    def __len__(self):
+        return len(self._locations)
+
+    @property
+    def archetypes(self) -> List[Archetype]:
+        return list(self._archetypes.values())
+
+    def _archetype(self, signature: Signature) -> Archetype:
+        try:
+            return self._archetypes[signature]
+        except KeyError:
+            archetype = self._archetypes[signature] = Archetype(signature)
+
+            # Add the new archetype to the cached queries it matches
+            for kinds, view in self._queries.items():
+                if archetype.matches(kinds):
+                    view.archetypes.append(archetype)
+            return archetype
+
+    def add(self, entity: BaseEntity):
+        """
+        Add an entity, or move it to its new archetype if its components changed
+        """
+        signature = signature_of(entity)
+        current = self._locations.get(entity)
+
+        if current is not None:
+            if current.signature == signature:
+                current.refresh(entity)
+                return
+            current.remove(entity)
+
+        archetype = self._archetype(signature)
+        archetype.add(entity)
+        self._locations[entity] = archetype
+
+    update = add
+
+    def remove(self, entity: BaseEntity):
+        """
+        Remove an entity if it is in the store
+        """
+        archetype = self._locations.pop(entity, None)
+        if archetype is not None:
+            archetype.remove(entity)
+
+    def query(self, *kinds: Type[BaseComponent]) -> QueryView:
+        """
+        Get the view of the entities having components of all the types given
+        """
+        for kind in kinds:
+            if not isinstance(kind, type) or not issubclass(kind, BaseComponent):
+                raise TypeError("query() arguments should be component types (subtypes of 'kge.BaseComponent')")
+
+        try:
+            return self._queries[kinds]
+        except KeyError:
+            view = self._queries[kinds] = QueryView(kinds)
+            view.archetypes = [a for a in self._archetypes.values() if a.matches(kinds)]
+            return view
+
+    def clear(self):
+        self._archetypes.clear()
+        self._locations.clear()
+        for view in self._queries.values():
+            view.archetypes.clear()
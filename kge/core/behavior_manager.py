@@ -13,12 +13,16 @@ class BehaviourManager(ComponentSystem):
         super().__init__(engine, **_)
         self.components_supported = [Behaviour]
 
+    def handles(self, event: Event) -> bool:
+        # Behaviours can listen to any event
+        return True
+
     def __fire_event__(self, event: Event, dispatch: Callable[[Event], None]) -> None:
         super(BehaviourManager, self).__fire_event__(event, dispatch)
 
         event_name = type(event).__name__
         if event_name in self.event_map:
-            components = self.event_map[event_name]
+            components = list(self.event_map[event_name])
             if event.scene:
                 if event.onlyEntity is None:
                     for behavior in components:
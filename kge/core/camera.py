@@ -5,7 +5,7 @@ from kge.core.entity import BaseEntity
 from kge.physics.colliders import CameraCollider
 from kge.physics.rigid_body import RigidBody, RigidBodyType
 from kge.utils.dotted_dict import DottedDict
-from kge.utils.vector import Vector
+from kge.utils.vector import Vector, Vec2Array
 
 
 class Camera(BaseEntity):
@@ -226,13 +226,15 @@ class Camera(BaseEntity):
         min_dist_y = size.y / 2 + self.half_height
 
         # vector from the entity to the camera
-        distVec = point - Vector(self.position.x, -self.position.y)
+        position = self._transform._position
+        dist_x = point.x - position.x
+        dist_y = point.y + position.y
 
         # depth of the collision
         # Difference between the Min Distance before a collision occurs
         # and the actual distance between camera and the box
-        xDepth = min_dist_x - abs(distVec.x)
-        yDepth = min_dist_y - abs(distVec.y)
+        xDepth = min_dist_x - abs(dist_x)
+        yDepth = min_dist_y - abs(dist_y)
 
         if xDepth > 0 and yDepth > 0:
             return True
@@ -252,13 +254,15 @@ class Camera(BaseEntity):
         min_dist_y = entity.size.height / 2 + self.half_height + offset
 
         # distance from camera to the entity
-        distVec = entity.position - Vector(self.position.x, -self.position.y)
+        position, entity_position = self._transform._position, entity.position
+        dist_x = entity_position.x - position.x
+        dist_y = entity_position.y + position.y
 
         # depth of the collision
         # Difference between the Min Distance before a collision occurs
         # and the actual distance between camera and entity
-        xDepth = min_dist_x - abs(distVec.x)
-        yDepth = min_dist_y - abs(distVec.y)
+        xDepth = min_dist_x - abs(dist_x)
+        yDepth = min_dist_y - abs(dist_y)
 
         if xDepth > 0 and yDepth > 0:
             return True
@@ -279,13 +283,17 @@ class Camera(BaseEntity):
         Used to retrieve the position in which we should draw the point
         """
 
-        # 1. Reposition based on frame edges
-        vector = Vector(point.x, point.y)
-        # openGL offset 
+        # openGL offset
         # GL_offset = self.unit_to_pixels(Vector(-self.position.x / 2, self.position.y / 2, ))
-        GL_offset = Vector.Zero()
-        # 2. Scale from game units to pixels
-        return Vector(self.unit_to_pixels(vector) + GL_offset) * 1 / self._zoom
+        # Scale from game units to pixels
+        ratio = self._pixel_ratio / self._zoom
+        return Vector._new(point.x * ratio, point.y * ratio)
+
+    def world_to_screen_points(self, points: Vec2Array) -> Vec2Array:
+        """
+        Get real screen pixels coordinates of a set of points at once.
+        """
+        return points.copy().scale(self._pixel_ratio / self._zoom)
 
     def fixed_world_to_screen_point(self, point: Vector) -> Vector:
         """
@@ -321,7 +329,7 @@ class Camera(BaseEntity):
         if isinstance(unit, (float, int)):
             return unit * self._pixel_ratio
         elif isinstance(unit, Vector):
-            return Vector(unit * self._pixel_ratio)
+            return unit * self._pixel_ratio
         else:
             raise TypeError("unit must be either a float value or a vector")
 
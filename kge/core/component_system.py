@@ -3,21 +3,10 @@ from typing import List, Type, Dict, Set
 import kge
 from kge.core import events
 from kge.core.component import Component
+from kge.core.eventlib import handled_events
 from kge.core.system import System
 
 
-def snake_to_camel(meth_name: str):
-    if not meth_name.startswith("on_") or (meth_name[-1] not in "azertyuiopqsdfghjklmwxcvbn"):
-        return None
-    else:
-        event_name = meth_name[3:].split("_")
-        event = ""
-        for name in event_name:  # type: str
-            if len(name.strip()) > 0:
-                event += name.capitalize()
-        return event
-
-
 class ComponentSystem(System):
     """
     A System that handles components
@@ -33,7 +22,7 @@ class ComponentSystem(System):
 
         # the map between events and components in order to dispatch events
         # only to those which subscribed to the event
-        self.event_map = dict()  # type: Dict[str, List[Component]]
+        self.event_map = dict()  # type: Dict[str, Dict[Component, None]]
 
     def on_component_added(self, event: events.ComponentAdded, dispatch):
         component = event.component
@@ -49,31 +38,26 @@ class ComponentSystem(System):
         """
         Map names of events to components which need the event
         """
-        for attribute in dir(b):
-            if attribute.startswith("on_") and callable(getattr(b, attribute)):
-                name = snake_to_camel(attribute)
-                try:
-                    l = self.event_map[name]
-                except KeyError:
-                    self.event_map[name] = [b]
-                else:
-                    l.append(b)
+        for name in handled_events(b):
+            try:
+                subscribers = self.event_map[name]
+            except KeyError:
+                self.event_map[name] = {b: None}
+            else:
+                subscribers[b] = None
 
     def unregister_events(self, b: Component):
         """
         Remove the component from event map
         """
-        k_l = dict()
-        for k, v in self.event_map.items():
-            if b in v:
-                v.remove(b)
-                k_l[k] = v
-
-        # Remove event from Map if there is no more entity for it
-        for k, v in k_l.items():
-            if len(v) == 0:
-                self.event_map.pop(k)
-        k_l.clear()
+        for name in handled_events(b):
+            subscribers = self.event_map.get(name)
+            if subscribers is not None:
+                subscribers.pop(b, None)
+
+                # Remove event from Map if there is no more component for it
+                if not subscribers:
+                    del self.event_map[name]
 
     def on_component_removed(self, event: events.ComponentRemoved, dispatch):
         components = event.components
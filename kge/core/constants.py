@@ -33,6 +33,7 @@ PURPLE = Color(187, 0, 255, 1)
 # PHYSICS
 FIXED_FPS = 60
 FIXED_DELTA_TIME = 1 / FIXED_FPS
+MAX_FIXED_STEPS = 5
 
 # SPRITE SIZE
 DEFAULT_SPRITE_SIZE = DEFAULT_PIXEL_RATIO
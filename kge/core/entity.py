@@ -105,7 +105,7 @@ class BaseEntity(EventMixin):
         inst._is_active = True
 
         # the layer in which the entity is in
-        inst.layer = 0
+        inst._layer = 0
 
         # order in layer
         # TODO : REVIEW
@@ -125,8 +125,28 @@ class BaseEntity(EventMixin):
         # Pending Components that needs to be dispatched
         inst.pending = []
 
+        # the pool the entity comes from (see 'kge.EntityPool')
+        inst.pool = None
+
         return inst
 
+    @property
+    def layer(self):
+        """
+        Get the layer in which the entity is
+        """
+        return self._layer
+
+    @layer.setter
+    def layer(self, val: int):
+        changed = val != self._layer
+        self._layer = val
+
+        # The collision filters of the colliders depend on the layer
+        if changed:
+            for collider in self._components.get(kge.Collider, ()):
+                collider.update_filter()
+
     @property
     def layer_order(self):
         """
@@ -187,8 +207,8 @@ class BaseEntity(EventMixin):
         if self.scene is not None:
             if val:
                 self.scene.mark_as_dirty(self)
-            elif self.dirty:
-                self.scene.dirties.remove(self)
+            else:
+                self.scene.dirties.discard(self)
 
     @property
     def size(self) -> DottedDict:
@@ -207,8 +227,12 @@ class BaseEntity(EventMixin):
         rb = self.getComponent(kind=kge.RigidBody)
         if rb is not None:
             if rb.body is not None:
-                self._transform.angle = rb.angle
-                self._transform.position = rb.position
+                # the rigid body mirrors Box2D, the transform is only written if it is behind
+                angle, position = rb.angle, rb.position
+                if self._transform.angle != angle:
+                    self._transform.angle = angle
+                if self._transform._position != position:
+                    self._transform.position = position
         return self._transform
 
     @property
@@ -468,6 +492,9 @@ class BaseEntity(EventMixin):
                     for c in cp:
                         c.is_active = False
 
+                    if self.scene is not None:
+                        self.scene.update_archetype(self)
+
                     # Dispatch component removed event
                     manager = kge.ServiceProvider.getEntityManager()
                     manager.dispatch_component_operation(self, cp, added=False)
@@ -489,6 +516,9 @@ class BaseEntity(EventMixin):
                         fil.remove(kind)
                         kind.is_active = False
                 if removed:
+                    if self.scene is not None:
+                        self.scene.update_archetype(self)
+
                     # Dispatch component removed event
                     manager = kge.ServiceProvider.getEntityManager()
                     manager.dispatch_component_operation(self, [kind], added=False)
@@ -516,6 +546,7 @@ class BaseEntity(EventMixin):
                 self._components[kind].add(component)
 
             if self.scene is not None:
+                self.scene.update_archetype(self)
                 manager = kge.ServiceProvider.getEntityManager()
                 manager.dispatch_component_operation(self, component, added=True)
             else:
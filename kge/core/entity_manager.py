@@ -22,6 +22,8 @@ class EntityManager(System):
         if not e.destroyed:
             e.destroyed = True
             print("DESTROYING :", e)
+            if e.pool is not None:
+                e.pool.discard(e)
             if self._dispatch:
                 ev = events.DestroyEntity(
                     entity=e
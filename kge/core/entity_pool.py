@@ -0,0 +1,152 @@
+from collections import deque
+from typing import Callable, Deque, Generic, Set, TypeVar, Union, Tuple, Optional
+
+import kge
+from kge.core.entity import BaseEntity
+from kge.utils.vector import Vector
+
+E = TypeVar("E", bound=BaseEntity)
+
+
+class EntityPool(Generic[E]):
+    """
+    A pool of entities created ahead of time, with their components, bodies and sprites.
+
+    Acquiring and releasing an entity only toggles its activation, which is a lot cheaper
+    than adding it to the scene and destroying it, useful for projectiles & particles.
+
+    Example :
+        >>> def setup(scene):
+        >>>     bullets = EntityPool(lambda: Bullet(name="bullet"), size=200)
+        >>>     bullets.fill(scene, layer="Fg")
+        >>>
+        >>> class Gun(Behaviour):
+        >>>     def shoot(self):
+        >>>         bullet = bullets.acquire(position=self.entity.position)
+        >>>         ...
+        >>>         # when the bullet hits something
+        >>>         bullets.release(bullet)
+    """
+
+    def __init__(self, factory: Callable[[], E], size: int, grow: bool = True):
+        """
+        :param factory: a function that creates a new entity (with its components)
+        :param size: number of entities created when filling the pool
+        :param grow: if True, acquiring from an empty pool creates a new entity,
+                    else an IndexError is raised
+        """
+        if size < 0:
+            raise ValueError("The size of the pool should be positive")
+
+        self.factory = factory
+        self.size = size
+        self.grow = grow
+
+        self.scene = None  # type: Optional[kge.Scene]
+        self.layer = 0  # type: Union[int, str]
+
+        self._free = deque()  # type: Deque[E]
+        self._used = set()  # type: Set[E]
+
+    def fill(self, scene: "kge.Scene", layer: Union[int, str] = 0):
+        """
+        Create the entities and add them disabled to the scene
+        """
+        self.scene = scene
+        self.layer = layer
+
+        for _ in range(self.size - len(self._free) - len(self._used)):
+            self._free.append(self._create())
+
+    def _create(self) -> E:
+        if self.scene is None:
+            raise ValueError("The pool should be filled before being used")
+
+        entity = self.factory()
+        if not isinstance(entity, BaseEntity):
+            raise TypeError("The factory of the pool should return entities (kge.Entity)")
+
+        entity.pool = self
+        self.scene.add(entity, layer=self.layer, active=False)
+
+        # Create the sprite now instead of on its first render
+        if not self.scene.engine.headless and isinstance(entity, kge.Sprite):
+            entity.renderer.preload()
+
+        return entity
+
+    def acquire(self, position: Union[Vector, Tuple[float, float]] = None, angle: float = None) -> E:
+        """
+        Get a free entity, activated at the position & angle given
+        """
+        entity = None
+        while self._free:
+            entity = self._free.popleft()
+            if not entity.destroyed:
+                break
+            entity = None
+
+        if entity is None:
+            if not self.grow:
+                raise IndexError("There is no free entity left in the pool")
+            entity = self._create()
+
+        if position is not None:
+            entity.position = Vector(position)
+        if angle is not None:
+            entity.angle = angle
+
+        entity.is_active = True
+        self._used.add(entity)
+        return entity
+
+    def release(self, entity: E):
+        """
+        Give back an entity to the pool, it is disabled and its velocity is reset
+        """
+        if entity not in self._used:
+            if entity.destroyed and entity.pool is self:
+                # destroyed while acquired, the pool has already forgotten it
+                return
+            raise ValueError(f"{entity} does not belong to this pool or is already released")
+
+        self._used.remove(entity)
+        entity.is_active = False
+
+        rb = entity.getComponent(kind=kge.RigidBody)
+        if rb is not None:
+            rb.velocity = Vector.Zero()
+            rb.angular_velocity = 0
+
+        if not entity.destroyed:
+            self._free.append(entity)
+
+    def discard(self, entity: E):
+        """
+        Forget an entity of the pool which is destroyed, the next 'fill' replaces it
+        """
+        self._used.discard(entity)
+        try:
+            self._free.remove(entity)
+        except ValueError:
+            pass
+
+    @property
+    def free(self) -> int:
+        """
+        Number of entities ready to be acquired
+        """
+        return len(self._free)
+
+    @property
+    def used(self) -> int:
+        """
+        Number of entities acquired
+        """
+        return len(self._used)
+
+    def __len__(self):
+        return len(self._free) + len(self._used)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(free={self.free}, used={self.used})"
@@ -11,6 +11,9 @@ class EventDispatcher(System):
     The system that is responsible for dispatching events to entities
     """
 
+    def handles(self, event: events.Event) -> bool:
+        return not isinstance(event, (events.Update, events.FixedUpdate, PhysicsUpdate))
+
     def __fire_event__(self, event: events.Event, dispatch: Callable[[events.Event], None]) -> None:
         if self.engine.running and not isinstance(event, (events.Update, events.FixedUpdate, PhysicsUpdate)):
             if event.scene is not None:
@@ -27,5 +30,5 @@ class EventDispatcher(System):
                                 # Break if the engine has finished running
                                 break
                     else:
-                        if event.onlyEntity in event.scene.registered_entities(event):
+                        if event.scene.is_registered(event.onlyEntity, event):
                             event.onlyEntity.__fire_event__(event, dispatch)
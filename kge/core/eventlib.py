@@ -4,14 +4,16 @@ The event machinery
 
 import logging
 import re
-from typing import Callable
+from typing import Callable, Dict, Type
 
 from kge.core.events import Event
 
 __all__ = (
-    'EventMixin', 'BadEventHandlerException',
+    'EventMixin', 'BadEventHandlerException', 'handler_name', 'handler_table', 'handled_events',
 )
 
+elog = logging.getLogger('game.events')
+
 boundaries_finder = re.compile('(.)([A-Z][a-z]+)')
 boundaries_finder_2 = re.compile('([a-z0-9])([A-Z])')
 
@@ -21,6 +23,75 @@ def camel_to_snake(txt):
     return boundaries_finder_2.sub(r'\1_\2', s1).lower()
 
 
+def snake_to_camel(meth_name: str):
+    if not meth_name.startswith("on_") or (meth_name[-1] not in "azertyuiopqsdfghjklmwxcvbn"):
+        return None
+    else:
+        # Remove "on_" prefix
+        event_name = meth_name[3:].split("_")
+        event = ""
+        for name in event_name:  # type: str
+            if len(name.strip()) > 0:
+                event += name.capitalize()
+        return event
+
+
+# Event type registry : the name of the handler for each type of event
+_handler_names = {}  # type: Dict[Type[Event], str]
+
+# The events handled by each class : name of the event type -> name of the handler
+_handler_tables = {}  # type: Dict[type, Dict[str, str]]
+
+
+def handler_name(event_type: Type[Event]) -> str:
+    """
+    Get the name of the method that handles a type of event, resolved once per type
+        >>> handler_name(DrawDebug)
+        'on_draw_debug'
+    """
+    try:
+        return _handler_names[event_type]
+    except KeyError:
+        name = _handler_names[event_type] = 'on_' + camel_to_snake(event_type.__name__)
+        return name
+
+
+def handler_table(cls: type) -> Dict[str, str]:
+    """
+    Get the events handled by a class, built on first use
+        >>> handler_table(Camera)
+        {'Update': 'on_update', ...}
+    """
+    try:
+        return _handler_tables[cls]
+    except KeyError:
+        table = {}
+        for attribute in dir(cls):
+            if attribute.startswith("on_") and callable(getattr(cls, attribute, None)):
+                name = snake_to_camel(attribute)
+                if name:
+                    table[name] = attribute
+        _handler_tables[cls] = table
+        return table
+
+
+def handled_events(obj) -> Dict[str, str]:
+    """
+    Get the events handled by an object : the ones of its class, and the handlers
+    assigned on the object itself (only its own attributes are looked up, not dir())
+    """
+    table = handler_table(type(obj))
+    own = None
+    for attribute, value in getattr(obj, "__dict__", {}).items():
+        if attribute.startswith("on_") and callable(value):
+            name = snake_to_camel(attribute)
+            if name:
+                if own is None:
+                    own = dict(table)
+                own[name] = attribute
+    return table if own is None else own
+
+
 class BadEventHandlerException(TypeError):
 
     def __init__(self, instance, method, event):
@@ -53,10 +124,7 @@ class EventMixin:
         """
         Verify if this object implement the kind of event given
         """
-        name = camel_to_snake(type(event).__name__)
-        meth_name = 'on_' + name
-        meth = getattr(self, meth_name, None)
-        return meth != None
+        return getattr(self, handler_name(type(event)), None) is not None
 
     def __fire_event__(self, event: Event, dispatch: Callable[[Event], None]) -> None:
         """
@@ -66,15 +134,13 @@ class EventMixin:
         :param dispatch: function for calling another event
         :return: None
         """
-        elog = logging.getLogger('game.events')
-
-        name = camel_to_snake(type(event).__name__)
-        meth_name = 'on_' + name
+        meth_name = handler_name(type(event))
         meth = getattr(self, meth_name, None)
 
         if callable(meth):
             try:
-                elog.debug(f"Calling handler {meth} for {event}")
+                if elog.isEnabledFor(logging.DEBUG):
+                    elog.debug(f"Calling handler {meth} for {event}")
                 meth(event, dispatch)
             except TypeError as ex:
                 from inspect import signature
@@ -2,15 +2,16 @@ from collections import OrderedDict
 from collections import defaultdict
 from collections.abc import Collection
 from copy import deepcopy
-from typing import Iterator, Type, Callable, Sequence, Tuple, Union, TypeVar, Set, Dict, List
+from typing import Iterator, Type, Callable, Sequence, Tuple, Union, TypeVar, Set, Dict, List, Optional
 
 import kge
 from kge.core import events
+from kge.core.archetypes import ArchetypeStore, QueryView
 from kge.core.camera import Camera
 from kge.core.component import BaseComponent
 from kge.core.constants import BLACK, DEFAULT_RESOLUTION, DEFAULT_PIXEL_RATIO, MAX_LAYERS
 from kge.core.entity import BaseEntity
-from kge.core.eventlib import EventMixin
+from kge.core.eventlib import EventMixin, handled_events, handler_table
 from kge.utils.spatial_hash import SpatialHash
 from kge.utils.vector import Vector
 
@@ -85,6 +86,25 @@ class EntityCollection(Collection):
             tag = entity.tag
         self._tags[tag].add(entity)
 
+    def extend(self, entities: Sequence[BaseEntity]) -> None:
+        """
+        Add many entities to the container, the kinds of each class are indexed once.
+
+        Examples:
+            container.extend([MyObject(), MyObject(tag="red")])
+        """
+        by_class = defaultdict(list)  # type: Dict[type, List[BaseEntity]]
+        for entity in entities:
+            by_class[type(entity)].append(entity)
+
+        for cls, group in by_class.items():
+            self._all.update(group)
+            for kind in cls.mro():
+                self._kinds[kind].update(group)
+
+            for entity in group:
+                self._tags[entity.tag].add(entity)
+
     def get(self, *, kind: Type[T] = None, tag: str = None, **_) -> Iterator[T]:
         """
         Get an iterator of objects by kind or tag.
@@ -159,6 +179,8 @@ class BaseScene(EntityCollection, EventMixin):
     # TODO : Canvas Should not depends on main spatial hash
     nbItems = 0
     engine: "kge.Engine" = None
+    # the assets decoded in the background before the scene starts
+    manifest: "kge.AssetManifest" = None
     resolution: Vector = Vector(*DEFAULT_RESOLUTION)
     pixel_ratio: int = DEFAULT_PIXEL_RATIO
 
@@ -226,13 +248,20 @@ class BaseScene(EntityCollection, EventMixin):
 
     def __init__(self, set_up: Callable[["BaseScene"], None] = None, **kwargs):
         super(BaseScene, self).__init__()
-        self._event_map = dict()  # type: Dict[str, List[EventMixin]]
+        # name of event -> subscribers, dicts are used as insertion-ordered sets
+        self._event_map = dict()  # type: Dict[str, Dict[EventMixin, None]]
+        # name of event -> subscribers as a tuple, kept until the subscribers change
+        self._subscribers = dict()  # type: Dict[str, Tuple[EventMixin, ...]]
         type(self).nbItems += 1
 
         self.name = f"New {'Scene' if type(self).__name__ == 'BaseScene' else type(self).__name__} {type(self).nbItems}"
 
-        # Spatial Hash for querying visible elements
+        # Spatial Hash for querying visible elements, entities which moved are synced before queries
         self.spatial_hash = SpatialHash(2)
+        self._moved = set()  # type: Set[BaseEntity]
+
+        # Entities grouped by component signature, created on the first query
+        self._archetypes = None  # type: Optional[ArchetypeStore]
 
         # Main Camera
         self.main_camera = Camera(
@@ -287,6 +316,56 @@ class BaseScene(EntityCollection, EventMixin):
             if (isinstance(e, type_)) and e.is_active:
                 self._render_list.add(e)
 
+    def mark_as_moved(self, e: BaseEntity):
+        """
+        Mark an entity as to be moved in the spatial hash
+        """
+        self._moved.add(e)
+
+    def sync_spatial_hash(self):
+        """
+        Move the entities which moved since the last call in the spatial hash
+        """
+        moved, self._moved = self._moved, set()
+        for e in moved:
+            if e in self._all:
+                size = e.size
+                self.spatial_hash.update(e.transform.position, Vector(size.width, size.height), e)
+
+    def entities_in_frame(self, *types: Type[BaseEntity], offset: float = 0) -> Set[BaseEntity]:
+        """
+        Get the entities (of the types given) which are in the frame of the main camera,
+        the result is approximated to the cells of the spatial hash.
+        """
+        self.sync_spatial_hash()
+
+        camera = self.main_camera
+        center = Vector(camera.position.x, -camera.position.y)
+        size = Vector(camera.half_width + offset, camera.half_height + offset) * 2
+        return self.spatial_hash.search(center, size, *types)
+
+    def query(self, *kinds: Type[BaseComponent]) -> QueryView:
+        """
+        Get a cached view of the active entities having components of all the types given,
+        with one component of each type (an entity with many components of a type appears once).
+
+        Usage :
+            >>> for entity, transform, rb in scene.query(Transform, RigidBody):
+            >>>     ...
+        """
+        if self._archetypes is None:
+            self._archetypes = ArchetypeStore()
+            for entity in self._all:
+                self._archetypes.add(entity)
+        return self._archetypes.query(*kinds)
+
+    def update_archetype(self, e: BaseEntity):
+        """
+        Move an entity whose components changed to its new archetype
+        """
+        if self._archetypes is not None and e in self._all:
+            self._archetypes.update(e)
+
     def on_scene_started(self, ev: events.SceneStarted, dispatch):
         try:
             if self._setup_function is not None:
@@ -328,7 +407,7 @@ class BaseScene(EntityCollection, EventMixin):
         return self.name
 
     def add(self, entity: BaseEntity, position: Union[Tuple[float, float], Vector] = Vector.Zero(),
-            layer: Union[int, str] = 0) -> None:
+            layer: Union[int, str] = 0, active: bool = True) -> None:
         """
         Add one entity in format :
             - (entity, position, layer)
@@ -340,6 +419,7 @@ class BaseScene(EntityCollection, EventMixin):
         :param entity: the entity to add to the scene
         :param position: the position of the entity in the scene
         :param layer: the layer in which the entity should be
+        :param active: if False, the entity is added disabled
         :return:
         """
 
@@ -357,7 +437,7 @@ class BaseScene(EntityCollection, EventMixin):
 
         # Set layer
         if isinstance(layer, (int, str)):
-            entity.is_active = True
+            entity.is_active = active
 
             # Add Canvas to Max layer if not set
             if isinstance(entity, kge.Canvas):
@@ -378,6 +458,10 @@ class BaseScene(EntityCollection, EventMixin):
             manager.disable(entity)
 
         super(BaseScene, self).add(entity, entity.tag)
+        self.mark_as_moved(entity)
+        if self._archetypes is not None:
+            self._archetypes.add(entity)
+
         # Initialize the entity
         entity.__fire_event__(events.Init(self), self.engine.dispatch)
 
@@ -394,11 +478,57 @@ class BaseScene(EntityCollection, EventMixin):
         Add Many entities in the scene in one shot in format :
           - (entity, position, layer)
 
+        Entities are indexed and their events registered in one pass per class,
+        prefer it to 'add' when loading levels.
+
         Usage :
             >>> scene.addAll( (player, Vector(1,1), "Foreground"), (enemy, Vector(1,2), 1),  )
         """
+        manager = kge.ServiceProvider.getEntityManager()
+        added = []  # type: List[BaseEntity]
+
         for entity, position, layer in entities:
-            self.add(entity, position, layer)
+            if not isinstance(entity, BaseEntity):
+                raise TypeError("the element to add should be an entity (kge.Entity)")
+            if not isinstance(layer, (int, str)):
+                raise TypeError("Layer must be an int or str")
+
+            entity.scene = self
+            entity.transform.position = position
+
+            # Add Canvas to Max layer
+            if isinstance(entity, kge.Canvas):
+                entity.layer = self.layers[MAX_LAYERS - 1]
+            else:
+                entity.layer = self.getLayer(layer)
+
+            # Enable the entity, as 'add' does
+            entity._is_active = True
+            for components in entity.components.values():
+                for c in components:
+                    c.is_active = True
+            manager.enable(entity)
+
+            self.mark_as_dirty(entity)
+            self.mark_as_debuggable(entity)
+            added.append(entity)
+
+        self.extend(added)
+        self._moved.update(added)
+        if self._archetypes is not None:
+            for entity in added:
+                self._archetypes.add(entity)
+
+        for entity in added:
+            # Initialize the entity
+            entity.__fire_event__(events.Init(self), self.engine.dispatch)
+
+            # Dispatch Components added
+            for p in entity.pending:
+                manager.dispatch_component_operation(entity, p, added=True)
+            entity.pending.clear()
+
+        self.register_all_events(added)
 
     # def entity_layers(self, *types: Type[BaseEntity],
     #                   filter_set: Set[BaseEntity] = None,
@@ -456,16 +586,31 @@ class BaseScene(EntityCollection, EventMixin):
         self.all.clear()
         self.kinds.clear()
         self._event_map = dict()
+        self._subscribers = dict()
         self.spatial_hash = SpatialHash(2)
+        self._moved = set()
+        if self._archetypes is not None:
+            self._archetypes.clear()
 
-    def registered_entities(self, event) -> List[EventMixin]:
+    def registered_entities(self, event) -> Tuple[EventMixin, ...]:
         """
-        Return registered entities for event
+        Return registered entities for event.
+
+        The same tuple is returned until entities are registered or unregistered for the event,
+        so it can be iterated while handlers add or remove entities.
         """
+        name = type(event).__name__
         try:
-            return self._event_map[type(event).__name__]
+            return self._subscribers[name]
         except KeyError:
-            return []
+            subscribers = self._subscribers[name] = tuple(self._event_map.get(name, ()))
+            return subscribers
+
+    def is_registered(self, e: EventMixin, event) -> bool:
+        """
+        Verify if an entity is registered for an event
+        """
+        return e in self._event_map.get(type(event).__name__, ())
 
     @property
     def registered_events(self):
@@ -480,7 +625,10 @@ class BaseScene(EntityCollection, EventMixin):
         if entity in self.debuggable:
             self.debuggable.remove(entity)
 
-        self.spatial_hash.remove(entity.position, Vector(entity.size.width, entity.size.height), entity)
+        self.spatial_hash.discard(entity)
+        self._moved.discard(entity)
+        if self._archetypes is not None:
+            self._archetypes.remove(entity)
         self.unregister_events(entity)
         super(BaseScene, self).remove(entity)
 
@@ -488,46 +636,49 @@ class BaseScene(EntityCollection, EventMixin):
         """
         Map names of events to entities that need the event
         """
-        for attribute in dir(e):
-            if attribute.startswith("on_") and callable(getattr(e, attribute)):
-                name = snake_to_camel(attribute)
-                if name:
-                    try:
-                        l = self._event_map[name]
-                    except KeyError:
-                        self._event_map[name] = [e]
-                    else:
-                        l.append(e)
+        for name in handled_events(e):
+            self._subscribers.pop(name, None)
+            try:
+                subscribers = self._event_map[name]
+            except KeyError:
+                self._event_map[name] = {e: None}
+            else:
+                subscribers[e] = None
+
+    def register_all_events(self, entities: Sequence[EventMixin]):
+        """
+        Map names of events to many entities, in one pass per class
+        """
+        by_class = defaultdict(list)  # type: Dict[type, List[EventMixin]]
+        for e in entities:
+            if handled_events(e) is handler_table(type(e)):
+                by_class[type(e)].append(e)
+            else:
+                # handlers were assigned on the entity itself
+                self.register_events(e)
+
+        for cls, group in by_class.items():
+            subscribers = dict.fromkeys(group)
+            for name in handler_table(cls):
+                self._subscribers.pop(name, None)
+                try:
+                    self._event_map[name].update(subscribers)
+                except KeyError:
+                    self._event_map[name] = dict(subscribers)
 
     def unregister_events(self, e: EventMixin):
         """
         Remove entity from event map
         """
-        k_l = dict()
-        for k, v in self._event_map.items():
-            if e in v:
-                v.remove(e)
-                k_l[k] = v
-
-        # Remove event from Map if there is no more entity for it
-        for k, v in k_l.items():
-            if len(v) == 0:
-                self._event_map.pop(k)
-
-        k_l.clear()
-
-
-def snake_to_camel(meth_name: str):
-    if not meth_name.startswith("on_") or (meth_name[-1] not in "azertyuiopqsdfghjklmwxcvbn"):
-        return None
-    else:
-        # Remove "on_" prefix
-        event_name = meth_name[3:].split("_")
-        event = ""
-        for name in event_name:  # type: str
-            if len(name.strip()) > 0:
-                event += name.capitalize()
-        return event
+        for name in handled_events(e):
+            self._subscribers.pop(name, None)
+            subscribers = self._event_map.get(name)
+            if subscribers is not None:
+                subscribers.pop(e, None)
+
+                # Remove event from Map if there is no more entity for it
+                if not subscribers:
+                    del self._event_map[name]
 
 
 Scene = BaseScene
@@ -0,0 +1,81 @@
+from typing import Dict, List, Type, Callable
+
+import kge
+from kge.core.events import Event
+from kge.core.system import System
+
+
+class FrameScheduler:
+    """
+    Dispatch the events of a frame to the systems.
+
+    The event queue is drained one event at a time, in order : the events dispatched with
+    'immediate=True' by a handler are the next ones. Each event is handed to the systems
+    in their declared order (see 'System.priority') on the main thread. Only systems with
+    'System.threaded' set to True are run in the engine's executor.
+    """
+
+    def __init__(self, engine: "kge.Engine"):
+        self.engine = engine
+        self.systems = []  # type: List[System]
+
+        # the systems that handle each type of event
+        self._targets = {}  # type: Dict[Type[Event], List[System]]
+
+        # Counters
+        self.frames = 0
+        self.events_per_frame = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_events = 0
+
+    def set_systems(self, systems: List[System]):
+        """
+        Set the systems to dispatch events to, sorted by priority then declaration order
+        """
+        self.systems = sorted(systems, key=lambda system: system.priority)
+        self._targets.clear()
+
+    def targets(self, event: Event) -> List[System]:
+        """
+        Get the systems that handle this type of event
+        """
+        kind = type(event)
+        try:
+            return self._targets[kind]
+        except KeyError:
+            targets = self._targets[kind] = [system for system in self.systems if system.handles(event)]
+            return targets
+
+    def fire(self, event: Event, dispatch: Callable[[Event], None], on_main: bool = False):
+        """
+        Fire an event on the systems that handle it
+        """
+        for system in self.targets(event):
+            if system.threaded and not on_main:
+                self.engine.append_job(system.__fire_event__, event, dispatch)
+            else:
+                system.__fire_event__(event, dispatch)
+
+    def run_frame(self):
+        """
+        Drain the current event queue of the engine
+        """
+        engine = self.engine
+        self.queue_depth = len(engine._event_queue)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        count = 0
+
+        # the queue is read again after each event, the handlers can prepend events or replace it
+        while engine._event_queue:
+            engine.dispatch_event(engine._event_queue.popleft())
+            count += 1
+
+        self.frames += 1
+        self.events_per_frame = count
+        self.total_events += count
+
+    @property
+    def metrics(self) -> str:
+        return f"EVENTS PER FRAME : {self.events_per_frame} (QUEUE DEPTH : {self.queue_depth}, " \
+               f"MAX : {self.max_queue_depth})"
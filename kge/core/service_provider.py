@@ -6,6 +6,7 @@ from kge.graphics.renderer import Window
 from kge.inputs.input_manager import Inputs
 from kge.physics.physics_manager import Physics, DebugDraw
 from kge.audio.audio_manager import Audio
+from kge.resources.cache import Assets
 from kge.core.entity_manager import EntityManagerService
 from kge.core.service import Service
 
@@ -25,6 +26,10 @@ class ServiceProvider(object):
     def getAudio(cls) -> Audio:
         return cls.getService(Audio)
 
+    @classmethod
+    def getAssets(cls) -> Assets:
+        return cls.getService(Assets)
+
     @classmethod
     def getEntityManager(cls) -> EntityManagerService:
         return cls.getService(EntityManagerService)
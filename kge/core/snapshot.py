@@ -0,0 +1,302 @@
+import math
+import struct
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+import kge
+from kge.core.entity import BaseEntity
+from kge.utils.vector import Vector
+
+# frame, frame of the base snapshot (NO_BASE for a key frame), entities, contacts
+HEADER = struct.Struct("<IIII")
+# entity, flags, x, y, angle, scale x, scale y, velocity x, velocity y, angular velocity
+# the transform is the one of the body (angle in radians) if the flag BODY is set, else the one of the entity
+ENTITY = struct.Struct("<IBdddddddd")
+# entity a, fixture a, entity b, fixture b
+CONTACT = struct.Struct("<IHIH")
+
+NO_BASE = 0xFFFFFFFF
+
+# flags of the entities
+ACTIVE, BODY, AWAKE = 1, 2, 4
+
+
+class Snapshot:
+    """
+    The state of a scene at a frame, packed in a binary buffer.
+
+    A snapshot only holds the entities which changed since its base snapshot,
+    key frames have no base and hold all the entities.
+    """
+    __slots__ = ("frame", "data", "base")
+
+    def __init__(self, frame: int, data: bytes, base: "Snapshot" = None):
+        self.frame = frame
+        self.data = data
+        self.base = base
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        kind = "key frame" if self.base is None else f"delta of frame {self.base.frame}"
+        return f"Snapshot(frame={self.frame}, {kind}, {len(self)} bytes)"
+
+    @property
+    def changed(self) -> int:
+        """
+        Number of entities held by this snapshot
+        """
+        return HEADER.unpack_from(self.data)[2]
+
+    def records(self) -> Dict[int, bytes]:
+        """
+        Get the packed state of all the entities, by key
+        """
+        records = {} if self.base is None else self.base.records()
+
+        _, _, count, _ = HEADER.unpack_from(self.data)
+        size = ENTITY.size
+        offset = HEADER.size
+        for _ in range(count):
+            record = self.data[offset:offset + size]
+            records[ENTITY.unpack_from(record)[0]] = record
+            offset += size
+        return records
+
+    def contacts(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Get the contacts touching as (entity a, fixture a, entity b, fixture b)
+        """
+        _, _, count, contacts = HEADER.unpack_from(self.data)
+        offset = HEADER.size + count * ENTITY.size
+        return list(CONTACT.iter_unpack(self.data[offset:offset + contacts * CONTACT.size]))
+
+
+class SnapshotRecorder:
+    """
+    Take snapshots of the entities of a scene and of their bodies, and restore them, for
+    rollback and rewinding.
+
+    Each snapshot is delta encoded against the previous one (only the entities which changed
+    are packed), with a key frame every 'keyframe_interval' snapshots.
+    Restoring rebuilds the physics world from the bodies in a fixed order, so simulating again
+    from the same snapshot with the same inputs gives the same steps, bit for bit.
+
+    Box2D forgets its contact caches when the world is rebuilt, so the steps which followed the
+    snapshot the first time differ slightly from the ones simulated after restoring it.
+    With 'rebuild=True' the world is rebuilt when each snapshot is taken too, so that they
+    are the same (for rollback), at the cost of a rebuild per snapshot.
+
+    Entities are only restored if they are still in the scene, spawn them from an 'EntityPool'
+    so that their activation is restored.
+        >>> recorder = SnapshotRecorder(scene)
+        >>> snapshot = recorder.snapshot()
+        >>> ...
+        >>> recorder.restore(snapshot)
+    """
+
+    def __init__(self, scene: "kge.Scene", keyframe_interval: int = 30, size: int = 120, rebuild: bool = False):
+        """
+        :param scene: the scene to snapshot
+        :param keyframe_interval: number of snapshots between two key frames
+        :param size: number of snapshots kept in 'history'
+        :param rebuild: rebuild the physics world when taking snapshots, like when restoring them
+        """
+        if keyframe_interval < 1:
+            raise ValueError("The interval between key frames should be at least 1")
+
+        self.scene = scene
+        self.keyframe_interval = keyframe_interval
+        self.rebuild = rebuild
+        self.history = deque(maxlen=size)  # type: Deque[Snapshot]
+        self.frame = 0
+
+        # entities by key, in the order they have been met
+        self._entities = []  # type: List[BaseEntity]
+        self._keys = {}  # type: Dict[BaseEntity, int]
+
+        # the records of the last snapshot taken or restored
+        self._last = {}  # type: Dict[int, bytes]
+        self._last_snapshot = None  # type: Optional[Snapshot]
+        self._since_keyframe = 0
+
+    def _update_keys(self):
+        new = [e for e in self.scene.all if e not in self._keys]
+        if new:
+            # names give the same keys to the same scenes
+            new.sort(key=lambda e: e.name)
+            for entity in new:
+                self._keys[entity] = len(self._entities)
+                self._entities.append(entity)
+
+    def _pack(self, key: int, entity: BaseEntity) -> bytes:
+        flags = ACTIVE if entity.is_active else 0
+        scale = entity._transform._scale
+
+        rb = entity.getComponent(kind=kge.RigidBody)
+        body = rb.body if rb is not None else None
+        if body is not None:
+            position, velocity = body.position, body.linearVelocity
+            flags |= BODY | (AWAKE if body.awake else 0)
+            return ENTITY.pack(key, flags, position.x, position.y, body.angle, scale.x, scale.y,
+                               velocity.x, velocity.y, body.angularVelocity)
+
+        transform = entity._transform
+        position = transform._position
+        return ENTITY.pack(key, flags, position.x, position.y, transform._angle, scale.x, scale.y, 0, 0, 0)
+
+    def _contacts(self) -> List[Tuple[int, int, int, int]]:
+        contacts = []
+        for collider_a, collider_b in kge.ServiceProvider.getPhysics().touching_contacts():
+            key_a, key_b = self._keys.get(collider_a.entity), self._keys.get(collider_b.entity)
+            if key_a is not None and key_b is not None:
+                contacts.append((key_a, self._fixture_index(collider_a), key_b, self._fixture_index(collider_b)))
+        return contacts
+
+    @staticmethod
+    def _fixture_index(collider: "kge.Collider") -> int:
+        return [fixture.userData for fixture in collider.rb_attached.body.fixtures].index(collider)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Take a snapshot of the scene, and add it to the history
+        """
+        self._update_keys()
+
+        keyframe = self._last_snapshot is None or self._since_keyframe >= self.keyframe_interval - 1
+        last = {} if keyframe else self._last
+
+        records = {}
+        changed = []
+        keys = self._keys
+        for entity in self.scene.all:
+            key = keys[entity]
+            record = self._pack(key, entity)
+            records[key] = record
+            if last.get(key) != record:
+                changed.append(record)
+
+        contacts = self._contacts()
+        if self.rebuild:
+            self._rebuild_world(records, self._touching(contacts))
+        self.frame += 1
+        base = None if keyframe else self._last_snapshot
+
+        data = b"".join((
+            HEADER.pack(self.frame, NO_BASE if base is None else base.frame, len(changed), len(contacts)),
+            *changed,
+            *(CONTACT.pack(*contact) for contact in contacts),
+        ))
+
+        snapshot = Snapshot(self.frame, data, base)
+        self._since_keyframe = 0 if keyframe else self._since_keyframe + 1
+        self._last, self._last_snapshot = records, snapshot
+        self.history.append(snapshot)
+        return snapshot
+
+    def get(self, frame: int) -> Optional[Snapshot]:
+        """
+        Get the snapshot of a frame from the history
+        """
+        for snapshot in reversed(self.history):
+            if snapshot.frame == frame:
+                return snapshot
+        return None
+
+    def restore(self, snapshot: Union[Snapshot, int]):
+        """
+        Restore a snapshot (or the snapshot of a frame in the history), the snapshots
+        taken after it are dropped from the history.
+        """
+        if not isinstance(snapshot, Snapshot):
+            found = self.get(snapshot)
+            if found is None:
+                raise ValueError(f"There is no snapshot of the frame {snapshot} in the history")
+            snapshot = found
+
+        physics = kge.ServiceProvider.getPhysics()
+        if physics.physics_process:
+            raise NotImplementedError("Snapshots can not be restored when the physics run in a separate process")
+        if physics.world is not None and physics.world.locked:
+            raise RuntimeError("Snapshots can not be restored while the physics world is stepping "
+                               "(from a contact filter), restore them after the step")
+
+        records = snapshot.records()
+
+        for key in sorted(records):
+            entity = self._entities[key]
+            if entity.destroyed or entity not in self.scene:
+                continue
+
+            _, flags, x, y, angle, sx, sy, vx, vy, w = ENTITY.unpack(records[key])
+            active = bool(flags & ACTIVE)
+            if entity.is_active != active:
+                entity.is_active = active
+            entity.scale = Vector(sx, sy)
+
+            rb = entity.getComponent(kind=kge.RigidBody)
+            if flags & BODY and rb is not None and rb.body is not None:
+                body = rb.body
+                body.transform = ((x, y), angle)
+                body.linearVelocity = (vx, vy)
+                body.angularVelocity = w
+                body.awake = bool(flags & AWAKE)
+
+                rb.previous_transform = None
+                rb.mirror(x, y, angle)
+                entity._transform.position = Vector(x, y)
+                entity._transform.angle = math.degrees(angle)
+                entity.dirty = True
+                entity.debuggable = True
+            else:
+                entity.position = Vector(x, y)
+                entity.angle = angle
+
+        self._rebuild_world(records, self._touching(snapshot.contacts()))
+
+        # the next snapshots are deltas of this one
+        while self.history and self.history[-1].frame > snapshot.frame:
+            self.history.pop()
+        self.frame = snapshot.frame
+        self._last, self._last_snapshot = records, snapshot
+        self._since_keyframe = 0
+        base = snapshot.base
+        while base is not None:
+            self._since_keyframe += 1
+            base = base.base
+
+    def _rebuild_world(self, records: Dict[int, bytes], touching: List[Tuple["kge.Collider", "kge.Collider"]]):
+        """
+        Rebuild the physics world with the bodies of the records, in the order of their keys
+        """
+        rigid_bodies = []
+        for key in sorted(records):
+            entity = self._entities[key]
+            if entity.destroyed or entity not in self.scene or not ENTITY.unpack(records[key])[1] & BODY:
+                continue
+            rb = entity.getComponent(kind=kge.RigidBody)
+            if rb is not None and rb.body is not None:
+                rigid_bodies.append(rb)
+
+        kge.ServiceProvider.getPhysics().rebuild_world(rigid_bodies, touching)
+
+    def _touching(self, contacts: List[Tuple[int, int, int, int]]) -> List[Tuple["kge.Collider", "kge.Collider"]]:
+        touching = []
+        for key_a, fixture_a, key_b, fixture_b in contacts:
+            collider_a = self._collider(key_a, fixture_a)
+            collider_b = self._collider(key_b, fixture_b)
+            if collider_a is not None and collider_b is not None:
+                touching.append((collider_a, collider_b))
+        return touching
+
+    def _collider(self, key: int, index: int) -> Optional["kge.Collider"]:
+        entity = self._entities[key]
+        rb = entity.getComponent(kind=kge.RigidBody)
+        if rb is None or rb.body is None:
+            return None
+
+        fixtures = rb.body.fixtures
+        if index < len(fixtures):
+            return fixtures[index].userData
+        return None
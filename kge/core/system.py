@@ -13,6 +13,12 @@ class System(EventMixin, LoggerMixin):
     a system is an object that handles events
     """
 
+    # systems with the lowest priority get the events first
+    priority = 0
+
+    # Set to True to run the handlers of this system in the engine's executor
+    threaded = False
+
     def __init__(self, engine=None, **_):
         super().__init__()
         self.engine = engine  # type: kge.Engine
@@ -25,6 +31,12 @@ class System(EventMixin, LoggerMixin):
         if self.engine.running:
             super(System, self).__fire_event__(event, dispatch)
 
+    def handles(self, event: Event) -> bool:
+        """
+        Verify if this system should receive this kind of event, the result is cached by type of event
+        """
+        return self.has_event(event)
+
     def __repr__(self):
         return type(self).__name__
 
@@ -80,13 +80,15 @@ class Transform(BaseComponent):
     @scale.setter
     def scale(self, value):
         if isinstance(value, (Vector)):
+            if value != self._scale:
+                self._moved()
             self._scale = value
         else:
             raise TypeError("Scale should be a vector (scaleX, scaleY)")
 
     @property
     def position(self):
-        return Vector(self._position.x, self._position.y)
+        return Vector._new(self._position.x, self._position.y)
 
     @position.setter
     def position(self, value: Union[
@@ -99,6 +101,8 @@ class Transform(BaseComponent):
                 "Position should be either a tuple of Numbers or a vector")
 
         offset = vec - self._position
+        if vec != self._position:
+            self._moved()
 
         if isinstance(self.entity, kge.Camera):
             offset = Vector(offset.x, -offset.y)
@@ -110,6 +114,14 @@ class Transform(BaseComponent):
         for child in self.children:  # type: Transform
             child.entity.position += offset
 
+    def _moved(self):
+        """
+        Keep the spatial hash of the scene up to date
+        """
+        scene = getattr(self.entity, "scene", None)
+        if scene is not None:
+            scene.mark_as_moved(self.entity)
+
     @property
     def angle(self):
         """
@@ -118,7 +130,8 @@ class Transform(BaseComponent):
         return math.degrees(self._angle)
 
     def __mul__(self, other: Vector):
-        return Vector((self._t * tuple(other)).x, (self._t * tuple(other)).y)
+        point = self._t * tuple(other)
+        return Vector._new(point.x, point.y)
 
     @angle.setter
     def angle(self, value: float):
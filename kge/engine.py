@@ -6,13 +6,14 @@ from collections import deque
 from concurrent import futures
 from contextlib import ExitStack
 from itertools import chain
-from typing import List, Type, Union, Callable, Any, Deque, Dict
+from typing import List, Type, Union, Callable, Any, Deque, Dict, Optional, Tuple
 
 import pyglet
 
 from kge.audio.audio_manager import AudioManager, Audio
 from kge.clocks.updater import Updater
 from kge.core import events
+from kge.core.constants import DEFAULT_FPS
 from kge.core.behavior_manager import BehaviourManager
 from kge.core.entity import BaseEntity
 from kge.core.entity_manager import EntityManagerService, EntityManager
@@ -21,6 +22,7 @@ from kge.core.eventlib import EventMixin
 from kge.core.events import Event
 from kge.core.logger import LoggerMixin
 from kge.core.scene import BaseScene
+from kge.core.scheduler import FrameScheduler
 from kge.core.service import Service
 from kge.core.service_provider import ServiceProvider
 from kge.core.system import System
@@ -30,6 +32,9 @@ from kge.inputs.input_manager import InputManager, Inputs
 from kge.physics.fixed_updater import FixedUpdater
 from kge.physics.physics_manager import PhysicsManager, Physics, DebugDraw
 from kge.resources.assetlib import AssetLoader
+from kge.resources.cache import AssetManager, Assets, cache
+from kge.resources.events import AssetLoaded
+from kge.resources.preloader import Preloader
 # from kge.ui.ui_manager import UIManager
 
 
@@ -41,11 +46,21 @@ class Engine(LoggerMixin, EventMixin):
         >>> engine = Engine(...)
         >>> with engine:
         >>>     engine.run()
+
+    A headless engine runs without window, batches nor debug drawing, every frame
+    is simulated with a fixed time step as fast as possible on the main thread :
+        >>> engine = Engine(..., headless=True, max_frames=600)
+        >>> with engine:
+        >>>     engine.run()
     """
 
+    # Systems that need a window & a GL context to run
+    graphic_systems = (Renderer,)
+
     def __init__(self, first_scene: Type[BaseScene], *,
                  basic_systems=(
                          AnimSystem,
+                         AssetManager,
                          # AssetLoader,
                          # AudioManager,
                          BehaviourManager,
@@ -63,13 +78,15 @@ class Engine(LoggerMixin, EventMixin):
                          EntityManagerService,
 
                          # Services provided to users
+                         Assets,
                          Audio,
                          Inputs,
                          Physics,
                          Window,
                          DebugDraw,
                  ),
-                 systems=(), scene_kwargs=None, window_title: str = None, **kwargs):
+                 systems=(), scene_kwargs=None, window_title: str = None,
+                 headless: bool = False, max_frames: int = None, seed: int = 0, **kwargs):
         super(Engine, self).__init__()
 
         # The engine configuration
@@ -85,6 +102,15 @@ class Engine(LoggerMixin, EventMixin):
         # Window
         self.window_title = window_title
 
+        # Headless mode
+        self.headless = headless
+        self.max_frames = max_frames
+        self.seed = seed
+        self.frame_count = 0
+        self.clock = None  # type: Optional[pyglet.clock.Clock]
+        self._sim_time = 0.
+        self.time_step = 1 / DEFAULT_FPS
+
         # the current event queue for the frame, and the event queue for the next frame
         self._event_queue = deque()  # type: Deque[Event]
         self._next_event_queue = deque()  # type: Deque[Event]
@@ -103,17 +129,31 @@ class Engine(LoggerMixin, EventMixin):
         # for services
         self._services_classes = basic_services  # type: List[Type[Service]]
 
-        # Executor for multi threading
+        # Executor for multi threading, only used by threaded systems & jobs
         self._executor = futures.ThreadPoolExecutor()
         self._jobs = deque()
 
+        # Decode the assets of the scenes in the background, the scene waiting for its manifest
+        self.preloader = Preloader(self._executor)
+        self._preloading = None  # type: Optional[Tuple[BaseScene, List[Any]]]
+
+        # Dispatch the events of each frame to the systems
+        self.scheduler = FrameScheduler(self)
+
         # Time deltas for update, fixed_update & render
         self.update_dt, self.fixed_dt, self.render_dt,  = 1, 1, 1
 
+        # Interpolation factor between the two last physics steps, used for rendering
+        self.interpolation_alpha = 1.0
+
     def append_job(self, func: Callable, *args, **kwargs):
         """
-        Append a job to this engine
+        Append a job to this engine, in headless mode the job is run immediately
         """
+        if self.headless:
+            func(*args, **kwargs)
+            return
+
         self._jobs.append(
             self._executor.submit(
                 func, *args, **kwargs
@@ -156,9 +196,18 @@ class Engine(LoggerMixin, EventMixin):
         if self.systems:
             return
 
+        if self.headless:
+            # Every scheduled function will run with the simulated time
+            self.clock = pyglet.clock.Clock(time_function=lambda: self._sim_time)
+            self._exit_stack.callback(pyglet.clock.set_default, pyglet.clock.get_default())
+            pyglet.clock.set_default(self.clock)
+
         kinds = {}
         # Add the system classes in systems
         for system in self._systems_classes:
+            if self.headless and isinstance(system, type) and issubclass(system, self.graphic_systems):
+                continue
+
             if isinstance(system, type):
                 t = system
                 system = system(engine=self, **self.kwargs)  # type: System
@@ -174,6 +223,8 @@ class Engine(LoggerMixin, EventMixin):
             if service.system_class in kinds:
                 ServiceProvider.provide(service=service, system=kinds[service.system_class])
 
+        self.scheduler.set_systems(self.systems)
+
     def init(self):
         """
         Initialize the engine
@@ -181,6 +232,9 @@ class Engine(LoggerMixin, EventMixin):
         :return:
         """
         self.running = True
+        if self.headless:
+            random.seed(self.seed)
+
         self.activate_scene({"scene_class": self.first_scene,
                              "kwargs": self.scene_kwargs})
 
@@ -208,8 +262,49 @@ class Engine(LoggerMixin, EventMixin):
         self.dispatch_events(on_main=True)
 
         scene = scene(*args, **kwargs)
+        if self.headless:
+            # There is no renderer to mark the scene as rendered
+            scene.rendered = True
+
         self._scenes.append(scene)
-        self.dispatch(events.SceneStarted(), immediate=True)
+        self.start_when_loaded(scene)
+
+    def start_when_loaded(self, scene: BaseScene):
+        """
+        Start a scene, once the assets of its manifest have been decoded in the background
+        """
+        waiting = []
+        if scene.manifest is not None:
+            # the assets decoded for the scene are used by it
+            cache.scope = scene
+            waiting = [asset for asset in scene.manifest if self.preloader.request(asset)]
+
+        if waiting:
+            self._preloading = scene, waiting
+            self.logger.debug(f"Decoding {len(waiting)} assets before starting {scene.name}")
+        else:
+            self._preloading = None
+            self.dispatch(events.SceneStarted(), immediate=True)
+
+    def poll_assets(self):
+        """
+        Store the assets decoded in the background, and start the scene waiting
+        for its manifest when they are all decoded
+        """
+        for asset in self.preloader.poll():
+            self.dispatch(AssetLoaded(
+                asset=asset,
+                total_loaded=self.preloader.loaded,
+                total_queued=len(self.preloader),
+            ))
+
+        if self._preloading is not None:
+            scene, waiting = self._preloading
+            if scene is not self.current_scene:
+                self._preloading = None
+            elif not any(asset in self.preloader for asset in waiting):
+                self._preloading = None
+                self.dispatch(events.SceneStarted(), immediate=True)
 
     def run(self):
         """
@@ -230,9 +325,10 @@ class Engine(LoggerMixin, EventMixin):
         The main loop
         """
         pyglet.clock.schedule(self.loop_once)
-        # Flush the jobs created
-        pyglet.clock.schedule_interval(self.flush_jobs, 1 / 10)
-        self.event_loop.run()
+        if self.headless:
+            self.headless_loop()
+        else:
+            self.event_loop.run()
 
         # Set the running state to False to stop small scripts for updating
         self.flush_events()
@@ -250,12 +346,41 @@ class Engine(LoggerMixin, EventMixin):
         self._executor.shutdown()
         self.logger.info("Finished Processes.")
 
-    def flush_jobs(self, dt):
+    def headless_loop(self):
+        """
+        The main loop without window, run until there is no scene left
+        or 'max_frames' frames have been simulated
+        """
+        while self.running and self.current_scene is not None:
+            if self.max_frames is not None and self.frame_count >= self.max_frames:
+                break
+            self.step()
+
+    def step(self, frames: int = 1):
+        """
+        Simulate frames in headless mode, each frame advances
+        the simulated time by 'time_step'
+
+        Example:
+            >>> with Engine(Scene, headless=True) as engine:
+            >>>     engine.init()
+            >>>     pyglet.clock.schedule(engine.loop_once)
+            >>>     engine.step(60)
+        """
+        if not self.headless:
+            raise ValueError("Cannot step an engine that is not headless")
+
+        for _ in range(frames):
+            self._sim_time += self.time_step
+            self.frame_count += 1
+            self.clock.tick()
+
+    def flush_jobs(self):
         """
         Flush Finished Jobs in order to close engine more quickly
         """
-        for future in futures.as_completed(self._jobs):
-            self._jobs.remove(future)
+        while self._jobs and self._jobs[0].done():
+            self._jobs.popleft()
 
     def loop_once(self, dt):
         """
@@ -272,8 +397,9 @@ class Engine(LoggerMixin, EventMixin):
             self._event_queue.extend(self._next_event_queue)
             self._next_event_queue = deque()
 
-            while self._event_queue:
-                self.dispatch_events()
+            self.poll_assets()
+            self.scheduler.run_frame()
+            self.flush_jobs()
 
     def on_entity_destroyed(self, ev: events.EntityDestroyed, dispatch: Callable[[Event], None]):
         """
@@ -312,59 +438,29 @@ class Engine(LoggerMixin, EventMixin):
 
     def dispatch_events(self, on_main=False):
         """
-        Dispatch events to subsystems and entities
+        Dispatch the next event to subsystems and entities
 
         :return:
         """
+        self.dispatch_event(self._event_queue.popleft(), on_main=on_main)
+
+    def dispatch_event(self, event: Event, on_main=False):
+        """
+        Dispatch an event to the engine and the subsystems, in their declared order.
+        Threaded systems run in the executor unless 'on_main' is set.
+        """
         # This is to fix bugs when using random
-        random.seed(time.monotonic())
+        if not self.headless:
+            random.seed(time.monotonic())
 
-        # Get the last event
-        event = self._event_queue.popleft()
-        scene = self.current_scene
-        event.scene = scene
+        event.scene = self.current_scene
         event.time_scale = self.time_scale
 
         # launch registered event handlers
         if self.has_event(event):
-            self._jobs.append(self._executor.submit(
-                self.__fire_event__, event, self.dispatch))
+            self.__fire_event__(event, self.dispatch)
 
-        if on_main:
-            # If action should be on main then run it on main
-            for system in self.systems:
-                system.__fire_event__(event, self.dispatch)
-        else:
-            # dispatch events on subsystems
-            for system in self.systems:
-                if isinstance(system, Renderer):
-                    system.__fire_event__(event, self.dispatch)
-                    continue
-                elif isinstance(event, events.DrawDebug) and isinstance(system, (
-                        PhysicsManager, BehaviourManager, EventDispatcher)):
-                    system.__fire_event__(event, self.dispatch)
-                    continue
-                elif isinstance(event, (events.Update, events.FixedUpdate, events.LateUpdate)) and isinstance(system, (
-                EventDispatcher, BehaviourManager)):
-                    # Only to Behaviours
-                    if isinstance(system, BehaviourManager):
-                        self._jobs.append(
-                            self._executor.submit(
-                                system.__fire_event__, event, self.dispatch)
-                        )
-
-                    # Dispatch this event to event dispatcher
-                    if isinstance(event, (events.LateUpdate)) and isinstance(system, EventDispatcher):
-                        self._jobs.append(
-                            self._executor.submit(
-                                system.__fire_event__, event, self.dispatch)
-                        )
-                    continue
-                else:
-                    self._jobs.append(
-                        self._executor.submit(
-                            system.__fire_event__, event, self.dispatch)
-                    )
+        self.scheduler.fire(event, self.dispatch, on_main=on_main or self.headless)
 
     def on_time_dilation(self, ev: events.TimeDilation, dispatch: Callable[[Event], None]):
         """
@@ -435,12 +531,15 @@ class Engine(LoggerMixin, EventMixin):
         if isinstance(scene, type):
             scene = scene(**(kwargs or {}))
 
+        if self.headless:
+            scene.rendered = True
+
         # Set engine to self
         if scene.engine is None:
             scene.engine = self
 
         self._scenes.append(scene)
-        self.dispatch(events.SceneStarted(), immediate=True)
+        self.start_when_loaded(scene)
 
     def flush_events(self):
         """
@@ -21,11 +21,6 @@ class AnimSystem(ComponentSystem):
         TODO : TO CHANGE ?
         """
         if ev.scene.rendered:
-            # scene = ev.scene
-            # FIXME : REALLY NOT PERFORMANT !!!
-            # anim_e = set(scene.entity_layers(kge.Entity, filter_set=self._entities, renderable=False))
-            anim_e = self._components
-
-            for animator in anim_e: # type: Animator
-                # animator = e.getComponent(kind=Animator)
+            # every animator tracked by the system, active or not
+            for animator in self._components:  # type: Animator
                 animator.update(dispatch)
@@ -0,0 +1,182 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import pyglet
+
+from kge.graphics.image import Image, SheetRegion, TiledImage
+
+
+class ShelfPacker:
+    """
+    Pack rectangles in bins of a fixed size, row by row (shelves).
+
+    The rectangles are sorted by height, so that each shelf wastes little space,
+    and are separated from each other and from the edges of the bins by 'padding' pixels.
+        >>> packer = ShelfPacker(256, 256, padding=1)
+        >>> packer.pack([(32, 32), (16, 64), (300, 10)])
+        [(0, 18, 1), (0, 1, 1), None]
+    """
+
+    def __init__(self, width: int, height: int, padding: int = 1):
+        if width <= 0 or height <= 0:
+            raise ValueError("The size of the bins should be greater than zero")
+        if padding < 0:
+            raise ValueError("The padding should not be negative")
+
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.bins = 0
+
+        # shelves as [bin, y, height, next x]
+        self._shelves = []  # type: List[List[int]]
+        # next y of each bin
+        self._tops = []  # type: List[int]
+
+    def fits(self, w: int, h: int) -> bool:
+        """
+        Check if a rectangle fits in a bin
+        """
+        return w + 2 * self.padding <= self.width and h + 2 * self.padding <= self.height
+
+    def _place(self, w: int, h: int) -> Tuple[int, int, int]:
+        pad = self.padding
+        for shelf in self._shelves:
+            b, y, height, x = shelf
+            if h <= height and x + w + pad <= self.width:
+                shelf[3] = x + w + pad
+                return b, x, y
+
+        # open a shelf in the last bin, or in a new bin
+        if not self._tops or self._tops[-1] + h + pad > self.height:
+            self._tops.append(pad)
+            self.bins += 1
+
+        b, y = self.bins - 1, self._tops[-1]
+        self._tops[-1] = y + h + pad
+        self._shelves.append([b, y, h, pad + w + pad])
+        return b, pad, y
+
+    def pack(self, sizes: Sequence[Tuple[int, int]]) -> List[Optional[Tuple[int, int, int]]]:
+        """
+        Place rectangles given as (width, height)
+
+        :return: the bin and the position (bin, x, y) of each rectangle, in the same order,
+            None for the rectangles which do not fit in a bin
+        """
+        placed = [None] * len(sizes)  # type: List[Optional[Tuple[int, int, int]]]
+        order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+        for i in order:
+            w, h = sizes[i]
+            if self.fits(w, h):
+                placed[i] = self._place(w, h)
+        return placed
+
+
+class TextureAtlas:
+    """
+    Images packed at runtime in a few large textures.
+
+    Sprites whose images are in the same texture of the atlas share the same
+    sprite group, so that they are drawn together by the batch.
+    Images too large for the textures and tiled images keep their own texture,
+    the regions of sprite sheets keep the texture of their sheet.
+
+    Usage :
+        >>> atlas = TextureAtlas(size=1024, padding=2)
+        >>> atlas.pack([Image("player.png"), Image("tiles.png")])
+        >>> Image.atlas = atlas
+
+    Set 'texture_atlas=True' in 'kge.run' to pack the images of the sprites of each scene
+    when it is loaded.
+    """
+
+    def __init__(self, size: int = 1024, padding: int = 1):
+        """
+        :param size: the width and the height of the textures (in pixels)
+        :param padding: the number of pixels between two images, to avoid bleeding
+        """
+        self.size = size
+        self.padding = padding
+        self.textures = []  # type: List[pyglet.image.Texture]
+        self._regions = {}  # type: Dict[Hashable, pyglet.image.TextureRegion]
+        self._area = 0
+
+    def __contains__(self, image: Image):
+        return image.key in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __repr__(self):
+        return f"TextureAtlas({len(self)} images in {len(self.textures)} textures of {self.size}x{self.size}, " \
+               f"{self.fill * 100:.1f}% filled)"
+
+    @property
+    def fill(self) -> float:
+        """
+        The ratio of the area of the textures covered by images
+        """
+        if not self.textures:
+            return 0.
+        return self._area / (len(self.textures) * self.size * self.size)
+
+    def get(self, image: Image) -> Optional[pyglet.image.TextureRegion]:
+        """
+        Get the region of the atlas holding an image, None if the image is not packed
+        """
+        return self._regions.get(image.key)
+
+    def pack(self, images: Iterable[Image]) -> int:
+        """
+        Pack images which are not yet in the atlas, in new textures.
+
+        Pack all the images of a scene at once so that they share the fewest textures.
+
+        :return: the number of images packed
+        """
+        pending = {}  # type: Dict[Hashable, pyglet.image.AbstractImage]
+        for image in images:
+            key = image.key
+            if isinstance(image, (TiledImage, SheetRegion)) or key in self._regions or key in pending:
+                continue
+            pending[key] = image.decode()
+
+        if not pending:
+            return 0
+
+        keys = list(pending)
+        sizes = [(pending[k].width, pending[k].height) for k in keys]
+        packer = ShelfPacker(self.size, self.size, self.padding)
+        placed = packer.pack(sizes)
+
+        first = len(self.textures)
+        for _ in range(packer.bins):
+            self.textures.append(pyglet.image.Texture.create(self.size, self.size))
+
+        packed = 0
+        for key, (w, h), spot in zip(keys, sizes, placed):
+            if spot is None:
+                continue
+            b, x, y = spot
+            texture = self.textures[first + b]
+            # pyglet moves the image by its anchor when blitting it
+            data = pending[key]
+            texture.blit_into(data, x + data.anchor_x, y + data.anchor_y, 0)
+
+            region = texture.get_region(x, y, w, h)
+            region.anchor_x = w // 2
+            region.anchor_y = h // 2
+            self._regions[key] = region
+            self._area += w * h
+            packed += 1
+        return packed
+
+    def clear(self):
+        """
+        Forget all the images of the atlas and release its textures
+        """
+        for texture in self.textures:
+            texture.delete()
+        self.textures.clear()
+        self._regions.clear()
+        self._area = 0
@@ -1,11 +1,15 @@
 import io
 import logging
-from typing import List, Dict, Optional
+import weakref
+from typing import List, Optional, Hashable, Tuple
 
 import PIL
 import pyglet
 
+import kge
+import kge.resources.vfs as vfs
 from kge.resources.assetlib import AbstractAsset
+from kge.resources.cache import cache
 from kge.utils.dotted_dict import DottedDict
 from kge.utils.vector import Vector
 
@@ -17,34 +21,91 @@ class Image(AbstractAsset):
     Asset for image
     """
     root_folder = ''
-    _cache = {}  # type: Dict[str, pyglet.image.AbstractImage]
+    cache_kind = 'image'
+
+    # Texture atlas in which the images are looked for first
+    atlas = None  # type: Optional[kge.TextureAtlas]
+
+    # On-disk cache of the decoded images, to skip decoding them on the next runs
+    texture_cache = None  # type: Optional[kge.TextureCache]
 
     def __init__(self, path: str):
         self.name = path
         self._size = None
 
     def is_loaded(self):
-        return self.name in Image._cache and self._size is not None
+        if Image.atlas is not None and self in Image.atlas:
+            return True
+        return (self.cache_kind, self.name) in cache and self._size is not None
+
+    @property
+    def key(self) -> Hashable:
+        """
+        What identifies the pixels of the image in the texture atlas
+        """
+        return self.name
 
     def load(self, **kwargs) -> pyglet.image.AbstractImage:
         file = kwargs.get('file', None)  # type: Optional[io.StringIO]
 
+        # Return the region of the atlas if the image has been packed
+        if file is None and Image.atlas is not None:
+            region = Image.atlas.get(self)
+            if region is not None:
+                if self._size is None:
+                    self._size = Vector(region.width, region.height)
+                return region
+
+        return self.decode(file=file)
+
+    def decode(self, file: io.BytesIO = None) -> pyglet.image.AbstractImage:
+        """
+        Load the pixels of the image, without looking in the texture atlas
+        """
         # Return Image if on cache
-        if file is None and self.name in self._cache:
-            return self._cache[self.name]
+        keep = file is None and self.cache_kind is not None
+        if keep:
+            img = cache.get(self.cache_kind, self.name)
+            if img is not None:
+                return img
 
+        return self.store(self.read(file=file), keep=keep)
+
+    def read(self, file: io.BytesIO = None) -> pyglet.image.AbstractImage:
+        """
+        Decode the file of the image, can be called from a background thread
+        """
         if Image.root_folder:
             name = f"{Image.root_folder}/{self.name}"
         else:
             name = self.name
+
+        # Map the decoded pixels of the last runs
+        texture_cache = Image.texture_cache if file is None else None
+        if texture_cache is not None:
+            img = texture_cache.load(name)
+            if img is not None:
+                return img
+
         try:
+            # Read from the mounted packs first
+            if file is None and vfs.find(name) is not None:
+                file = vfs.open(name)
             img = pyglet.image.load(name, file=file)
         except pyglet.resource.ResourceNotFoundException:
-            img = pyglet.image.create(64, 64, pyglet.image.CheckerImagePattern())
+            return pyglet.image.create(64, 64, pyglet.image.CheckerImagePattern())
         except Exception as e:
-            img = pyglet.image.create(64, 64, pyglet.image.CheckerImagePattern())
             logger.error(f"There was an error when reading File '{name}': {e}")
+            return pyglet.image.create(64, 64, pyglet.image.CheckerImagePattern())
 
+        if texture_cache is not None:
+            texture_cache.store(name, img)
+        return img
+
+    def store(self, img: pyglet.image.AbstractImage, keep: bool = True) -> pyglet.image.AbstractImage:
+        """
+        Resize & center an image decoded by 'read', and add it to the cache if 'keep' is True
+        """
         # Resize the Image
         if self._size is not None:
             print(self._size)
@@ -57,9 +118,9 @@ class Image(AbstractAsset):
         img.anchor_x = img.width // 2
         img.anchor_y = img.height // 2
 
-        # Add to cache only if file object is not Provided
-        if file is None:
-            self._cache[self.name] = img
+        # Add to cache only if file object is not Provided, decoded as RGBA
+        if keep:
+            cache.put(self.cache_kind, self.name, img, img.width * img.height * 4)
         return img
 
     def cropped(self, origin: Vector, size: Vector) -> "SlicedImage":
@@ -68,24 +129,13 @@ class Image(AbstractAsset):
         """
         return SlicedImage(self.name, DottedDict(origin=origin, size=size))
 
-    def slice(self, sliced_size: Vector) -> List["SlicedImage"]:
+    def slice(self, sliced_size: Vector) -> List["SheetRegion"]:
         """
         Load Image From Region
-        good for sampling sprite sheets
+        good for sampling sprite sheets, the samples share the texture of the sheet
         :param sliced_size: the size of each sample
         """
-        img = self.load()
-
-        stepX = img.width // sliced_size.x
-        stepY = img.height // sliced_size.y
-
-        images = []
-        for x in range(0, stepX):
-            for y in range(0, stepY):
-                images.append(SlicedImage(self.name, DottedDict(origin=Vector(x * sliced_size.x, y * sliced_size.y),
-                                                                size=sliced_size)))
-
-        return images
+        return SpriteSheet.get(self, sliced_size).regions
 
     @property
     def size(self):
@@ -116,8 +166,12 @@ class SlicedImage(Image):
         self._origin = region.origin
         self._area = region.size
 
-    def load(self) -> pyglet.image.AbstractImage:
-        img = super().load()
+    @property
+    def key(self) -> Hashable:
+        return self.name, self._origin.x, self._origin.y, self._area.x, self._area.y
+
+    def decode(self, file: io.BytesIO = None) -> pyglet.image.AbstractImage:
+        img = super().decode()
 
         if self._origin.x + self._area.x > img.width \
                 or self._origin.y + self._area.y > img.height:
@@ -141,6 +195,92 @@ class SlicedImage(Image):
             f"""size=({self.size.x}X{self.size.y}) {'' if self.is_loaded() else 'Not '}loaded>"""
 
 
+class SpriteSheet:
+    """
+    A sprite sheet uploaded once as a grid of regions of the same texture.
+
+    Switching a sprite from one region to another only rewrites its texture coordinates.
+        >>> sheet = SpriteSheet.get(Image("player.png"), Vector(16, 16))
+        >>> sheet.regions[0].load()
+        <TextureRegion ...>
+
+    Sheets are shared by image & size of the cells, as long as one of their regions is used.
+    """
+    _sheets = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary[Tuple, SpriteSheet]
+
+    def __init__(self, image: Image, cell: Vector):
+        if not (cell.x > 0 and cell.y > 0):
+            raise ValueError("The size of the cells should be greater than zero")
+
+        self.image = image
+        self.cell = Vector(int(cell.x), int(cell.y))
+
+        img = image.decode()
+        self.columns = img.width // self.cell.x
+        self.rows = img.height // self.cell.y
+        self._grid = None  # type: Optional[pyglet.image.TextureGrid]
+
+        # column by column, from the bottom left
+        self.regions = [SheetRegion(self, x, y) for x in range(self.columns) for y in range(self.rows)]
+
+    @classmethod
+    def get(cls, image: Image, cell: Vector) -> "SpriteSheet":
+        """
+        Get the sheet of an image cut in cells of 'cell' pixels, created once
+        """
+        key = (image.name, int(cell.x), int(cell.y))
+        sheet = cls._sheets.get(key)
+        if sheet is None:
+            sheet = cls._sheets[key] = cls(image, cell)
+        return sheet
+
+    @property
+    def grid(self) -> pyglet.image.TextureGrid:
+        """
+        The regions of the texture of the sheet, row by row from the bottom
+        """
+        if self._grid is None:
+            grid = pyglet.image.ImageGrid(self.image.decode(), self.rows, self.columns,
+                                          item_width=self.cell.x, item_height=self.cell.y)
+            self._grid = pyglet.image.TextureGrid(grid)
+            for region in self._grid:
+                region.anchor_x = region.width // 2
+                region.anchor_y = region.height // 2
+        return self._grid
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __repr__(self):
+        return f"SpriteSheet({self.image.name!r}, {self.columns}x{self.rows} cells of {self.cell.x}x{self.cell.y}, " \
+               f"{'' if self._grid is not None else 'Not '}loaded)"
+
+
+class SheetRegion(SlicedImage):
+    """
+    A cell of a sprite sheet, which neither decodes nor caches anything by itself :
+    it is a region of the texture of the sheet.
+    """
+    # the sheet is decoded & cached, not its regions
+    cache_kind = None
+
+    def __init__(self, sheet: SpriteSheet, column: int, row: int):
+        super().__init__(sheet.image.name, DottedDict(origin=Vector(column * sheet.cell.x, row * sheet.cell.y),
+                                                      size=sheet.cell))
+        self.sheet = sheet
+        self.index = row * sheet.columns + column
+        self._size = Vector(sheet.cell)
+
+    def is_loaded(self):
+        return self.sheet._grid is not None
+
+    def load(self, **kwargs) -> pyglet.image.TextureRegion:
+        return self.sheet.grid[self.index]
+
+    def decode(self, file: io.BytesIO = None) -> pyglet.image.TextureRegion:
+        return self.sheet.grid[self.index]
+
+
 class TiledImage(Image):
     """
     A Repeated Image
@@ -152,6 +292,8 @@ class TiledImage(Image):
         - 'name' is the path of the file
         - 'size' is the number of times we want to repeat the image on x axis and on y axis
     """
+    # composed with PIL when loaded, neither cached nor preloaded
+    cache_kind = None
 
     def __init__(self, path: str, size: Vector):
         super().__init__(path)
@@ -2,7 +2,7 @@ import io
 import logging
 import sys
 import time
-from typing import Union, List, Optional, Tuple
+from typing import Union, List, Optional, Tuple, Set
 
 import imgui
 import pyglet
@@ -15,7 +15,11 @@ from kge.core.component_system import ComponentSystem
 from kge.core.constants import DEFAULT_RESOLUTION, IS_FULLSCREEN, IS_RESIZABLE, DEFAULT_FPS, BLACK, \
     MAX_LAYERS, RED, WHITE, YELLOW
 from kge.core.service import Service
+from kge.graphics.atlas import TextureAtlas
+from kge.graphics.image import Image
+from kge.graphics.texture_cache import TextureCache
 from kge.graphics.render_component import RenderComponent
+from kge.resources.events import AssetLoaded
 from kge.utils.color import Color
 from kge.utils.dotted_dict import DottedDict
 from kge.utils.vector import Vector
@@ -224,9 +228,18 @@ class Renderer(ComponentSystem):
                  show_fps=False,
                  # console_output: io.StringIO = io.StringIO(),
                  fullscreen=IS_FULLSCREEN, resizable=IS_RESIZABLE, vsync=False,
+                 texture_atlas=False, atlas_size=1024, atlas_padding=1,
+                 texture_cache: str = None,
                  **_):
         super().__init__(**_)
 
+        # Keep the decoded images on disk, in the folder given
+        if texture_cache is not None:
+            Image.texture_cache = TextureCache(texture_cache)
+
+        # Pack the images of the sprites of each scene in a texture atlas when it is loaded
+        self.atlas = TextureAtlas(atlas_size, atlas_padding) if texture_atlas else None  # type: Optional[TextureAtlas]
+
         # Show Debug Console
         self.display_log = show_output
         self.display_fps = show_fps
@@ -239,8 +252,8 @@ class Renderer(ComponentSystem):
         # Debug Console
         self._console = DebugConsole()
 
-        # To Draw
-        self.to_draw = []
+        # Sprites in the frame of the camera during the last render
+        self._in_frame = set()  # type: Set[kge.Sprite]
 
         self.components_supported = [RenderComponent]
         self.accumulated_time = 0
@@ -302,6 +315,14 @@ class Renderer(ComponentSystem):
         #         canvas.dirty = True
         pass
 
+    def on_asset_loaded(self, event: AssetLoaded, dispatch):
+        """
+        Show the progress of the assets decoded in the background while the scene is loading
+        """
+        if self._load_feedback is not None and not self._load_feedback.loaded:
+            total = event.total_loaded + event.total_queued
+            self._load_feedback.text = f"LOADING ASSETS... {event.total_loaded}/{total}"
+
     def on_disable_entity(self, event: events.DisableEntity, dispatch):
         if hasattr(event.entity, "renderer"):
             event.entity.renderer.__fire_event__(event, dispatch)
@@ -319,11 +340,12 @@ class Renderer(ComponentSystem):
         """
         When scene get stopped, remove all render components & dispatch event
         """
-        for renderer in self.event_map[type(event).__name__]:
+        for renderer in list(self.event_map.get(type(event).__name__, ())):
             renderer.__fire_event__(event, dispatch)
 
         # clear components & remake the batch
         self.batch = pyglet.graphics.Batch()
+        self._in_frame = set()
 
         # Load the feedback
         self._load_feedback = LoadingFeedBack()
@@ -335,6 +357,10 @@ class Renderer(ComponentSystem):
         # keep camera zoom
         self._zoom = 1
 
+        # the images of the next scene are packed again
+        if self.atlas is not None:
+            self.atlas.clear()
+
         super(Renderer, self).on_scene_stopped(event, dispatch)
 
     def __enter__(self):
@@ -415,21 +441,34 @@ class Renderer(ComponentSystem):
                 unit / 255 for unit in scene.background_color[:3]
             )
 
-            # Shapes to draw (MOSTLY CIRCLES)
-            self.to_draw = []
-            dirties = set(scene.dirties)
+            # Only sprites in frame are rendered, sprites leaving the frame are hidden
+            # and sprites entering the frame are redrawn
+            in_frame = scene.entities_in_frame(kge.Sprite, offset=1)
+            for entity in self._in_frame - in_frame:
+                if entity.is_active:
+                    entity.renderer.hide()
+            for entity in in_frame - self._in_frame:
+                entity.dirty = True
+            self._in_frame = in_frame
+
+            dirties = scene.dirties
+            # sprites waiting for their image are rendered anyway, their size is known once the image is set
+            pending = [e for e in dirties
+                       if isinstance(e, kge.Sprite) and e.renderer.image_pending and e not in in_frame]
+            dirties = [e for e in in_frame if e in dirties] + pending + \
+                      [e for e in scene.kinds[kge.Canvas] if e in dirties]
 
             if self._load_feedback is not None:
                 if not self._load_feedback.loaded:
+                    if self.atlas is not None:
+                        self.pack_atlas(scene)
                     self._load_feedback.text = "RENDERING ENTITIES..."
                     self._load_feedback.loaded = True
                     return
 
             for entity in dirties:  # type: Union[kge.Sprite, kge.Canvas]
                 # Render elements
-                shape = entity.renderer.render(scene)
-                if shape is not None:
-                    self.to_draw.append(shape)
+                entity.renderer.render(scene)
 
             if self._load_feedback is not None:
                 scene.rendered = True
@@ -454,6 +493,30 @@ class Renderer(ComponentSystem):
                 debug.rebatch()
                 self._dispatch(events.DrawDebug())
 
+    def pack_atlas(self, scene: "kge.Scene"):
+        """
+        Pack the images of the sprites of the scene, and the images of their animations,
+        in the texture atlas
+        """
+        images = []
+        for entity in scene.kinds[kge.Sprite]:  # type: kge.Sprite
+            renderer = entity.renderer
+            for image in (renderer._next_image, renderer._image):
+                if image is not None:
+                    images.append(image)
+
+            animator = entity.getComponent(kind=kge.Animator)
+            if animator is not None:
+                for state in animator.animations.values():
+                    if state.animation is None:
+                        continue
+                    for frame in state.animation.frames:
+                        images.extend(v for v in frame.states.values() if isinstance(v, Image))
+
+        self.atlas.pack(images)
+        Image.atlas = self.atlas
+        self.logger.debug(f"Packed {self.atlas!r}")
+
     def set2d(self, ):
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
@@ -495,10 +558,6 @@ class Renderer(ComponentSystem):
         # Draw the current Batch
         # print("DRAWING BATCH")
         self.batch.draw()
-        for shape, mode in self.to_draw:
-            glPointSize(2.0)
-            shape.draw(mode)
-            glPointSize(1.0)
 
         # Draw physics data
         if self.logger.getEffectiveLevel() == logging.DEBUG:
@@ -518,6 +577,7 @@ class Renderer(ComponentSystem):
 UPDATE TIME : {self.engine.update_dt:.4f} ms -> {1 / self.engine.update_dt:.2f} FPS
 FIXED UPDATE TIME : {self.engine.fixed_dt:.4f} ms -> {1 / self.engine.fixed_dt:.2f} FPS
 RENDER TIME : {self.engine.render_dt:.4f} ms -> {1 / self.engine.render_dt:.2f} FPS
+{self.engine.scheduler.metrics}
 """
                               if self.display_fps else None)
 
@@ -580,6 +640,13 @@ class Window(Service):
     def batch(self) -> pyglet.graphics.Batch:
         return self._system_instance.batch
 
+    @property
+    def atlas(self) -> Optional[TextureAtlas]:
+        """
+        The texture atlas of the scene, None if the images are not packed
+        """
+        return self._system_instance.atlas
+
     @property
     def render_layers(self) -> List[pyglet.graphics.OrderedGroup]:
         return self._system_instance.layers
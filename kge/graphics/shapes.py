@@ -1,3 +1,5 @@
+import math
+from array import array
 from dataclasses import dataclass
 from pyglet.gl import *
 
@@ -105,3 +107,17 @@ class OutlinedCircle(Circle):
     center: Vector = Vector(0, 0)
     mode: int = GL_LINE_LOOP
     num_points: int = 20
+
+
+def unit_circle(points: int, fan: bool = False) -> array:
+    """
+    Get the vertices of a circle of radius 1 as GL_LINES pairs (x1, y1, x2, y2, ...),
+    or as GL_TRIANGLES from the center if 'fan' is True
+    """
+    out = array("d")
+    step = 2 * math.pi / points
+    for i in range(points):
+        if fan:
+            out.extend((0.0, 0.0))
+        out.extend((math.cos(i * step), math.sin(i * step), math.cos((i + 1) * step), math.sin((i + 1) * step)))
+    return out
@@ -2,7 +2,8 @@ import math
 import platform
 import random
 import sys
-from typing import Union, Sequence, Optional
+from array import array
+from typing import Union, Sequence, Optional, Dict, Tuple
 
 import pyglet
 from pyglet.gl import *
@@ -14,9 +15,9 @@ from kge.core.constants import (
     DEFAULT_PIXEL_RATIO, REFERENCE_PIXEL_RATIO)
 from kge.graphics.image import Image
 from kge.graphics.render_component import RenderComponent
-from kge.graphics.shapes import Shape, Circle, Square, Triangle
+from kge.graphics.shapes import Shape, Circle, Square, Triangle, unit_circle
 from kge.utils.color import Color
-from kge.utils.vector import Vector
+from kge.utils.vector import Vector, Vec2Array
 
 if sys.platform == "win32":
     if platform.architecture()[0] == "64bit":
@@ -52,10 +53,8 @@ class SpriteRenderer(RenderComponent):
     A component that holds the visual information of a sprite
     """
 
-    # Circle Cache
-    circle_segments = 40
-    circle_cache_tf = {}  # triangle fan (inside)
-    circle_cache_ll = {}  # line loop (border)
+    # Circle Cache, by number of points and solid (triangles) or outlined (lines)
+    circle_cache = {}  # type: Dict[Tuple[int, bool], array]
 
     def __init__(self, entity):
         super().__init__(entity)
@@ -80,183 +79,82 @@ class SpriteRenderer(RenderComponent):
         self._shape_color = Color(r, g, b, a)
         self.shape = Square()
 
-        # Vertex List (if shape)
+        # Vertex List (if shape), with the mode, the size and the group it has been added with
         self._vlist = None  # type: Optional[pyglet.graphics.vertexdomain.VertexList]
-
-        # size of the sprite
-        self._w = DEFAULT_SPRITE_RESOLUTION[0] * \
-                  abs(self.entity.transform.scale.x)
-        self._h = DEFAULT_SPRITE_RESOLUTION[1] * \
-                  abs(self.entity.transform.scale.y)
+        self._vlist_key = None  # type: Optional[Tuple[int, int, pyglet.graphics.Group]]
+        self._vlist_color = None  # type: Optional[tuple]
 
         self._t = b2.b2Transform()
         self._scale = 0
         # TODO : IS IT PERFORMANT ?
         self._changed = False
 
-    def _getLLCircleVertices(self, radius, points):
+    def shape_vertices(self) -> Tuple[int, array]:
         """
-        Get the line loop-style vertices for a given circle.
-        Drawn as lines.
-
-        "Line Loop" is used as that's how the C++ code draws the
-        vertices, with lines going around the circumference of the
-        circle (GL_LINE_LOOP).
-
-        This returns 'points' amount of lines approximating the
-        border of a circle.
+        Get the mode and the vertices of the shape, before the transform of the entity.
 
-        (x1, y1, x2, y2, x3, y3, ...)
+        Circles are given as independent triangles (or lines if outlined) instead of a
+        triangle fan (or a line loop), so that they can share the vertex lists of the batch.
         """
-        ret = []
-        step = 2 * math.pi / points
-        n = 0
-        for i in range(points):
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-            n += step
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-        return ret
-
-    def _getTFCircleVertices(self, radius, points):
-        """
-        Get the triangle fan-style vertices for a given circle.
-        Drawn as triangles.
-
-        "Triangle Fan" is used as that's how the C++ code draws the
-        vertices, with triangles originating at the center of the
-        circle, extending around to approximate a filled circle
-        (GL_TRIANGLE_FAN).
+        shape = self.shape
+        if isinstance(shape, Circle):
+            solid = shape.mode == GL_TRIANGLE_FAN
+            key = (shape.num_points, solid)
+            if key not in self.circle_cache:
+                self.circle_cache[key] = unit_circle(shape.num_points, fan=solid)
+            return (GL_TRIANGLES if solid else GL_LINES), self.circle_cache[key]
 
-        This returns 'points' amount of lines approximating the
-        circle.
+        return shape.mode, Vec2Array(shape.vertices).data
 
-        (a1, b1, c1, a2, b2, c2, ...)
-        """
-        ret = []
-        step = 2 * math.pi / points
-        n = 0
-        for i in range(points):
-            ret.append((0.0, 0.0))
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-            n += step
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-        return ret
-
-    def getCircleVertices(self, camera: 'kge.Camera', center, radius, points, solid=True):
+    def draw_shape(self, camera: "kge.Camera", position: Vector, angle: float):
         """
-        Returns the triangles that approximate the circle and
-        the lines that border the circles edges, given
-        (center, radius, points).
+        Draw a placeholder shape for the sprite.
 
-        Caches the calculated LL/TF vertices, but recalculates
-        based on the center passed in.
-
-        Currently, there's only one point amount,
-        so the circle cache ignores it when storing. Could cause
-        some confusion if you're using multiple point counts as
-        only the first stored point-count for that radius will
-        show up.
-
-        Returns: (tf_vertices, ll_vertices)
+        The shape is kept in a vertex list of the batch, under the layer of the entity,
+        its vertices are updated when the sprite is rendered again and its colors only
+        when they change.
         """
-        if radius not in self.circle_cache_tf:
-            if solid:
-                self.circle_cache_tf[radius] = self._getTFCircleVertices(radius, points)
-            else:
-                self.circle_cache_ll[radius] = self._getLLCircleVertices(radius, points)
-
-        vertices = []
-
-        if solid:
-            for x, y in self.circle_cache_tf[radius]:
-                vertices.extend(
-                    (camera.world_to_screen_point(Vector(x + center[0], y + center[1]), ))
-                )
-        else:
-            for x, y in self.circle_cache_ll[radius]:
-                vertices.extend(
-                    (camera.world_to_screen_point(Vector(x + center[0], y + center[1]), ))
-                )
-        return vertices
-
-    def draw_shape(self, camera: "kge.Camera"):
-        """
-        Draw a placeholder shape for the sprite
-        """
-        scale = self.entity.transform.scale
-        vertices = []
+        if not isinstance(self.shape, (Triangle, Square, Circle)):
+            return
 
         # Default Values when color not specified
         if self._color is not None:
-            color = self._color
+            color = tuple(self._color)
         else:
-            color = self._shape_color
+            color = tuple(self._shape_color)
 
-        if isinstance(self.shape, (Triangle, Square)):
-            for v in self.shape.vertices:
-                vertices.extend(
-                    tuple(camera.world_to_screen_point(
-                        (self.entity.transform * Vector(v.x * scale.x, v.y * scale.y))))
-                )
-        elif isinstance(self.shape, Circle):
+        mode, local = self.shape_vertices()
+        points = Vec2Array.from_flat(local)
+        if isinstance(self.shape, Circle):
             if self.shape.radius is None:
                 self.shape.radius = max(
                     self.entity.scale.x, self.entity.scale.y) / 2
-            deg = 360 / self.shape.num_points
-            rad = math.radians(deg)
-            for i in range(self.shape.num_points):
-                n = rad * i
-                pos = camera.world_to_screen_point(self.entity.position)
-                vertices.extend((
-                    int(camera.unit_to_pixels(self.shape.radius)
-                        * math.cos(n)) + pos.x,
-                    int(camera.unit_to_pixels(self.shape.radius)
-                        * math.sin(n)) + pos.y
-                ))
-            self._vlist = pyglet.graphics.vertex_list(self.shape.num_points,
-                                                      ("v2d/stream",
-                                                       tuple(vertices)),
-                                                      ("c4Bn/dynamic",
-                                                       tuple(color) * self.shape.num_points))
-            self._vlist.draw(self.shape.mode)
-            return self._vlist, self.shape.mode
-
-            # FIXME: THIS DOES NOT WORK PROPERLY
-            # if self.shape.radius is None:
-            #     self.shape.radius = max(
-            #         self.entity.scale.x, self.entity.scale.y) / 2
-            #
-            # # real world position
-            # pos = self.entity.position
-            #
-            # solid = not isinstance(self.shape, OutlinedCircle)
-            # vertices = self.getCircleVertices(camera,
-            #                                   pos,
-            #                                   self.shape.radius,
-            #                                   self.circle_segments,
-            #                                   solid
-            #                                   )
-            #
-            # self.shape.num_points = len(vertices) // 2
-
+            radius = self.shape.radius
+            points.transform(radius, radius, 0, position.x, position.y)
         else:
-            return
+            scale = self.entity.transform.scale
+            points.transform(scale.x, scale.y, math.radians(angle), position.x, position.y)
+        vertices = camera.world_to_screen_points(points).data
+        count = len(vertices) // 2
 
-        # Add to Batch for drawing
-        if self._vlist is None:
-            # Get Batch and layers
-            win = kge.ServiceProvider.getWindow()
-            batch = win.batch
-            layers = win.render_layers
-            self._vlist = batch.add(self.shape.num_points, self.shape.mode, layers[self.entity.layer],
-                                    ("v2d/stream", tuple(vertices)),
-                                    ("c4Bn/dynamic",
-                                     tuple(
-                                         color) * self.shape.num_points))  # type: pyglet.graphics.vertexdomain.VertexList
+        win = kge.ServiceProvider.getWindow()
+        key = (mode, count, win.render_layers[self.entity.layer])
+        if self._vlist is not None and self._vlist_key == key:
+            # Update vertices, and colors only if they changed
+            self._vlist.vertices[:] = vertices
+            if self._vlist_color != color:
+                self._vlist.colors[:] = color * count
+                self._vlist_color = color
         else:
-            # Update vertices
-            self._vlist.vertices = vertices
-            self._vlist.colors = (*color,) * self.shape.num_points
+            # Add to Batch for drawing, again if the shape or the layer changed
+            if self._vlist is not None:
+                self._vlist.delete()
+            self._vlist = win.batch.add(count, mode, key[2],
+                                        ("v2d/stream", vertices),
+                                        ("c4Bn/dynamic", color * count)
+                                        )  # type: pyglet.graphics.vertexdomain.VertexList
+            self._vlist_key = key
+            self._vlist_color = color
 
     def on_disable_entity(self, ev: events.DisableEntity, dispatch):
         """
@@ -266,8 +164,12 @@ class SpriteRenderer(RenderComponent):
             self._vlist.delete()
             self._vlist = None
         if self._sprite is not None:
-            self._sprite.delete()
-            self._sprite = None
+            if self.entity.pool is not None:
+                # Pooled entities keep their sprite for the next time they are acquired
+                self._sprite.visible = False
+            else:
+                self._sprite.delete()
+                self._sprite = None
 
     def on_enable_entity(self, ev: events.EnableEntity, dispatch):
         if self._sprite is not None:
@@ -305,6 +207,22 @@ class SpriteRenderer(RenderComponent):
             self._sprite.delete()
             self._sprite = None
 
+    def hide(self):
+        """
+        Hide the sprite while its entity is out of the frame of the camera
+        """
+        if self._sprite is not None:
+            self._sprite.visible = False
+        self._changed = True
+
+    def preload(self):
+        """
+        Create the sprite before the first render, it stays hidden until the entity is enabled
+        """
+        if self._next_image is not None:
+            self.set_image()
+            self._sprite.visible = False
+
     def set_image(self):
         """
         Set Image
@@ -318,34 +236,51 @@ class SpriteRenderer(RenderComponent):
 
             # Set Sprite & delete vertices
             if self._sprite is not None:
+                # the regions of a sprite sheet share their texture & group, only texture coordinates change
+                group = self._sprite._group
                 self._sprite.image = self._image.load()
+                pixelate = self._sprite._group is not group
             else:
                 self._sprite = pyglet.sprite.Sprite(
                     img=self._image.load(), subpixel=True,
                     group=layers[self.entity.layer]
                 )
+                pixelate = True
 
             # Make the sprite pixelated
-            make_pixelated(self._sprite)
+            if pixelate:
+                make_pixelated(self._sprite)
 
             # Set debuggable
             if self._vlist is not None:
                 self._vlist.delete()
                 self._vlist = None
 
+            # the sprite has the size of its image now, move it in the spatial hash
+            scene = getattr(self.entity, "scene", None)
+            if scene is not None:
+                scene.mark_as_moved(self.entity)
+
+    @property
+    def image_pending(self) -> bool:
+        """
+        True while the image given to the sprite is not set, the size of the sprite is not known yet
+        """
+        return self._next_image is not None
+
     @property
     def width(self):
         if self._sprite is not None:
             return self._sprite.width / DEFAULT_PIXEL_RATIO
         else:
-            return self._w / DEFAULT_PIXEL_RATIO
+            return DEFAULT_SPRITE_RESOLUTION[0] * abs(self.entity.transform.scale.x) / DEFAULT_PIXEL_RATIO
 
     @property
     def height(self):
         if self._sprite is not None:
             return self._sprite.height / DEFAULT_PIXEL_RATIO
         else:
-            return self._h / DEFAULT_PIXEL_RATIO
+            return DEFAULT_SPRITE_RESOLUTION[1] * abs(self.entity.transform.scale.y) / DEFAULT_PIXEL_RATIO
 
     @property
     def image(self):
@@ -440,51 +375,54 @@ class SpriteRenderer(RenderComponent):
             camera = scene.main_camera
             win = kge.ServiceProvider.getWindow()
             batch = win.batch
-            # values
-            pos = camera.world_to_screen_point(self.entity.position)
             if self.entity is None or not isinstance(self.entity, kge.Sprite):
                 raise AttributeError(
                     "Sprite renderer components should be attached to Sprites ('kge.Sprite')")
             else:
-                # Do not do anything if i'm not in frame
+                # values, interpolated between the two last physics steps while the body moves
                 rb = self.entity.getComponent(kind=kge.RigidBody)
-                if rb is not None and (self._sprite is not None or self._vlist is not None):
-                    if rb.body_type == kge.RigidBodyType.DYNAMIC:
-                        if not camera.in_frame(self.entity, offset=1):
-                            self._sprite.visible = False
-                            return
-                        else:
-                            if self._sprite is not None:
-                                if self.visible:
-                                    self._sprite.visible = True
+                interpolated = rb is not None and rb.moving
+                transform = self.entity.transform
+                if interpolated:
+                    position, angle = rb.interpolate(scene.engine.interpolation_alpha)
+                else:
+                    position, angle = transform.position, transform.angle
+                pos = camera.world_to_screen_point(position)
+
+                # Show the sprite again if it has been hidden out of the frame
+                if self._sprite is not None and self._visible and not self._sprite.visible:
+                    self._sprite.visible = True
 
                 if self._next_image is not None:
+                    if scene.engine.preloader.request(self._next_image):
+                        # the image is decoded in the background, stay dirty until it is loaded
+                        self.entity.dirty = True
+                        return
                     self.set_image()
-                    pass
                 else:
                     # Check For transform, do not do anything if the entity has not moved
-                    t = self.entity.transform.t
+                    t = transform.t
                     if self._t.position != t.position \
                             or self._t.angle != t.angle\
-                            or self._scale != self.entity.transform.scale\
-                            or self._changed:
+                            or self._scale != transform.scale\
+                            or self._changed or interpolated:
                         self._t.position = *t.position,
                         self._t.angle = t.angle
-                        self._scale = self.entity.transform.scale
+                        self._scale = transform.scale
                         # TODO : IS IT PERFORMANT ?
                         self._changed = False
                     else:
+                        # nothing changed, it does not need to be rendered again
+                        self.entity.dirty = False
                         return
 
-                shape = None
                 if self._sprite is None:
                     if not self._visible:
                         if self._vlist is not None:
                             self._vlist.delete()
                             self._vlist = None
                     else:
-                        shape = self.draw_shape(camera)
-                        pass
+                        self.draw_shape(camera, position, angle)
                 else:
                     if not self._visible:
                         if self._sprite.batch is not None:
@@ -501,18 +439,15 @@ class SpriteRenderer(RenderComponent):
 
                         ratio = DEFAULT_PIXEL_RATIO / REFERENCE_PIXEL_RATIO
 
-                        self._sprite.update(pos.x, pos.y, -self.entity.transform.angle,
-                                            scale_x=self.entity.transform.scale.x * ratio,
-                                            scale_y=self.entity.transform.scale.y * ratio,
+                        self._sprite.update(pos.x, pos.y, -angle,
+                                            scale_x=transform.scale.x * ratio,
+                                            scale_y=transform.scale.y * ratio,
                                             )
 
-                # Remove From 'dirties' only if it not a dynamic RigidBody
-                dirty = False
-                rb = self.entity.getComponent(kind=kge.RigidBody)
-                if rb is not None and (self._sprite is not None or self._vlist is not None):
-                    if rb.body_type == kge.RigidBodyType.DYNAMIC:
-                        dirty = True
+                # Stay in 'dirties' only while the body moves, in order to be rendered at the next
+                # interpolated position, sleeping and resting bodies are marked again by the physics
+                # manager only when they move
+                dirty = interpolated and (self._sprite is not None or self._vlist is not None)
 
                 # mark/unmark as dirty
                 self.entity.dirty = dirty
-                return shape
@@ -0,0 +1,230 @@
+"""
+ON-DISK CACHE OF DECODED IMAGES.
+
+Images are stored decoded, as raw RGBA pixels, so that the next runs map them in
+memory and upload them to textures without decoding the PNG files again.
+
+Each blob is named by its source path and by the modification time & size of
+the source, a source which changed misses the cache and replaces its old blob.
+
+Pre-warm the cache at build time with :
+    python -m kge.graphics.texture_cache warm .texture_cache assets
+"""
+import argparse
+import ctypes
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import pyglet
+
+import kge.resources.vfs as vfs
+
+__all__ = 'TextureCache',
+
+logger = logging.getLogger(__name__)
+
+# magic, width, height
+HEADER = struct.Struct("<4sII")
+MAGIC = b"KGTX"
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+
+class TextureCache:
+    """
+    A folder of decoded images (raw RGBA), keyed by the path, the modification time
+    and the size of their source file.
+
+    Paths are kept as given (relative to the working directory like the names of the images),
+    so a cache warmed at build time is used wherever the game is installed, as long as the
+    sources keep their modification time.
+
+    Usage :
+        >>> Image.texture_cache = TextureCache(".texture_cache")
+
+    Or with 'kge.run(texture_cache=".texture_cache")'.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"TextureCache('{self.directory}', hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def stamp(path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Get what identifies the version of a source file : (source, modification time, size),
+        None if the file can not be found
+        """
+        pack = vfs.find(path)
+        if pack is not None:
+            stat = os.stat(pack.path)
+            return f"{pack.path.name}:{path}", stat.st_mtime_ns, pack.size(path)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return Path(path).as_posix(), stat.st_mtime_ns, stat.st_size
+
+    def _blob(self, path: str) -> Optional[Path]:
+        stamp = self.stamp(path)
+        if stamp is None:
+            return None
+        source, mtime, size = stamp
+        return self.directory / f"{_digest(source)}-{_digest(f'{mtime}:{size}')}.rgba"
+
+    def load(self, path: str) -> Optional[pyglet.image.ImageData]:
+        """
+        Get the decoded image of a source file, mapped in memory,
+        None if it is not in the cache or if it is stale
+        """
+        blob = self._blob(path)
+        if blob is None or not blob.is_file():
+            self.misses += 1
+            return None
+
+        with open(blob, "rb") as file:
+            # copy on write : the pixels are read lazily and can be given to GL as a ctypes array
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, width, height = HEADER.unpack_from(data) if len(data) >= HEADER.size else (None, 0, 0)
+        size = width * height * 4
+        if magic != MAGIC or len(data) != HEADER.size + size:
+            logger.warning(f"The cached texture of '{path}' is corrupted, it will be decoded again")
+            data.close()
+            blob.unlink()
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        pixels = (ctypes.c_ubyte * size).from_buffer(data, HEADER.size)
+        return pyglet.image.ImageData(width, height, "RGBA", pixels, width * 4)
+
+    def store(self, path: str, img: pyglet.image.AbstractImage) -> bool:
+        """
+        Store the decoded image of a source file, and remove its stale versions
+
+        :return: True if the image has been stored
+        """
+        blob = self._blob(path)
+        if blob is None:
+            return False
+
+        data = img.get_image_data()
+        width, height = data.width, data.height
+        pixels = data.get_data("RGBA", width * 4)
+
+        # write then rename, so that other processes & workers never read a partial blob
+        temp = blob.with_name(f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp, "wb") as file:
+            file.write(HEADER.pack(MAGIC, width, height))
+            file.write(pixels)
+        os.replace(temp, blob)
+
+        self._remove_stale(blob)
+        return True
+
+    def _remove_stale(self, blob: Path):
+        source = blob.name.split("-")[0]
+        for old in self.directory.glob(f"{source}-*.rgba"):
+            if old != blob:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+    def invalidate(self, path: str):
+        """
+        Remove the decoded images of a source file
+        """
+        stamp = self.stamp(path)
+        if stamp is not None:
+            for blob in self.directory.glob(f"{_digest(stamp[0])}-*.rgba"):
+                blob.unlink()
+
+    def clear(self):
+        """
+        Remove all the decoded images
+        """
+        for blob in self.directory.glob("*.rgba"):
+            blob.unlink()
+
+    def warm(self, paths: Iterable[str]) -> int:
+        """
+        Decode the images which are not in the cache yet
+
+        :return: the number of images decoded
+        """
+        decoded = 0
+        for path in paths:
+            blob = self._blob(path)
+            if blob is None or blob.is_file():
+                continue
+            try:
+                if vfs.find(path) is not None:
+                    with vfs.open(path) as file:
+                        img = pyglet.image.load(path, file=file)
+                else:
+                    img = pyglet.image.load(path)
+            except Exception as e:
+                logger.error(f"There was an error when reading File '{path}': {e}")
+                continue
+            decoded += self.store(path, img)
+        return decoded
+
+
+def _image_files(sources: Iterable[str]) -> Iterable[str]:
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            for path in sorted(source.rglob("*")):
+                if path.suffix.lower() in IMAGE_EXTENSIONS:
+                    yield path.as_posix()
+        else:
+            yield source.as_posix()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m kge.graphics.texture_cache",
+                                     description="Manage the on-disk cache of decoded images")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm = commands.add_parser("warm", help="decode images in the cache")
+    warm.add_argument("directory", help="the folder of the cache")
+    warm.add_argument("sources", nargs="*", help="images, or folders to search for images")
+    warm.add_argument("--pack", action="append", default=[], help="a pack to mount, its images are decoded")
+
+    clear = commands.add_parser("clear", help="remove all the decoded images")
+    clear.add_argument("directory", help="the folder of the cache")
+
+    args = parser.parse_args(argv)
+    cache = TextureCache(args.directory)
+    if args.command == "warm":
+        paths = list(_image_files(args.sources))
+        for pack in args.pack:
+            pack = vfs.mount(pack)
+            paths.extend(name for name in pack if Path(name).suffix.lower() in IMAGE_EXTENSIONS)
+        print(f"Decoded {cache.warm(paths)} of {len(paths)} images in '{cache.directory}'")
+    else:
+        cache.clear()
+        print(f"Cleared '{cache.directory}'")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
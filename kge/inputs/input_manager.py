@@ -195,6 +195,10 @@ class InputManager(System):
         """
         Attach Handlers when the scene starts
         """
+        if self.engine.headless:
+            # There is no window to listen to
+            return
+
         if self.window_ref is None:
             try:
                 window = kge.Window.window
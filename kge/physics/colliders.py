@@ -2,6 +2,7 @@
 # import Box2D as b2
 import platform
 import sys
+from array import array
 from typing import Union, Callable, List, Optional
 
 import pyglet
@@ -59,6 +60,8 @@ class Collider(BaseComponent):
 
         # Vertices of the shape of the collider
         self._shape_vlist = None  # type: Optional[pyglet.graphics.vertexdomain.VertexList]
+        # outline of the shape in the coordinates of the body, cached by the debug drawer
+        self._outline = None  # type: Optional[array]
 
     @property
     def fixture(self):
@@ -134,13 +137,26 @@ class Collider(BaseComponent):
         if self._fixture is not None:
             self._fixture.density = val
 
+    def update_filter(self):
+        """
+        Set the collision filter of the fixture from the layer of the entity
+        """
+        if self._fixture is None or self.entity is None:
+            return
+
+        category, mask = kge.ServiceProvider.getPhysics().layer_filter(self.entity.layer)
+        self._fixture.filterData = b2.b2Filter(categoryBits=category, maskBits=mask, groupIndex=0)
+
     def __recreate(self):
+        category, mask = kge.ServiceProvider.getPhysics().layer_filter(self.entity.layer)
         self._rb.body.CreateFixture(b2.b2FixtureDef(
             density=self.density,
             restitution=self.bounciness,
             isSensor=self.isSensor,
             shape=self.shape,
             friction=self.friction,
+            categoryBits=category,
+            maskBits=mask,
             userData=self
         ))
 
@@ -161,6 +177,9 @@ class Collider(BaseComponent):
         while physics.world.locked:
             continue
 
+        # Layers which do not collide are filtered by Box2D with these bits
+        category, mask = physics.layer_filter(self.entity.layer)
+
         body.CreateFixture(
             defn=b2.b2FixtureDef(
                 density=self.density,
@@ -168,6 +187,8 @@ class Collider(BaseComponent):
                 isSensor=self.isSensor,
                 shape=self.shape,
                 friction=self.friction,
+                categoryBits=category,
+                maskBits=mask,
                 userData=self
             )
         )
@@ -284,6 +305,8 @@ class BoxCollider(Collider):
 
             self._box = box
             self._fixture.shape.box = *self._box,
+            self._outline = None
+            self.entity.debuggable = True
 
 
 class CameraCollider(BoxCollider):
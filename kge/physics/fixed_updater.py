@@ -1,14 +1,46 @@
+import pyglet
+
+from kge.clocks.fixed_step import FixedStepClock
 from kge.clocks.updater import Updater
 from kge.core import events
-from kge.core.constants import FIXED_FPS
+from kge.core.constants import FIXED_FPS, MAX_FIXED_STEPS
 
 
 class FixedUpdater(Updater):
     """
-    Updater for physics systems
+    Updater for physics systems, the time elapsed each frame is accumulated
+    and converted into fixed steps (at most 'max_fixed_steps' per frame).
+
+    Each fixed update is followed by its physics step, both are fired right away
+    on the main thread, so that a step sees the forces of its own fixed update.
+    The events dispatched by the handlers are queued as usual.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, max_fixed_steps: int = MAX_FIXED_STEPS, **kwargs):
         super().__init__(time_step=1 / (FIXED_FPS ), **kwargs)
         self.event_to_dispatch = events.FixedUpdate
         self.after_event = events.PhysicsUpdate
+        self.clock = FixedStepClock(self.time_step, max_steps=max_fixed_steps)
+
+    def fire(self, event: events.Event):
+        """
+        Fire an event of a fixed step without waiting for the next frame
+        """
+        self.engine.dispatch_event(event, on_main=True)
+
+    def __enter__(self):
+        # Feed the accumulator every frame
+        pyglet.clock.schedule(self.update)
+
+    def update(self, dt):
+        steps = self.clock.advance(dt)
+        if steps:
+            self.update_steps(steps)
+        self.engine.interpolation_alpha = self.clock.alpha
+
+    def update_steps(self, steps: int):
+        """
+        Run the fixed steps late for this frame, each fixed update then its physics step
+        """
+        for _ in range(steps):
+            self.update_entities(self.time_step)
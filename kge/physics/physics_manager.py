@@ -3,7 +3,7 @@ import math
 import platform
 import sys
 from itertools import chain
-from typing import Callable, Union, List, Tuple, Sequence, Optional, Set
+from typing import Callable, Union, List, Tuple, Sequence, Optional, Set, Dict, FrozenSet, Iterable
 
 import pyglet
 from pyglet import gl
@@ -17,11 +17,15 @@ from kge.core.events import CollisionEnter, CollisionExit, CreateBody, BodyCreat
     PhysicsUpdate, CollisionBegin, CollisionEnd
 from kge.core.events import Event
 from kge.core.service import Service
+from kge.graphics.shapes import unit_circle
 from kge.physics.colliders import Collider, CameraCollider, CircleCollider, TriangleCollider, PolygonCollider, \
     BoxCollider, EdgeCollider, SegmentCollider
 from kge.physics.joints import Joint
+from kge.physics.physics_process import RemoteWorld, shared_memory
 from kge.physics.rigid_body import RigidBody, RigidBodyType
-from kge.utils.vector import Vector
+from array import array
+
+from kge.utils.vector import Vector, Vec2Array
 
 if sys.platform == "win32":
     if platform.architecture()[0] == "64bit":
@@ -46,12 +50,19 @@ class grBlended(pyglet.graphics.Group):
 
 
 class ContactFilter(b2.b2ContactFilter):
+    """
+    A contact filter called by Box2D for each pair of fixtures that may collide.
+
+    Layers are filtered by the category & mask bits of the fixtures, so this filter
+    is only installed on the world for a custom filter (see 'PhysicsManager.set_contact_filter'),
+    or when there are too many layers in the collision matrix for the bits.
+    """
+
     def __init__(self, system: "PhysicsManager"):
         b2.b2ContactFilter.__init__(self)
         self.system = system
 
     def ShouldCollide(self, fix1: b2.b2Fixture, fix2: b2.b2Fixture):
-        # Implements the default behavior of b2ContactFilter in Python
         col1 = fix1.userData
         col2 = fix2.userData
 
@@ -60,10 +71,12 @@ class ContactFilter(b2.b2ContactFilter):
             layer2 = col2.entity.layer
 
             if (layer1, layer2) in self.system.layers_to_ignore or (layer2, layer1) in self.system.layers_to_ignore:
-                # TODO : Filter collision based on their layer
                 return False
-            else:
-                return True
+
+            custom = self.system.custom_filter
+            if custom is not None:
+                return bool(custom(col1, col2))
+            return True
         else:
             return False
 
@@ -112,6 +125,18 @@ class grText(pyglet.graphics.Group):
         gl.glMatrixMode(gl.GL_MODELVIEW)
 
 
+def line_pairs(vertices: Sequence[Tuple[float, float]], closed: bool = True) -> array:
+    """
+    Get the segments between the vertices given as GL_LINES pairs (x1, y1, x2, y2, ...)
+    """
+    out = array("d")
+    for i in range(len(vertices) - 1):
+        out.extend((*vertices[i], *vertices[i + 1]))
+    if closed and len(vertices) > 2:
+        out.extend((*vertices[-1], *vertices[0]))
+    return out
+
+
 class DebugDrawer(b2.b2Draw):
     """
     This debug draw class accepts callbacks from Box2D (which specifies what to draw)
@@ -123,8 +148,8 @@ class DebugDrawer(b2.b2Draw):
     blended = grBlended()
     circle_segments = 40
     surface = None
-    circle_cache_tf = {}  # triangle fan (inside)
-    circle_cache_ll = {}  # line loop (border)
+    circle_tf = unit_circle(circle_segments, fan=True)  # triangle fan (inside)
+    circle_ll = unit_circle(circle_segments)  # line loop (border)
 
     def __init__(self, system: "PhysicsManager"):
         super(DebugDrawer, self).__init__()
@@ -133,6 +158,8 @@ class DebugDrawer(b2.b2Draw):
         self.world_batch = None  # type: Optional[pyglet.graphics.Batch]
         self.debug_batch = None  # type: Optional[pyglet.graphics.Batch]
         self.system = system
+        # pixels per unit of the geometry in the world batch, all of it is redrawn when it changes
+        self._ratio = None  # type: Optional[float]
         self.flags = dict(
             drawJoints=False,
             drawShapes=True,
@@ -184,85 +211,28 @@ class DebugDrawer(b2.b2Draw):
 
         return len(out) // 2, out
 
-    def _getLLCircleVertices(self, radius, points):
+    def ratio(self) -> float:
         """
-        Get the line loop-style vertices for a given circle.
-        Drawn as lines.
-
-        "Line Loop" is used as that's how the C++ code draws the
-        vertices, with lines going around the circumference of the
-        circle (GL_LINE_LOOP).
-
-        This returns 'points' amount of lines approximating the
-        border of a circle.
-
-        (x1, y1, x2, y2, x3, y3, ...)
+        Pixels per unit of the main camera
         """
-        ret = []
-        step = 2 * math.pi / points
-        n = 0
-        for i in range(points):
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-            n += step
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-        return ret
-
-    def _getTFCircleVertices(self, radius, points):
-        """
-        Get the triangle fan-style vertices for a given circle.
-        Drawn as triangles.
-
-        "Triangle Fan" is used as that's how the C++ code draws the
-        vertices, with triangles originating at the center of the
-        circle, extending around to approximate a filled circle
-        (GL_TRIANGLE_FAN).
-
-        This returns 'points' amount of lines approximating the
-        circle.
-
-        (a1, b1, c1, a2, b2, c2, ...)
-        """
-        ret = []
-        step = 2 * math.pi / points
-        n = 0
-        for i in range(points):
-            ret.append((0.0, 0.0))
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-            n += step
-            ret.append((math.cos(n) * radius, math.sin(n) * radius))
-        return ret
+        cam = self.system.engine.current_scene.main_camera
+        return cam.world_to_screen_point(Vector(1, 0)).x
 
-    def getCircleVertices(self, center, radius, points):
+    def getCircleVertices(self, center, radius, points=None):
         """
         Returns the triangles that approximate the circle and
         the lines that border the circles edges, given
-        (center, radius, points).
+        (center, radius), in screen coordinates.
 
-        Caches the calculated LL/TF vertices, but recalculates
-        based on the center passed in.
-
-        Currently, there's only one point amount,
-        so the circle cache ignores it when storing. Could cause
-        some confusion if you're using multiple point counts as
-        only the first stored point-count for that radius will
-        show up.
+        The vertices are the unit circle tables scaled and moved, so no
+        trigonometry is done per circle, 'points' is ignored (see 'circle_segments').
 
         Returns: (tf_vertices, ll_vertices)
         """
-        if radius not in self.circle_cache_tf:
-            self.circle_cache_tf[radius] = self._getTFCircleVertices(radius, points)
-            self.circle_cache_ll[radius] = self._getLLCircleVertices(radius, points)
-
-        ret_tf, ret_ll = [], []
-
-        for x, y in self.circle_cache_tf[radius]:
-            ret_tf.extend(
-                self.to_screen((x + center[0], y + center[1]))
-            )
-        for x, y in self.circle_cache_ll[radius]:
-            ret_ll.extend(
-                self.to_screen((x + center[0], y + center[1]))
-            )
+        ratio = self.ratio()
+        r, x, y = radius * ratio, center[0] * ratio, center[1] * ratio
+        ret_tf = Vec2Array.from_flat(self.circle_tf).transform(r, r, 0, x, y).data
+        ret_ll = Vec2Array.from_flat(self.circle_ll).transform(r, r, 0, x, y).data
         return ret_tf, ret_ll
 
     def DrawCircle(self, center, radius, color=None):
@@ -422,11 +392,20 @@ class DebugDrawer(b2.b2Draw):
 
     def drawWorld(self, scene: 'kge.Scene'):
         """
-        Draw the world
+        Draw the world.
+
+        The geometry of each entity stays in the world batch and is only updated
+        when the entity is marked as debuggable (when it moves), or when the camera zoom changes.
         """
         # Get Debuggable entities
         entities = scene.debuggable  # scene.entity_layers(kge.Entity, renderable=False, debuggable=True, check_active=False)
 
+        ratio = self.ratio()
+        if ratio != self._ratio:
+            # the geometry is in pixels, redraw everything
+            self._ratio = ratio
+            entities = [e for e in scene.all if e.is_active]
+
         # Draw Debug Data
         for e in set(entities):
             drawn = False
@@ -440,10 +419,8 @@ class DebugDrawer(b2.b2Draw):
                 drawn = True
 
             if drawn:
-                if e.getComponent(RigidBody) is None:
-                    e.debuggable = False
-                elif e.getComponent(RigidBody).body_type is not RigidBodyType.DYNAMIC:
-                    e.debuggable = False
+                # drawn again once it moves
+                e.debuggable = False
 
     def drawJoints(self, *joints: Joint):
         """
@@ -459,26 +436,28 @@ class DebugDrawer(b2.b2Draw):
         """
         drawn = True
         for col in colliders:
-            if col.rb_attached is not None:
-                if col.rb_attached.body is not None:
-                    xf = col.rb_attached.body.transform
-                    vertices, mode, colors = self.drawShape(col, xf)
+            rb = col.rb_attached
+            if rb is not None and rb.body is not None:
+                if rb._mirror is not None:
+                    x, y, angle = rb._mirror
+                else:
+                    position = rb.body.position
+                    x, y, angle = position.x, position.y, rb.body.angle
+                vertices, mode, colors = self.drawShape(col, x, y, angle)
 
-                    if not vertices:
-                        continue
+                if not vertices:
+                    continue
 
-                    if col.vlist is None:
-                        # Add vertices to Batch
-                        count = len(vertices) // 2
+                if col.vlist is None:
+                    # Add vertices to Batch
+                    count = len(vertices) // 2
 
-                        col.vlist = self.world_batch.add(count, mode, self.group,
-                                                         ('v2f/stream', vertices),
-                                                         ('c3f/dynamic', colors))
-                    else:
-                        # Update vertices
-                        col.vlist.vertices = vertices
+                    col.vlist = self.world_batch.add(count, mode, self.group,
+                                                     ('v2f/stream', vertices),
+                                                     ('c3f/static', colors))
                 else:
-                    drawn = False
+                    # Update vertices
+                    col.vlist.vertices = vertices
             else:
                 drawn = False
 
@@ -525,48 +504,49 @@ class DebugDrawer(b2.b2Draw):
                 e.vlist.vertices = vertices
                 e.xf_vlist.vertices = xf_vertices
 
-    def drawShape(self, col: Collider, xf: b2.b2Transform) -> Tuple[List[int], int, List[int]]:
+    def outline(self, col: Collider) -> array:
         """
-        Draw a Shape
+        Get the outline of the shape of a collider, in the coordinates of its body, as GL_LINES pairs.
+        It is computed once per collider.
         """
-        color = b2.b2Color(*[c / 255 for c in GREEN[:3]])
-        vertices = []
-        mode = gl.GL_LINES
-
-        if isinstance(col, CircleCollider):
-            center = xf * col.offset
-            radius = col.radius
-
-            vertices = self.DrawCircle(center, radius)
+        if col._outline is None:
+            if isinstance(col, CircleCollider):
+                r = col.radius
+                offset = col.offset
+                col._outline = Vec2Array.from_flat(self.circle_ll).transform(r, r, 0, offset.x, offset.y).data
 
-        elif isinstance(col, (TriangleCollider, PolygonCollider, BoxCollider)):
-            count = col.shape.vertexCount
-            vces = col.shape.vertices
-            assert count <= b2.b2_maxPolygonVertices
+            elif isinstance(col, (TriangleCollider, PolygonCollider, BoxCollider)):
+                shape = col.shape
+                assert shape.vertexCount <= b2.b2_maxPolygonVertices
+                col._outline = line_pairs(shape.vertices)
 
-            for i in range(count):
-                vertices.append(xf * vces[i])
+            elif isinstance(col, EdgeCollider):
+                col._outline = line_pairs(col.shape.vertices, closed=False)
 
-            vertices = self.DrawPolygon(vertices)
+            elif isinstance(col, SegmentCollider):
+                shape = col.shape
+                col._outline = line_pairs((tuple(shape.vertex1), tuple(shape.vertex2)))
 
-        elif isinstance(col, EdgeCollider):
-            count = col.shape.vertexCount
-            vces = col.shape.vertices
+            else:
+                col._outline = array("d")
 
-            v1 = xf * vces[0]
-            for i in range(1, count):
-                v2 = xf * vces[i]
-                [vertices.append(v) for v in self.DrawSegment(v1, v2)]
-                v1 = v2
+        return col._outline
 
-        elif isinstance(col, SegmentCollider):
-            v1 = xf * col.shape.vertex1
-            v2 = xf * col.shape.vertex2
+    def drawShape(self, col: Collider, x: float, y: float, angle: float) -> Tuple[array, int, List[float]]:
+        """
+        Draw a Shape of a body at (x, y) rotated by 'angle' radians
+        """
+        outline = self.outline(col)
+        count = len(outline) // 2
+        if not count:
+            return outline, gl.GL_LINES, []
 
-            vertices = self.DrawSegment(v1, v2)
+        # the outline moved with the body, then converted to pixels
+        ratio = self.ratio()
+        vertices = Vec2Array.from_flat(outline).transform(ratio, ratio, angle, x * ratio, y * ratio).data
 
-        colors = [color.r, color.g, color.b] * (len(vertices) // 2)
-        return vertices, mode, colors
+        colors = [c / 255 for c in GREEN[:3]] * count
+        return vertices, gl.GL_LINES, colors
 
 
 class ContactListener(b2.b2ContactListener):
@@ -626,13 +606,17 @@ class OverlapInfo(b2.b2QueryCallback):
     MULTIPLE = 1
     ONE = 0
 
-    def __init__(self, type=ONE, layer=None):
+    def __init__(self, type=ONE, layer=None, shape: b2.b2Shape = None, xf: b2.b2Transform = None):
         super().__init__()
         self.type = type
         self.colliders = []  # type: List[Collider]
         self.collider = None
         self.layer = layer
 
+        # if given, only the fixtures overlapping this shape (at the transform 'xf') are reported
+        self.shape = shape
+        self.xf = xf
+
     def ReportFixture(self, fixture):
         """
         Called for each fixture found in the query AABB.
@@ -645,6 +629,10 @@ class OverlapInfo(b2.b2QueryCallback):
         if collider is not None and not isinstance(collider, Collider):
             # We pass through each fixture which is not a collider
             return True
+        elif self.shape is not None and not b2.b2TestOverlap(self.shape, 0, fixture.shape, 0,
+                                                            self.xf, fixture.body.transform):
+            # The fixture is in the AABB but does not overlap the shape
+            return True
         else:
             if self.layer is not None:
                 if self.layer == collider.entity.layer:
@@ -749,18 +737,134 @@ class RayCastInfo(b2.b2RayCastCallback):
             return 1.0
 
 
+class BatchQuery(b2.b2QueryCallback):
+    """
+    A query callback reused for many regions or circles, see 'PhysicsManager.query_regions'
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.colliders = []  # type: List[Collider]
+        self.layer = None  # type: Optional[int]
+        self.shape = None  # type: Optional[b2.b2Shape]
+        self.xf = b2.b2Transform()
+        self.xf.SetIdentity()
+
+    def reset(self, layer: Optional[int], shape: b2.b2Shape = None):
+        self.colliders = []
+        self.layer = layer
+        self.shape = shape
+
+    def ReportFixture(self, fixture):
+        collider = fixture.userData
+        if not isinstance(collider, Collider):
+            return True
+        if self.layer is not None and collider.entity.layer != self.layer:
+            return True
+        if self.shape is not None and not b2.b2TestOverlap(self.shape, 0, fixture.shape, 0,
+                                                           self.xf, fixture.body.transform):
+            return True
+
+        self.colliders.append(collider)
+        return True
+
+
+class BatchRayCast(b2.b2RayCastCallback):
+    """
+    A ray cast callback reused for many rays, it keeps the closest hit of the current ray
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.layer = None  # type: Optional[int]
+        self.cast_sensors = False
+        self.collider = None  # type: Optional[Collider]
+        self.point = self.normal = (0., 0.)
+        self.fraction = 1.
+
+    def reset(self, layer: Optional[int], cast_sensors: bool):
+        self.layer = layer
+        self.cast_sensors = cast_sensors
+        self.collider = None
+        self.fraction = 1.
+
+    def ReportFixture(self, fixture, point, normal, fraction):
+        collider = fixture.userData
+        if not isinstance(collider, Collider):
+            return -1
+        if self.layer is not None and collider.entity.layer != self.layer:
+            return -1
+        if not self.cast_sensors and collider.isSensor:
+            return -1
+
+        self.collider = collider
+        # pybox2d gives the point and the normal as tuples
+        self.point = tuple(point)
+        self.normal = tuple(normal)
+        self.fraction = fraction
+
+        # clip the ray in order to find the closest hit
+        return fraction
+
+
+class RayCastBatch:
+    """
+    The closest hits of a batch of rays, one row per ray.
+    Rays which hit nothing have no collider, a fraction of 1 and their end as point.
+        >>> hits = PhysicsManager.ray_cast_many(origins, directions, distance=10)
+        >>> for collider, point, normal in hits:
+        >>>     ...
+    """
+
+    def __init__(self):
+        self.colliders = []  # type: List[Optional[Collider]]
+        self.points = Vec2Array()
+        self.normals = Vec2Array()
+        self.fractions = array("d")
+
+    def __len__(self):
+        return len(self.colliders)
+
+    def __getitem__(self, item: int) -> Tuple[Optional[Collider], Vector, Vector]:
+        return self.colliders[item], self.points[item], self.normals[item]
+
+    def __iter__(self):
+        return zip(self.colliders, self.points, self.normals)
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of rays which hit a collider
+        """
+        return len(self.colliders) - self.colliders.count(None)
+
+
+def _pairs(values) -> Sequence[Tuple[float, float]]:
+    """
+    Get (x, y) pairs from vectors, tuples or a Vec2Array
+    """
+    if isinstance(values, Vec2Array):
+        data = values.data
+        return list(zip(data[0::2], data[1::2]))
+    return [(v[0], v[1]) for v in values]
+
+
 class PhysicsManager(ComponentSystem):
     """
     The system that handles movement, collision detection and can perform region queries and ray casts
+
+    With 'physics_process=True' the world is stepped in a separate process (see 'RemoteWorld'),
+    so that heavy physics do not compete with the behaviours for the GIL. Region queries and
+    ray casts are not available in this mode, and it needs python 3.8 or newer.
+        >>> kge.run(setup, physics_process=True)
     TODO :
        - ONE WAY COLLISION
        - JOINTS
-       - OVERLAPS CIRCLE
     """
     contact_listener: ContactListener = None
     contact_filter: ContactFilter = None
     destruction_listener: DestructionListener = None
-    world: Optional[b2.b2World]
+    world: Union[b2.b2World, RemoteWorld, None]
     pause: bool = False
     engine: "kge.Engine"
 
@@ -771,12 +875,80 @@ class PhysicsManager(ComponentSystem):
         l1 = self.engine.current_scene.getLayer(layer1)
         l2 = self.engine.current_scene.getLayer(layer2)
 
-        if not ((l1, l2) in self.layers_to_ignore and (l2, l1) in self.layers_to_ignore):
+        if not ((l1, l2) in self.layers_to_ignore or (l2, l1) in self.layers_to_ignore):
             self.layers_to_ignore.add((l1, l2))
-        # raise NotImplementedError("Not implemented Yet !")
+            self.compile_layer_filters()
 
-    @classmethod
-    def overlap_circle(cls, center: Vector, radius: float, layer: Union[int, str, None] = None,
+    def compile_layer_filters(self):
+        """
+        Compile the layer collision matrix into Box2D category & mask bits.
+
+        Each layer which ignores another one gets its own category bit, all the other
+        layers share the first bit. If more than 15 layers are in the matrix, the layers
+        are filtered by the python ContactFilter instead.
+        """
+        layers = sorted({layer for pair in self.layers_to_ignore for layer in pair})
+
+        if len(layers) > 15:
+            self._layer_filters = None
+        else:
+            bits = {layer: 1 << (i + 1) for i, layer in enumerate(layers)}
+            filters = {}
+            for layer, bit in bits.items():
+                mask = 0xFFFF
+                for l1, l2 in self.layers_to_ignore:
+                    if l1 == layer:
+                        mask &= ~bits[l2]
+                    if l2 == layer:
+                        mask &= ~bits[l1]
+                filters[layer] = (bit, mask)
+            self._layer_filters = filters
+
+        self._install_contact_filter()
+
+        # Update the fixtures already created
+        if self.world is not None:
+            while self.world.locked:
+                continue
+            for body in self.world.bodies:
+                for fixture in body.fixtures:
+                    if isinstance(fixture.userData, Collider):
+                        fixture.userData.update_filter()
+
+    def layer_filter(self, layer: int) -> Tuple[int, int]:
+        """
+        Get the category & mask bits of the fixtures of a layer
+        """
+        if self._layer_filters is None:
+            return 0x0001, 0xFFFF
+        return self._layer_filters.get(layer, (0x0001, 0xFFFF))
+
+    def set_contact_filter(self, should_collide: Optional[Callable[[Collider, Collider], bool]]):
+        """
+        Set a function which decides if two colliders should collide, it is called by Box2D
+        for every pair of colliders which may collide, pass None to remove it.
+            >>> Physics.set_contact_filter(lambda c1, c2: c1.entity.tag != c2.entity.tag)
+        """
+        self.custom_filter = should_collide
+        self._install_contact_filter()
+
+    def _install_contact_filter(self):
+        """
+        Install the python contact filter on the world only if it is needed
+        """
+        if self.world is None:
+            return
+
+        if self.custom_filter is not None or self._layer_filters is None:
+            if self.physics_process:
+                self.logger.warning("Custom contact filters and more than 15 layers ignoring collisions "
+                                    "are not supported when the physics run in a separate process")
+            self.world.contactFilter = self.contact_filter
+        else:
+            # filter with the category & mask bits in Box2D
+            self.world.contactFilter = self._default_contact_filter
+
+    def overlap_circle(self, center: Vector, radius: float, layer: Union[int, str, None] = None,
                        type=OverlapInfo.MULTIPLE) -> OverlapInfo:
         """
         Query for colliders which are in a given circle region
@@ -791,25 +963,135 @@ class PhysicsManager(ComponentSystem):
             Example of use :
                 >>> PhysicsManager.overlap_circle( center=Vector(0, 0), radius=1, type=OverlapInfo.ONE, layer="Ground" )
         """
-        # if type in (OverlapInfo.MULTIPLE, OverlapInfo.ONE):
-        #     lay = None
-        #     if layer is not None:
-        #         lay = cls.engine.current_scene.getLayer(layer)
-        #     cb = OverlapInfo(type=type, layer=lay)
-        #
-        #     # Make a small box.
-        #     aabb = b2.b2AABB(lowerBound=center - Vector(radius, radius),
-        #                      upperBound=center + Vector(radius, radius))
-        #
-        #     # Query the world for overlapping shapes.
-        #     self.world.QueryAABB(cb, aabb)
-        #
-        #     return cb
-        # else:
-        #     raise ValueError(
-        #         "Overlap Type should be one of 'OverlapInfo.ONE or OverlapInfo.MULTIPLE'")
-        # TODO
-        raise NotImplementedError("Not implemented yet !")
+        if type in (OverlapInfo.MULTIPLE, OverlapInfo.ONE):
+            lay = None
+            if layer is not None:
+                lay = self.engine.current_scene.getLayer(layer)
+
+            # The fixtures in the bounding box of the circle are tested against the circle
+            xf = b2.b2Transform()
+            xf.SetIdentity()
+            xf.position = (center.x, center.y)
+            cb = OverlapInfo(type=type, layer=lay, shape=b2.b2CircleShape(radius=abs(radius)), xf=xf)
+
+            # Make a small box.
+            aabb = b2.b2AABB(lowerBound=(center.x - abs(radius), center.y - abs(radius)),
+                             upperBound=(center.x + abs(radius), center.y + abs(radius)))
+
+            if self.world is not None:
+                # Query the world for overlapping shapes.
+                self.world.QueryAABB(cb, aabb)
+
+            return cb
+        else:
+            raise ValueError(
+                "Overlap Type should be one of 'OverlapInfo.ONE or OverlapInfo.MULTIPLE'")
+
+    def query_regions(self, centers: Union[Sequence[Vector], Vec2Array], sizes: Union[Sequence[Vector], Vec2Array],
+                      layer: Union[int, str, None] = None) -> List[List[Collider]]:
+        """
+        Query many regions in one call, the callback and the bounding box are reused for each region.
+
+        :return: the colliders found in each region
+            Example of use :
+                >>> found = PhysicsManager.query_regions([Vector(0, 0), Vector(4, 0)], [Vector(1, 1)] * 2)
+        """
+        centers, sizes = _pairs(centers), _pairs(sizes)
+        if len(centers) != len(sizes):
+            raise ValueError("There should be as many sizes as centers")
+
+        lay = None if layer is None else self.engine.current_scene.getLayer(layer)
+        cb, aabb = self._batch_query, b2.b2AABB()
+        found = []  # type: List[List[Collider]]
+
+        for (x, y), (w, h) in zip(centers, sizes):
+            w, h = abs(w) / 2, abs(h) / 2
+            cb.reset(lay)
+            if self.world is not None:
+                aabb.lowerBound = (x - w, y - h)
+                aabb.upperBound = (x + w, y + h)
+                self.world.QueryAABB(cb, aabb)
+            found.append(cb.colliders)
+
+        return found
+
+    def overlap_circles(self, centers: Union[Sequence[Vector], Vec2Array], radii: Union[float, Sequence[float]],
+                        layer: Union[int, str, None] = None) -> List[List[Collider]]:
+        """
+        Query the colliders overlapping many circles in one call, the callback,
+        the circle shape and the bounding box are reused for each circle.
+
+        :return: the colliders found in each circle
+        """
+        centers = _pairs(centers)
+        if isinstance(radii, (int, float)):
+            radii = [radii] * len(centers)
+        if len(centers) != len(radii):
+            raise ValueError("There should be as many radii as centers")
+
+        lay = None if layer is None else self.engine.current_scene.getLayer(layer)
+        cb, aabb, circle = self._batch_query, b2.b2AABB(), b2.b2CircleShape()
+        found = []  # type: List[List[Collider]]
+
+        for (x, y), radius in zip(centers, radii):
+            radius = abs(radius)
+            cb.reset(lay, circle)
+            if self.world is not None:
+                circle.radius = radius
+                cb.xf.position = (x, y)
+                aabb.lowerBound = (x - radius, y - radius)
+                aabb.upperBound = (x + radius, y + radius)
+                self.world.QueryAABB(cb, aabb)
+            found.append(cb.colliders)
+
+        return found
+
+    def ray_cast_many(self, origins: Union[Sequence[Vector], Vec2Array], directions: Union[Sequence[Vector], Vec2Array],
+                      distance: Union[float, Sequence[float]], layer: Union[int, str, None] = None,
+                      cast_sensors: bool = False) -> RayCastBatch:
+        """
+        Cast many rays in one call and get the closest hit of each one, the callback is reused for each ray.
+
+        :param origins: the origin points of the rays
+        :param directions: the directions of the rays, they are normalized
+        :param distance: the distance of all the rays, or one distance per ray
+        :return: an object of type RayCastBatch, with the colliders, points, normals & fractions of the hits
+            Example of use :
+                >>> hits = PhysicsManager.ray_cast_many([Vector(0, 0)] * 2, [Vector.Up(), Vector.Right()], 10)
+                >>> print(hits.colliders)
+        """
+        origins, directions = _pairs(origins), _pairs(directions)
+        if isinstance(distance, (int, float)):
+            distance = [distance] * len(origins)
+        if not len(origins) == len(directions) == len(distance):
+            raise ValueError("There should be as many directions & distances as origins")
+
+        lay = None if layer is None else self.engine.current_scene.getLayer(layer)
+        cb = self._batch_ray_cast
+        result = RayCastBatch()
+        points, normals = result.points.data, result.normals.data
+
+        for (x, y), (dx, dy), dist in zip(origins, directions, distance):
+            # normalize the direction to make it of magnitude 1
+            length = math.hypot(dx, dy)
+            if length != 0:
+                dx, dy = dx / length, dy / length
+            end = (x + dx * dist, y + dy * dist)
+
+            cb.reset(lay, cast_sensors)
+            if self.world is not None and (end[0] != x or end[1] != y):
+                self.world.RayCast(cb, (x, y), end)
+
+            result.colliders.append(cb.collider)
+            result.fractions.append(cb.fraction)
+            if cb.collider is not None:
+                points.extend(cb.point)
+                normals.extend(cb.normal)
+            else:
+                points.extend(end)
+                normals.extend((0., 0.))
+
+        return result
 
     def query_region(self, center: Vector, size: Vector, layer: Union[int, str] = None,
                      type=RegionInfo.MULTIPLE) -> RegionInfo:
@@ -893,9 +1175,15 @@ class PhysicsManager(ComponentSystem):
             raise ValueError(
                 "RayCast Type should be one of 'RayCastInfo.MULTIPLE, RayCastInfo.CLOSEST, RayCastInfo.ANY'")
 
-    def __init__(self, engine, **_):
+    def __init__(self, engine, physics_process: bool = False, physics_bodies: int = 4096, **_):
         super(PhysicsManager, self).__init__(engine)
 
+        # step the world in a separate process, with at most 'physics_bodies' bodies
+        if physics_process and shared_memory is None:
+            raise RuntimeError("physics_process=True needs python 3.8 or newer")
+        self.physics_process = physics_process
+        self.physics_bodies = physics_bodies
+
         # state
         self.debug_drawer = DebugDrawer(self)
         self.contact_listener = ContactListener(self)
@@ -909,9 +1197,23 @@ class PhysicsManager(ComponentSystem):
         self.garbage_bodies = []  # type: List[b2.b2Body]
         # bodies to create
         self.new_bodies = []  # type: List[Tuple[RigidBody, BaseEntity]]
+        # rigid bodies synced on the last step
+        self._synced = set()  # type: Set[RigidBody]
+        # contacts touching in a restored world, which do not begin again on the next step
+        self._restored_contacts = None  # type: Optional[Set[FrozenSet[Collider]]]
 
-        # TODO : Implement layers in order to ignore collisions within different layers
+        # Layers which do not collide, compiled into the category & mask bits of the fixtures
         self.layers_to_ignore = set()  # type: Set[Tuple[int, int]]
+        # layer -> (category bits, mask bits), None if the layers are filtered in python
+        self._layer_filters = {}  # type: Optional[Dict[int, Tuple[int, int]]]
+        # a custom function (collider, collider) -> bool called by the contact filter
+        self.custom_filter = None  # type: Optional[Callable[[Collider, Collider], bool]]
+        # the default filter of Box2D, which uses the bits
+        self._default_contact_filter = b2.b2ContactFilter()
+
+        # callbacks reused by the batched queries
+        self._batch_query = BatchQuery()
+        self._batch_ray_cast = BatchRayCast()
 
         # world
         self.world = None
@@ -924,7 +1226,10 @@ class PhysicsManager(ComponentSystem):
             if self.world is not None:
                 # Disable garbage bodies from being simulated
                 for body in self.garbage_bodies:
-                    body.active = False
+                    if self.physics_process:
+                        self.world.DestroyBody(body)
+                    else:
+                        body.active = False
                     # Note: this has been removed because it causes bugs
                     # self.world.DestroyBody(body)
                 self.garbage_bodies.clear()
@@ -940,6 +1245,163 @@ class PhysicsManager(ComponentSystem):
                     FIXED_DELTA_TIME * event.time_scale, 10, 10)
                 self.world.ClearForces()
 
+                # Keep the transforms (and the spatial hash) of moving entities up to date
+                self.sync_transforms()
+
+                # The contacts of a restored world which did not begin again have ended
+                if self._restored_contacts is not None:
+                    for pair in self._restored_contacts:
+                        self.dispatch_contact(*pair, began=False)
+                    self._restored_contacts = None
+
+    def sync_transforms(self):
+        """
+        Copy the transform of the awake bodies, read once from Box2D after the step,
+        to their rigid bodies and the transforms of their entities.
+
+        Only the entities which moved are marked as dirty. The transform mirrored
+        before the step is kept for interpolation, sleeping & static bodies are not interpolated.
+        """
+        synced = set()  # type: Set[RigidBody]
+
+        for body in self.world.bodies:
+            if not body.awake or body.type == b2.b2_staticBody:
+                continue
+
+            rb = body.userData  # type: RigidBody
+            if rb is None:
+                continue
+
+            position = body.position
+            x, y, angle = position.x, position.y, body.angle
+
+            previous = rb._mirror
+            rb.previous_transform = previous
+            synced.add(rb)
+
+            e = rb.entity
+            if not rb.mirror(x, y, angle) or e is None:
+                continue
+
+            transform = e._transform
+            if previous is None or previous[0] != x or previous[1] != y:
+                transform.position = rb.position
+            if previous is None or previous[2] != angle:
+                transform.angle = rb.angle
+
+            e.dirty = True
+            e.debuggable = True
+
+        # Bodies which fell asleep are not interpolated anymore
+        for rb in self._synced - synced:
+            rb.previous_transform = None
+        self._synced = synced
+
+    def touching_contacts(self) -> List[Tuple[Collider, Collider]]:
+        """
+        Get the pairs of colliders which are touching
+        """
+        if self.world is None or self.physics_process:
+            return []
+
+        pairs = []
+        for contact in self.world.contacts:
+            if contact.touching:
+                collider_a, collider_b = contact.fixtureA.userData, contact.fixtureB.userData
+                if isinstance(collider_a, Collider) and isinstance(collider_b, Collider):
+                    pairs.append((collider_a, collider_b))
+        return pairs
+
+    def rebuild_world(self, rigid_bodies: Sequence[RigidBody], touching: Iterable[Tuple[Collider, Collider]] = ()):
+        """
+        Recreate the world with the bodies of the rigid bodies given, in this order, then the other ones.
+
+        The bodies keep their state but Box2D forgets its contacts & caches, so the steps which
+        follow only depend on the state of the bodies, used to restore snapshots (see 'kge.SnapshotRecorder').
+        The colliders in 'touching' are considered touching, collision events are dispatched
+        for the pairs which begin or stop touching compared to the world replaced.
+        """
+        if self.physics_process:
+            raise NotImplementedError("The world can not be rebuilt when the physics run in a separate process")
+        if self.world is None:
+            return
+
+        old = self.world
+        if old.locked:
+            raise RuntimeError("The world can not be rebuilt while it is stepping, "
+                               "restore snapshots outside of the contact callbacks")
+
+        rigid_bodies = list(rigid_bodies)
+        given = set(rigid_bodies)
+        for body in reversed(old.bodies):
+            rb = body.userData
+            if isinstance(rb, RigidBody) and rb not in given:
+                rigid_bodies.append(rb)
+
+        before = {frozenset(pair): pair for pair in self.touching_contacts()}
+        after = {frozenset(pair): pair for pair in touching}
+
+        self.world = b2.b2World(gravity=old.gravity, doSleep=True)
+        self.world.contactListener = self.contact_listener
+        self._install_contact_filter()
+        self.world.destructionListener = self.destruction_listener
+
+        for rb in rigid_bodies:
+            if rb.body is not None:
+                self._copy_body(rb)
+
+        self.garbage_bodies.clear()
+        self._synced = set()
+
+        for key, pair in before.items():
+            if key not in after:
+                self.dispatch_contact(*pair, began=False)
+        for key, pair in after.items():
+            if key not in before:
+                self.dispatch_contact(*pair, began=True)
+        self._restored_contacts = set(after) or None
+
+    def _copy_body(self, rb: RigidBody):
+        """
+        Copy the body of a rigid body and its fixtures in the world
+        """
+        old = rb.body  # type: b2.b2Body
+        body = self.world.CreateBody(
+            b2.b2BodyDef(
+                type=old.type,
+                position=old.position,
+                angle=old.angle,
+                linearVelocity=old.linearVelocity,
+                angularVelocity=old.angularVelocity,
+                linearDamping=old.linearDamping,
+                angularDamping=old.angularDamping,
+                allowSleep=old.sleepingAllowed,
+                awake=old.awake,
+                fixedRotation=old.fixedRotation,
+                bullet=old.bullet,
+                active=old.active,
+                gravityScale=old.gravityScale,
+                userData=rb,
+            )
+        )  # type: b2.b2Body
+
+        # fixtures are listed from the last created
+        for fixture in reversed(old.fixtures):
+            copy = body.CreateFixture(b2.b2FixtureDef(
+                shape=fixture.shape,
+                density=fixture.density,
+                friction=fixture.friction,
+                restitution=fixture.restitution,
+                isSensor=fixture.sensor,
+                filter=fixture.filterData,
+                userData=fixture.userData,
+            ))
+            if isinstance(fixture.userData, Collider):
+                fixture.userData._fixture = copy
+
+        body.massData = old.massData
+        rb._body = body
+
     def on_draw_debug(self, event: events.DrawDebug, dispatch: Callable[[Event], None]):
         self.debug_drawer.StartDraw()
         if self.world is not None:
@@ -993,9 +1455,13 @@ class PhysicsManager(ComponentSystem):
         self.pause = False
 
     def on_start_scene(self, ev: events.StartScene, dispatch: Callable[[Event], None]):
-        self.world = b2.b2World(gravity=(0, -10), doSleep=True)
+        self.close_world()
+        if self.physics_process:
+            self.world = RemoteWorld(gravity=(0, -10), doSleep=True, bodies=self.physics_bodies)
+        else:
+            self.world = b2.b2World(gravity=(0, -10), doSleep=True)
         self.world.contactListener = self.contact_listener
-        self.world.contactFilter = self.contact_filter
+        self._install_contact_filter()
         self.world.destructionListener = self.destruction_listener
         # self.world.renderer = self.debug_drawer
 
@@ -1006,7 +1472,7 @@ class PhysicsManager(ComponentSystem):
 
     def on_scene_stopped(self, event: events.SceneStopped, dispatch):
         super(PhysicsManager, self).on_scene_stopped(event, dispatch)
-        self.world = None
+        self.close_world()
 
     def create_body(self, rb: RigidBody, e: BaseEntity):
         """
@@ -1043,6 +1509,8 @@ class PhysicsManager(ComponentSystem):
             body.inertia = rb.inertia
             body.angle = math.radians(rb.angle)
             rb.body = body
+            position = body.position
+            rb.mirror(position.x, position.y, body.angle)
 
             # the body has been created
             event = BodyCreated(
@@ -1084,9 +1552,17 @@ class PhysicsManager(ComponentSystem):
                 self._components.remove(c)
                 self.unregister_events(c)
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
+    def close_world(self):
+        """
+        Drop the world, stop the physics process if the world runs in one
+        """
+        if isinstance(self.world, RemoteWorld):
+            self.world.close()
         self.world = None
 
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_world()
+
     def handle_contact(self, contact: b2.b2Contact, began: bool):
         """
         Handle a contact, it will generate collisions only
@@ -1096,8 +1572,21 @@ class PhysicsManager(ComponentSystem):
         collider_a = contact.fixtureA.userData
         collider_b = contact.fixtureB.userData
 
-        rb_a = contact.fixtureA.body.userData  # type: RigidBody
-        rb_b = contact.fixtureB.body.userData  # type: RigidBody
+        if self._restored_contacts is not None and began:
+            pair = frozenset((collider_a, collider_b))
+            if pair in self._restored_contacts:
+                # the colliders were already touching in the state restored
+                self._restored_contacts.discard(pair)
+                return
+
+        self.dispatch_contact(collider_a, collider_b, began)
+
+    def dispatch_contact(self, collider_a: Collider, collider_b: Collider, began: bool):
+        """
+        Dispatch the collision events of two colliders which began or stopped touching
+        """
+        rb_a = collider_a.rb_attached if isinstance(collider_a, Collider) else None  # type: RigidBody
+        rb_b = collider_b.rb_attached if isinstance(collider_b, Collider) else None  # type: RigidBody
 
         if isinstance(rb_a, RigidBody) and isinstance(rb_b, RigidBody):
             if (collider_a.is_active and rb_a.is_active) and (rb_b.is_active and collider_b.is_active):
@@ -1263,17 +1752,64 @@ class Physics(Service):
         """
         cls._system_instance.ignore_layer_collision(layer1, layer2)
 
-    # TODO
-    # @classmethod
-    # def overlap_circle(self, center: Vector, radius: float, layer: Union[int, str, None] = None,
-    #                    type=OverlapInfo.MULTIPLE) -> OverlapInfo:
-    #     return self._system_instance.overlap_circle(center, radius, layer, type)
+    @classmethod
+    def layer_filter(cls, layer: int) -> Tuple[int, int]:
+        """
+        Get the category & mask bits of the fixtures of a layer
+        """
+        return cls._system_instance.layer_filter(layer)
+
+    @classmethod
+    def set_contact_filter(cls, should_collide: Optional[Callable[[Collider, Collider], bool]]):
+        """
+        Set a function which decides if two colliders should collide, pass None to remove it
+        """
+        cls._system_instance.set_contact_filter(should_collide)
+
+    @classmethod
+    def ray_cast_many(cls, origins: Union[Sequence[Vector], Vec2Array], directions: Union[Sequence[Vector], Vec2Array],
+                      distance: Union[float, Sequence[float]], layer: Union[int, str, None] = None,
+                      cast_sensors: bool = False) -> RayCastBatch:
+        return cls._system_instance.ray_cast_many(origins, directions, distance, layer, cast_sensors)
+
+    @classmethod
+    def overlap_circle(cls, center: Vector, radius: float, layer: Union[int, str, None] = None,
+                       type=OverlapInfo.MULTIPLE) -> OverlapInfo:
+        return cls._system_instance.overlap_circle(center, radius, layer, type)
+
+    @classmethod
+    def overlap_circles(cls, centers: Union[Sequence[Vector], Vec2Array], radii: Union[float, Sequence[float]],
+                        layer: Union[int, str, None] = None) -> List[List[Collider]]:
+        return cls._system_instance.overlap_circles(centers, radii, layer)
+
+    @classmethod
+    def query_regions(cls, centers: Union[Sequence[Vector], Vec2Array], sizes: Union[Sequence[Vector], Vec2Array],
+                      layer: Union[int, str, None] = None) -> List[List[Collider]]:
+        return cls._system_instance.query_regions(centers, sizes, layer)
 
     @classmethod
     def query_region(self, center: Vector, size: Vector, layer: Union[int, str, None] = None,
                      type=RegionInfo.MULTIPLE) -> RegionInfo:
         return self._system_instance.query_region(center, size, layer, type)
 
+    @classmethod
+    def touching_contacts(cls) -> List[Tuple[Collider, Collider]]:
+        """
+        Get the pairs of colliders which are touching
+        """
+        return cls._system_instance.touching_contacts()
+
+    @classmethod
+    def rebuild_world(cls, rigid_bodies: Sequence[RigidBody], touching: Iterable[Tuple[Collider, Collider]] = ()):
+        """
+        Recreate the world with the bodies of the rigid bodies given, used to restore snapshots
+        """
+        cls._system_instance.rebuild_world(rigid_bodies, touching)
+
+    @property
+    def physics_process(self) -> bool:
+        return self._system_instance.physics_process
+
     @property
     def world(self):
         return self._system_instance.world
@@ -0,0 +1,829 @@
+import math
+import multiprocessing
+import platform
+import struct
+import sys
+from typing import Dict, List, Optional, Set, Tuple, Iterable, Sequence
+
+if sys.platform == "win32":
+    if platform.architecture()[0] == "64bit":
+        import kge.extra.win64.Box2D as b2
+    elif platform.architecture()[0] == "32bit":
+        import kge.extra.win32.Box2D as b2
+else:
+    import kge.extra.linux64.Box2D as b2
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # python < 3.8, the physics can not run in a separate process
+    shared_memory = None
+
+# Commands sent to the physics process, all of them start with (opcode, id)
+CREATE_BODY = 1
+DESTROY_BODY = 2
+CREATE_FIXTURE = 3
+DESTROY_FIXTURE = 4
+SET_BODY = 5
+SET_BODY_VECTOR = 6
+SET_FIXTURE = 7
+SET_FILTER = 8
+APPLY = 9
+SET_GRAVITY = 10
+STEP = 11
+
+COMMANDS = {
+    # body, type, x, y, angle, flags, gravity scale
+    CREATE_BODY: struct.Struct("<BIBdddBd"),
+    DESTROY_BODY: struct.Struct("<BI"),
+    # body, fixture, shape, density, friction, restitution, sensor, category, mask, radius, vertex count
+    CREATE_FIXTURE: struct.Struct("<BIIBddd?HHdI"),
+    # body, fixture
+    DESTROY_FIXTURE: struct.Struct("<BII"),
+    # body, attribute, value
+    SET_BODY: struct.Struct("<BIBd"),
+    SET_BODY_VECTOR: struct.Struct("<BIBdd"),
+    # fixture, attribute, value
+    SET_FIXTURE: struct.Struct("<BIBd"),
+    SET_FILTER: struct.Struct("<BIHH"),
+    # body, kind, x, y, point x, point y
+    APPLY: struct.Struct("<BIBdddd"),
+    SET_GRAVITY: struct.Struct("<BIdd"),
+    # step, delta time, velocity iterations, position iterations
+    STEP: struct.Struct("<BIdBB"),
+}
+
+# Attributes of the bodies & fixtures which can be set, the index is sent
+BODY_ATTRIBUTES = ("angle", "mass", "inertia", "gravityScale", "angularVelocity", "linearDamping",
+                   "angularDamping", "active", "awake", "fixedRotation", "bullet")
+BODY_FLAGS = frozenset(("active", "awake", "fixedRotation", "bullet"))
+BODY_VECTORS = ("position", "linearVelocity")
+FIXTURE_ATTRIBUTES = ("friction", "restitution", "density")
+
+# Flags of the body definitions
+ACTIVE, ALLOW_SLEEP, AWAKE, FIXED_ROTATION, BULLET = (1 << i for i in range(5))
+
+# Forces applied to the bodies
+FORCE, LINEAR_IMPULSE, TORQUE, ANGULAR_IMPULSE = range(4)
+
+# Shapes of the fixtures
+CIRCLE, POLYGON, EDGE, LOOP = range(4)
+
+
+def shape_data(shape: b2.b2Shape) -> Tuple[int, float, List[float]]:
+    """
+    Get the kind, radius and flat vertices of a shape to send it to the physics process
+    """
+    if isinstance(shape, b2.b2CircleShape):
+        return CIRCLE, shape.radius, [shape.pos[0], shape.pos[1]]
+    elif isinstance(shape, b2.b2PolygonShape):
+        return POLYGON, 0, [c for v in shape.vertices for c in v]
+    elif isinstance(shape, b2.b2EdgeShape):
+        return EDGE, 0, [*shape.vertex1, *shape.vertex2]
+    elif isinstance(shape, b2.b2ChainShape):
+        vertices = list(shape.vertices)
+        if len(vertices) > 2 and tuple(vertices[0]) == tuple(vertices[-1]):
+            # the loop repeats its first vertex
+            vertices.pop()
+        return LOOP, 0, [c for v in vertices for c in v]
+    raise TypeError(f"Shapes of type '{type(shape).__name__}' can not be sent to the physics process")
+
+
+def make_shape(kind: int, radius: float, vertices: Sequence[float]) -> b2.b2Shape:
+    """
+    Create a shape from the data of 'shape_data'
+    """
+    points = [(vertices[i], vertices[i + 1]) for i in range(0, len(vertices), 2)]
+    if kind == CIRCLE:
+        return b2.b2CircleShape(radius=radius, pos=points[0])
+    elif kind == POLYGON:
+        return b2.b2PolygonShape(vertices=points)
+    elif kind == EDGE:
+        return b2.b2EdgeShape(vertices=points)
+    return b2.b2LoopShape(vertices=points)
+
+
+class CommandBuffer:
+    """
+    The commands of a physics step, packed in a bytearray to be sent to the physics process at once.
+        >>> commands = CommandBuffer()
+        >>> commands.set_body_vector(body_id, BODY_VECTORS.index("linearVelocity"), 0, 5)
+        >>> commands.step(1, 1 / 60, 10, 10)
+        >>> connection.send_bytes(commands.flush())
+    """
+    __slots__ = ("data",)
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def __len__(self):
+        return len(self.data)
+
+    def flush(self) -> bytes:
+        """
+        Get the commands packed and clear the buffer
+        """
+        data = bytes(self.data)
+        self.data.clear()
+        return data
+
+    def _pack(self, op: int, *values):
+        self.data += COMMANDS[op].pack(op, *values)
+
+    def create_body(self, body: int, b_type: int, x: float, y: float, angle: float, flags: int, gravity_scale: float):
+        self._pack(CREATE_BODY, body, b_type, x, y, angle, flags, gravity_scale)
+
+    def destroy_body(self, body: int):
+        self._pack(DESTROY_BODY, body)
+
+    def create_fixture(self, body: int, fixture: int, kind: int, density: float, friction: float, restitution: float,
+                       sensor: bool, category: int, mask: int, radius: float, vertices: Sequence[float]):
+        count = len(vertices) // 2
+        self._pack(CREATE_FIXTURE, body, fixture, kind, density, friction, restitution, sensor, category, mask,
+                   radius, count)
+        self.data += struct.pack(f"<{count * 2}d", *vertices)
+
+    def destroy_fixture(self, body: int, fixture: int):
+        self._pack(DESTROY_FIXTURE, body, fixture)
+
+    def set_body(self, body: int, attribute: int, value: float):
+        self._pack(SET_BODY, body, attribute, value)
+
+    def set_body_vector(self, body: int, attribute: int, x: float, y: float):
+        self._pack(SET_BODY_VECTOR, body, attribute, x, y)
+
+    def set_fixture(self, fixture: int, attribute: int, value: float):
+        self._pack(SET_FIXTURE, fixture, attribute, value)
+
+    def set_filter(self, fixture: int, category: int, mask: int):
+        self._pack(SET_FILTER, fixture, category, mask)
+
+    def apply(self, body: int, kind: int, x: float, y: float = 0, px: float = 0, py: float = 0):
+        self._pack(APPLY, body, kind, x, y, px, py)
+
+    def set_gravity(self, x: float, y: float):
+        self._pack(SET_GRAVITY, 0, x, y)
+
+    def step(self, step: int, dt: float, velocity_iterations: int, position_iterations: int):
+        self._pack(STEP, step, dt, velocity_iterations, position_iterations)
+
+
+def iter_commands(data: bytes) -> Iterable[Tuple[tuple, Optional[Tuple[float, ...]]]]:
+    """
+    Unpack the commands of a buffer, yield (values, vertices), vertices are only set for fixtures
+    """
+    offset = 0
+    end = len(data)
+    while offset < end:
+        op = data[offset]
+        layout = COMMANDS[op]
+        values = layout.unpack_from(data, offset)
+        offset += layout.size
+
+        vertices = None
+        if op == CREATE_FIXTURE:
+            count = values[-1] * 2
+            vertices = struct.unpack_from(f"<{count}d", data, offset)
+            offset += count * 8
+        yield values, vertices
+
+
+class TransformRing:
+    """
+    A ring of slots in shared memory, the physics process writes the transforms of the
+    awake bodies and the contacts of each step in the slot 'step % SLOTS'.
+
+    A slot is read by the game once the physics process sent the number of the step,
+    the game never has more than 'SLOTS - 1' steps in flight, so slots are not overwritten while read.
+    """
+    SLOTS = 4
+
+    # step, bodies, contacts
+    HEADER = struct.Struct("<III")
+    # body, x, y, angle (in radians), velocity x, velocity y, angular velocity
+    BODY = struct.Struct("<I4xdddddd")
+    # began, fixture a, fixture b
+    CONTACT = struct.Struct("<III")
+
+    def __init__(self, bodies: int, contacts: int, name: str = None):
+        if shared_memory is None:
+            raise RuntimeError("Running the physics in a separate process needs python 3.8 or newer")
+
+        self.bodies = bodies
+        self.contacts = contacts
+        self.slot_size = self.HEADER.size + bodies * self.BODY.size + contacts * self.CONTACT.size
+
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.slot_size * self.SLOTS)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def write(self, step: int, bodies: Iterable[tuple], contacts: List[Tuple[int, int, int]]) -> bytes:
+        """
+        Write the bodies and the contacts of a step
+
+        :return: the contacts which did not fit in the slot, packed
+        """
+        buffer = self.memory.buf
+        base = (step % self.SLOTS) * self.slot_size
+
+        offset = base + self.HEADER.size
+        size = self.BODY.size
+        count = 0
+        for record in bodies:
+            if count == self.bodies:
+                raise OverflowError("There are more bodies than the physics process can send")
+            self.BODY.pack_into(buffer, offset, *record)
+            offset += size
+            count += 1
+
+        offset = base + self.HEADER.size + self.bodies * size
+        written = contacts[:self.contacts]
+        for contact in written:
+            self.CONTACT.pack_into(buffer, offset, *contact)
+            offset += self.CONTACT.size
+
+        self.HEADER.pack_into(buffer, base, step, count, len(written))
+        return b"".join(self.CONTACT.pack(*contact) for contact in contacts[self.contacts:])
+
+    def read(self, step: int) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Read the bodies and the contacts of a step
+        """
+        buffer = self.memory.buf
+        base = (step % self.SLOTS) * self.slot_size
+        written, bodies, contacts = self.HEADER.unpack_from(buffer, base)
+        if written != step:
+            raise RuntimeError(f"The slot of the step {step} holds the step {written}")
+
+        start = base + self.HEADER.size
+        records = list(self.BODY.iter_unpack(bytes(buffer[start:start + bodies * self.BODY.size])))
+
+        start += self.bodies * self.BODY.size
+        events = list(self.CONTACT.iter_unpack(bytes(buffer[start:start + contacts * self.CONTACT.size])))
+        return records, events
+
+    def close(self, unlink: bool = False):
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+class ContactRecorder(b2.b2ContactListener):
+    """
+    Record the contacts of a step in the physics process as (began, fixture a, fixture b)
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.contacts = []  # type: List[Tuple[int, int, int]]
+
+    def BeginContact(self, contact):
+        self.contacts.append((1, contact.fixtureA.userData, contact.fixtureB.userData))
+
+    def EndContact(self, contact):
+        self.contacts.append((0, contact.fixtureA.userData, contact.fixtureB.userData))
+
+
+class WorldProcess:
+    """
+    The world run by the physics process, it executes the commands of the game
+    """
+    # step, number of masses
+    STEP_DONE = struct.Struct("<II")
+    # body, mass, inertia
+    MASS = struct.Struct("<I4xdd")
+
+    def __init__(self, connection, ring: TransformRing, gravity: Tuple[float, float], sleep: bool):
+        self.connection = connection
+        self.ring = ring
+        self.world = b2.b2World(gravity=gravity, doSleep=sleep)
+        self.recorder = ContactRecorder()
+        self.world.contactListener = self.recorder
+
+        self.bodies = {}  # type: Dict[int, b2.b2Body]
+        self.fixtures = {}  # type: Dict[int, b2.b2Fixture]
+        # bodies whose mass changed since the last step, sent back to the game
+        self.reshaped = set()  # type: Set[int]
+
+    def run(self):
+        while True:
+            data = self.connection.recv_bytes()
+            if not data:
+                # the game closed the world
+                break
+
+            for values, vertices in iter_commands(data):
+                self.execute(values, vertices)
+
+    def execute(self, values: tuple, vertices: Optional[Tuple[float, ...]]):
+        op, target = values[0], values[1]
+
+        if op == STEP:
+            self.step(target, *values[2:])
+        elif op == CREATE_BODY:
+            b_type, x, y, angle, flags, gravity_scale = values[2:]
+            self.bodies[target] = self.world.CreateBody(b2.b2BodyDef(
+                type=b_type,
+                position=(x, y),
+                angle=angle,
+                active=bool(flags & ACTIVE),
+                allowSleep=bool(flags & ALLOW_SLEEP),
+                awake=bool(flags & AWAKE),
+                fixedRotation=bool(flags & FIXED_ROTATION),
+                bullet=bool(flags & BULLET),
+                gravityScale=gravity_scale,
+                userData=target,
+            ))
+        elif op == DESTROY_BODY:
+            body = self.bodies.pop(target, None)
+            if body is not None:
+                for fixture in body.fixtures:
+                    self.fixtures.pop(fixture.userData, None)
+                self.world.DestroyBody(body)
+        elif op == CREATE_FIXTURE:
+            fixture, kind, density, friction, restitution, sensor, category, mask, radius, _ = values[2:]
+            body = self.bodies[target]
+            body.CreateFixture(b2.b2FixtureDef(
+                shape=make_shape(kind, radius, vertices),
+                density=density,
+                friction=friction,
+                restitution=restitution,
+                isSensor=sensor,
+                categoryBits=category,
+                maskBits=mask,
+                userData=fixture,
+            ))
+            self.fixtures[fixture] = body.fixtures[-1]
+            self.reshaped.add(target)
+        elif op == DESTROY_FIXTURE:
+            fixture = self.fixtures.pop(values[2], None)
+            if fixture is not None and target in self.bodies:
+                self.bodies[target].DestroyFixture(fixture)
+                self.reshaped.add(target)
+        elif op == SET_BODY:
+            name = BODY_ATTRIBUTES[values[2]]
+            value = bool(values[3]) if name in BODY_FLAGS else values[3]
+            setattr(self.bodies[target], name, value)
+            if name in ("mass", "inertia"):
+                self.reshaped.add(target)
+        elif op == SET_BODY_VECTOR:
+            setattr(self.bodies[target], BODY_VECTORS[values[2]], (values[3], values[4]))
+        elif op == SET_FIXTURE:
+            setattr(self.fixtures[target], FIXTURE_ATTRIBUTES[values[2]], values[3])
+        elif op == SET_FILTER:
+            self.fixtures[target].filterData = b2.b2Filter(categoryBits=values[2], maskBits=values[3], groupIndex=0)
+        elif op == APPLY:
+            kind, x, y, px, py = values[2:]
+            body = self.bodies[target]
+            if kind == FORCE:
+                body.ApplyForce((x, y), (px, py), True)
+            elif kind == LINEAR_IMPULSE:
+                body.ApplyLinearImpulse((x, y), (px, py), True)
+            elif kind == TORQUE:
+                body.ApplyTorque(x, True)
+            else:
+                body.ApplyAngularImpulse(x, True)
+        elif op == SET_GRAVITY:
+            self.world.gravity = (values[2], values[3])
+
+    def transforms(self) -> Iterable[tuple]:
+        """
+        The transforms & velocities of the awake bodies which are not static
+        """
+        for body in self.world.bodies:
+            if body.awake and body.type != b2.b2_staticBody:
+                position = body.position
+                velocity = body.linearVelocity
+                yield body.userData, position.x, position.y, body.angle, velocity.x, velocity.y, body.angularVelocity
+
+    def step(self, step: int, dt: float, velocity_iterations: int, position_iterations: int):
+        self.world.Step(dt, velocity_iterations, position_iterations)
+        self.world.ClearForces()
+
+        contacts = self.recorder.contacts
+        overflow = self.ring.write(step, self.transforms(), contacts)
+        contacts.clear()
+
+        # the masses computed from the density of the fixtures
+        masses = [(body_id, self.bodies[body_id].mass, self.bodies[body_id].inertia)
+                  for body_id in self.reshaped if body_id in self.bodies]
+        self.reshaped.clear()
+
+        self.connection.send_bytes(self.STEP_DONE.pack(step, len(masses)) +
+                                   b"".join(self.MASS.pack(*mass) for mass in masses) + overflow)
+
+
+def run_world(connection, ring_name: str, bodies: int, contacts: int, gravity: Tuple[float, float], sleep: bool):
+    """
+    The entry point of the physics process
+    """
+    ring = TransformRing(bodies, contacts, name=ring_name)
+    process = WorldProcess(connection, ring, gravity, sleep)
+    try:
+        process.run()
+    finally:
+        process.world = None
+        ring.close()
+        connection.close()
+
+
+class RemoteFixture:
+    """
+    A fixture of a body in the physics process, with the API of 'b2Fixture' used by the colliders
+    """
+
+    def __init__(self, body: "RemoteBody", fixture_id: int, defn: b2.b2FixtureDef):
+        self.id = fixture_id
+        self.body = body
+        self.shape = defn.shape
+        self.userData = defn.userData
+        self.sensor = defn.isSensor
+        self._values = {"friction": defn.friction, "restitution": defn.restitution, "density": defn.density}
+        self._filter = b2.b2Filter(categoryBits=defn.filter.categoryBits, maskBits=defn.filter.maskBits, groupIndex=0)
+
+    def _get(self, name: str):
+        return self._values[name]
+
+    def _set(self, name: str, value: float):
+        self._values[name] = value
+        self.body.world.commands.set_fixture(self.id, FIXTURE_ATTRIBUTES.index(name), value)
+
+    friction = property(lambda self: self._get("friction"), lambda self, v: self._set("friction", v))
+    restitution = property(lambda self: self._get("restitution"), lambda self, v: self._set("restitution", v))
+    density = property(lambda self: self._get("density"), lambda self, v: self._set("density", v))
+
+    @property
+    def filterData(self) -> b2.b2Filter:
+        return self._filter
+
+    @filterData.setter
+    def filterData(self, value: b2.b2Filter):
+        self._filter = value
+        self.body.world.commands.set_filter(self.id, value.categoryBits, value.maskBits)
+
+
+class RemoteBody:
+    """
+    A body in the physics process, with the API of 'b2Body' used by the rigid bodies.
+
+    Reading gives the state of the last step received, writing sends a command
+    which is applied before the next step.
+
+    The mass & the inertia computed from the density of the fixtures are known
+    once the step following the creation of the fixtures is received.
+    """
+
+    def __init__(self, world: "RemoteWorld", body_id: int, defn: b2.b2BodyDef):
+        self.id = body_id
+        self.world = world
+        self.type = defn.type
+        self.userData = defn.userData
+        self.fixtures = []  # type: List[RemoteFixture]
+
+        self._x, self._y = defn.position.x, defn.position.y
+        self._angle = defn.angle
+        self._vx, self._vy = defn.linearVelocity.x, defn.linearVelocity.y
+        self._awake = defn.awake
+        self._values = {
+            "mass": 0.0, "inertia": 0.0, "gravityScale": defn.gravityScale, "linearDamping": defn.linearDamping,
+            "angularDamping": defn.angularDamping, "active": defn.active, "fixedRotation": defn.fixedRotation,
+            "bullet": defn.bullet, "angularVelocity": defn.angularVelocity,
+        }
+
+        # the results of the steps sent before this one do not overwrite the values set by the game
+        self._pinned = 0
+        self._mass_pinned = 0
+
+    def _pin(self):
+        self._pinned = self.world.step_count + 1
+
+    def receive(self, step: int, x: float, y: float, angle: float, vx: float, vy: float, w: float):
+        """
+        Copy the transform & velocity of a step of the physics process
+        """
+        self._awake = True
+        if step >= self._pinned:
+            self._x, self._y, self._angle = x, y, angle
+            self._vx, self._vy = vx, vy
+            self._values["angularVelocity"] = w
+
+    def receive_mass(self, step: int, mass: float, inertia: float):
+        """
+        Copy the mass & the inertia computed by the physics process
+        """
+        if step >= self._mass_pinned:
+            self._values["mass"], self._values["inertia"] = mass, inertia
+
+    def _get(self, name: str):
+        return self._values[name]
+
+    def _set(self, name: str, value):
+        if name in ("mass", "inertia"):
+            self._mass_pinned = self.world.step_count + 1
+        self._values[name] = value
+        self.world.commands.set_body(self.id, BODY_ATTRIBUTES.index(name), float(value))
+
+    mass = property(lambda self: self._get("mass"), lambda self, v: self._set("mass", v))
+    inertia = property(lambda self: self._get("inertia"), lambda self, v: self._set("inertia", v))
+    gravityScale = property(lambda self: self._get("gravityScale"), lambda self, v: self._set("gravityScale", v))
+    linearDamping = property(lambda self: self._get("linearDamping"), lambda self, v: self._set("linearDamping", v))
+    angularDamping = property(lambda self: self._get("angularDamping"),
+                              lambda self, v: self._set("angularDamping", v))
+    active = property(lambda self: self._get("active"), lambda self, v: self._set("active", v))
+    fixedRotation = property(lambda self: self._get("fixedRotation"), lambda self, v: self._set("fixedRotation", v))
+    bullet = property(lambda self: self._get("bullet"), lambda self, v: self._set("bullet", v))
+
+    @property
+    def angularVelocity(self) -> float:
+        return self._values["angularVelocity"]
+
+    @angularVelocity.setter
+    def angularVelocity(self, value: float):
+        self._pin()
+        self._set("angularVelocity", value)
+
+    @property
+    def awake(self) -> bool:
+        return self._awake
+
+    @awake.setter
+    def awake(self, value: bool):
+        self._awake = value
+        self.world.commands.set_body(self.id, BODY_ATTRIBUTES.index("awake"), float(value))
+
+    @property
+    def position(self) -> b2.b2Vec2:
+        return b2.b2Vec2(self._x, self._y)
+
+    @position.setter
+    def position(self, value):
+        self._pin()
+        self._x, self._y = value[0], value[1]
+        self.world.commands.set_body_vector(self.id, BODY_VECTORS.index("position"), self._x, self._y)
+
+    @property
+    def angle(self) -> float:
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: float):
+        self._pin()
+        self._angle = value
+        self.world.commands.set_body(self.id, BODY_ATTRIBUTES.index("angle"), value)
+
+    @property
+    def linearVelocity(self) -> b2.b2Vec2:
+        return b2.b2Vec2(self._vx, self._vy)
+
+    @linearVelocity.setter
+    def linearVelocity(self, value):
+        self._pin()
+        self._vx, self._vy = value[0], value[1]
+        self.world.commands.set_body_vector(self.id, BODY_VECTORS.index("linearVelocity"), self._vx, self._vy)
+
+    @property
+    def transform(self) -> b2.b2Transform:
+        xf = b2.b2Transform()
+        xf.position = (self._x, self._y)
+        xf.angle = self._angle
+        return xf
+
+    def GetWorldVector(self, localVector) -> b2.b2Vec2:
+        c, s = math.cos(self._angle), math.sin(self._angle)
+        x, y = localVector[0], localVector[1]
+        return b2.b2Vec2(c * x - s * y, s * x + c * y)
+
+    def GetWorldPoint(self, localPoint) -> b2.b2Vec2:
+        v = self.GetWorldVector(localPoint)
+        return b2.b2Vec2(v.x + self._x, v.y + self._y)
+
+    def ApplyForce(self, force, point, wake: bool = True):
+        self.world.commands.apply(self.id, FORCE, force[0], force[1], point[0], point[1])
+
+    def ApplyLinearImpulse(self, impulse, point, wake: bool = True):
+        self.world.commands.apply(self.id, LINEAR_IMPULSE, impulse[0], impulse[1], point[0], point[1])
+
+    def ApplyTorque(self, torque: float, wake: bool = True):
+        self.world.commands.apply(self.id, TORQUE, torque)
+
+    def ApplyAngularImpulse(self, impulse: float, wake: bool = True):
+        self.world.commands.apply(self.id, ANGULAR_IMPULSE, impulse)
+
+    def CreateFixture(self, defn: b2.b2FixtureDef = None, **kwargs) -> RemoteFixture:
+        if defn is None:
+            defn = b2.b2FixtureDef(**kwargs)
+
+        fixture = RemoteFixture(self, self.world.next_id(), defn)
+        kind, radius, vertices = shape_data(defn.shape)
+        filter_data = fixture.filterData
+        self.world.commands.create_fixture(self.id, fixture.id, kind, defn.density, defn.friction, defn.restitution,
+                                           defn.isSensor, filter_data.categoryBits, filter_data.maskBits,
+                                           radius, vertices)
+
+        self.fixtures.append(fixture)
+        self.world.fixtures[fixture.id] = fixture
+        return fixture
+
+    def DestroyFixture(self, fixture: RemoteFixture):
+        self.fixtures.remove(fixture)
+        self.world.fixtures.pop(fixture.id, None)
+        self.world.commands.destroy_fixture(self.id, fixture.id)
+
+
+class RemoteContact:
+    """
+    A contact received from the physics process, with the fixtures of 'b2Contact'
+    """
+    __slots__ = ("fixtureA", "fixtureB", "enabled")
+
+    def __init__(self, fixture_a: RemoteFixture, fixture_b: RemoteFixture):
+        self.fixtureA = fixture_a
+        self.fixtureB = fixture_b
+        self.enabled = True
+
+
+class RemoteWorld:
+    """
+    A Box2D world stepped in a separate process, with the API of 'b2World' used by the physics manager.
+
+    The bodies, fixtures & forces are sent as a command buffer with each step, the transforms
+    of the awake bodies and the contacts come back through a ring in shared memory.
+    While the physics process steps, the game runs its behaviours & renders, so the game
+    sees the results of a step 'lag' steps later.
+
+    Region queries and ray casts are not available, they need the world in the game process.
+        >>> world = RemoteWorld(gravity=(0, -10), doSleep=True)
+        >>> body = world.CreateBody(b2.b2BodyDef(type=b2.b2_dynamicBody, position=(0, 5)))
+        >>> world.Step(1 / 60, 10, 10)
+        >>> world.close()
+    """
+    locked = False
+
+    def __init__(self, gravity=(0, -10), doSleep: bool = True, bodies: int = 4096, contacts: int = 1024,
+                 lag: int = 1):
+        if not 0 <= lag < TransformRing.SLOTS - 1:
+            raise ValueError(f"lag should be between 0 and {TransformRing.SLOTS - 2}")
+
+        self.lag = lag
+        self.commands = CommandBuffer()
+        self.ring = TransformRing(bodies, contacts)
+
+        self.contactListener = None  # type: Optional[b2.b2ContactListener]
+        self.contactFilter = None  # not used, the layers are filtered with the bits of the fixtures
+        self.destructionListener = None
+
+        self._bodies = {}  # type: Dict[int, RemoteBody]
+        self.fixtures = {}  # type: Dict[int, RemoteFixture]
+        self._awake = []  # type: List[RemoteBody]
+        self._gravity = b2.b2Vec2(*gravity)
+        self._next_id = 0
+
+        # steps sent & steps received
+        self.step_count = 0
+        self.received = 0
+
+        self._connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=run_world, name="kge-physics", daemon=True,
+            args=(child, self.ring.name, bodies, contacts, tuple(self._gravity), doSleep)
+        )
+        self.process.start()
+        child.close()
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    @property
+    def bodies(self) -> List[RemoteBody]:
+        return list(self._bodies.values())
+
+    @property
+    def bodyCount(self) -> int:
+        return len(self._bodies)
+
+    @property
+    def gravity(self) -> b2.b2Vec2:
+        return b2.b2Vec2(self._gravity)
+
+    @gravity.setter
+    def gravity(self, value):
+        self._gravity = b2.b2Vec2(value[0], value[1])
+        self.commands.set_gravity(value[0], value[1])
+
+    def CreateBody(self, defn: b2.b2BodyDef = None, **kwargs) -> RemoteBody:
+        if defn is None:
+            defn = b2.b2BodyDef(**kwargs)
+        if len(self._bodies) >= self.ring.bodies:
+            raise OverflowError(f"The physics process can not have more than {self.ring.bodies} bodies")
+
+        body = RemoteBody(self, self.next_id(), defn)
+        flags = (ACTIVE * defn.active | ALLOW_SLEEP * defn.allowSleep | AWAKE * defn.awake |
+                 FIXED_ROTATION * defn.fixedRotation | BULLET * defn.bullet)
+        self.commands.create_body(body.id, defn.type, defn.position.x, defn.position.y, defn.angle, flags,
+                                  defn.gravityScale)
+        if defn.linearVelocity.x or defn.linearVelocity.y:
+            body.linearVelocity = defn.linearVelocity
+        if defn.angularVelocity:
+            body.angularVelocity = defn.angularVelocity
+
+        self._bodies[body.id] = body
+        return body
+
+    def DestroyBody(self, body: RemoteBody):
+        if self._bodies.pop(body.id, None) is not None:
+            for fixture in body.fixtures:
+                self.fixtures.pop(fixture.id, None)
+            self.commands.destroy_body(body.id)
+
+    def Step(self, timeStep: float, velocityIterations: int, positionIterations: int):
+        """
+        Send the commands and the step, then receive the steps done until at most 'lag' steps are in flight
+        """
+        self.step_count += 1
+        self.commands.step(self.step_count, timeStep, velocityIterations, positionIterations)
+        try:
+            self._connection.send_bytes(self.commands.flush())
+        except (BrokenPipeError, OSError):
+            raise RuntimeError("The physics process has stopped") from None
+
+        while self.step_count - self.received > self.lag:
+            self._receive()
+
+    def ClearForces(self):
+        # the forces are cleared by the physics process after each step
+        pass
+
+    def QueryAABB(self, callback, aabb):
+        raise NotImplementedError("Region queries are not available when the physics run in a separate process")
+
+    def RayCast(self, callback, point1, point2):
+        raise NotImplementedError("Ray casts are not available when the physics run in a separate process")
+
+    def _receive(self):
+        try:
+            message = self._connection.recv_bytes()
+        except EOFError:
+            raise RuntimeError("The physics process has stopped") from None
+
+        step, masses = WorldProcess.STEP_DONE.unpack_from(message)
+        records, contacts = self.ring.read(step)
+        self.received = step
+
+        offset = WorldProcess.STEP_DONE.size
+        end = offset + masses * WorldProcess.MASS.size
+        for body_id, mass, inertia in WorldProcess.MASS.iter_unpack(message[offset:end]):
+            body = self._bodies.get(body_id)
+            if body is not None:
+                body.receive_mass(step, mass, inertia)
+
+        # the bodies which are not in the step are sleeping
+        for body in self._awake:
+            body._awake = False
+
+        awake = []
+        bodies = self._bodies
+        for body_id, *state in records:
+            body = bodies.get(body_id)
+            if body is not None:
+                body.receive(step, *state)
+                awake.append(body)
+        self._awake = awake
+
+        contacts.extend(TransformRing.CONTACT.iter_unpack(message[end:]))
+        listener = self.contactListener
+        if listener is not None:
+            fixtures = self.fixtures
+            for began, fixture_a, fixture_b in contacts:
+                fixture_a, fixture_b = fixtures.get(fixture_a), fixtures.get(fixture_b)
+                if fixture_a is None or fixture_b is None:
+                    # destroyed since the step
+                    continue
+                if began:
+                    listener.BeginContact(RemoteContact(fixture_a, fixture_b))
+                else:
+                    listener.EndContact(RemoteContact(fixture_a, fixture_b))
+
+    def close(self):
+        """
+        Stop the physics process and free the shared memory
+        """
+        if self.process is None:
+            return
+
+        try:
+            self._connection.send_bytes(b"")
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+
+        self._connection.close()
+        self.ring.close(unlink=True)
+        self.process = None
@@ -45,6 +45,7 @@ from kge.core.component import BaseComponent
 from kge.core.entity import BaseEntity
 from kge.core import events
 from kge.core.events import Event, DestroyBody, BodyCreated, CreateBody
+from kge.physics.physics_process import RemoteBody
 
 
 class RigidBodyType(Enum):
@@ -90,7 +91,7 @@ class RigidBody(BaseComponent):
                 "Body type must be one of 'RigidBodyType.STATIC', 'RigidBodyType.DYNAMIC', 'RigidBodyType.KINEMATIC' ")
 
         # private attributes
-        self._body = None  # type: Union[b2.b2Body, None]
+        self._body = None  # type: Union[b2.b2Body, RemoteBody, None]
         self._mass = 1
         self._velocity = Vector(0, 0)
         self._angular_velocity = 0
@@ -115,6 +116,13 @@ class RigidBody(BaseComponent):
         # public
         self.is_ghost = False
 
+        # position & angle (in radians) of the body before the last physics step
+        self.previous_transform = None  # type: Optional[Tuple[float, float, float]]
+
+        # position & angle (in radians) of the body copied by the physics manager after
+        # each step, while it is set '_position' & '_angle' are not read from Box2D
+        self._mirror = None  # type: Optional[Tuple[float, float, float]]
+
     @property
     def vlist(self):
         return self._tranform_vlist
@@ -314,7 +322,7 @@ class RigidBody(BaseComponent):
         """
         Get angle in degrees
         """
-        if self._body is not None and self._physics_system.world is not None:
+        if self._mirror is None and self._body is not None and self._physics_system.world is not None:
             self._angle = math.degrees(self._body.angle)
         return self._angle
 
@@ -327,6 +335,12 @@ class RigidBody(BaseComponent):
             raise TypeError("angle should be a number")
 
         self._angle = val
+        self.previous_transform = None
+        if self._mirror is not None:
+            self._mirror = self._mirror[0], self._mirror[1], math.radians(val)
+        if self.entity is not None:
+            # redraw the debug shapes
+            self.entity.debuggable = True
         if self._body is not None and self._physics_system.world is not None:
             while self._physics_system.world.locked:
                 continue
@@ -334,10 +348,31 @@ class RigidBody(BaseComponent):
 
     @property
     def position(self):
-        if self._body is not None and self._physics_system.world is not None:
-            self._position = Vector(self._body.position.x, self._body.position.y)
+        if self._mirror is None and self._body is not None and self._physics_system.world is not None:
+            position = self._body.position
+            self._position = Vector._new(position.x, position.y)
         return self._position
 
+    @property
+    def moving(self) -> bool:
+        """
+        Did the body move during the last physics step ? sleeping & static bodies never move
+        """
+        return self.previous_transform is not None and self.previous_transform != self._mirror
+
+    def mirror(self, x: float, y: float, angle: float) -> bool:
+        """
+        Copy the transform of the body (angle in radians), called by the physics manager
+        after each step, until then 'position' & 'angle' do not read Box2D again.
+
+        :return: True if the body moved since the last copy
+        """
+        previous = self._mirror
+        self._mirror = x, y, angle
+        self._position = Vector._new(x, y)
+        self._angle = math.degrees(angle)
+        return previous != self._mirror
+
     @position.setter
     def position(self, val: Union[Vector, tuple]):
         if not isinstance(val, (Vector, tuple)):
@@ -347,11 +382,30 @@ class RigidBody(BaseComponent):
         val = Vector(val)
 
         self._position = val
+        self.previous_transform = None
+        if self._mirror is not None:
+            self._mirror = val.x, val.y, self._mirror[2]
+        if self.entity is not None:
+            # redraw the debug shapes
+            self.entity.debuggable = True
         if self._body is not None and self._physics_system.world is not None:
             while self._physics_system.world.locked:
                 continue
             self._body.position = (val.x, val.y)
 
+    def interpolate(self, alpha: float) -> Tuple[Vector, float]:
+        """
+        Get the position and the angle (in degrees) of the body between
+        the previous physics step (alpha=0) and the current one (alpha=1)
+        """
+        position, angle = self.position, self.angle
+        if self.previous_transform is None:
+            return position, angle
+
+        x, y, a = self.previous_transform
+        a = math.degrees(a)
+        return Vector(x + (position.x - x) * alpha, y + (position.y - y) * alpha), a + (angle - a) * alpha
+
     @property
     def drag(self):
         """
@@ -400,6 +454,7 @@ class RigidBody(BaseComponent):
     def on_body_destroyed(self, ev, _):
         if ev.entity == self.entity:
             self._body = None
+            self._mirror = None
             manager = kge.ServiceProvider.getEntityManager()
             manager.remove_component(self.entity, kind=RigidBody)
 
@@ -505,8 +560,8 @@ class RigidBody(BaseComponent):
         self.angular_velocity = vel
 
     @body.setter
-    def body(self, value: b2.b2Body):
-        if not isinstance(value, b2.b2Body):
+    def body(self, value: Union[b2.b2Body, RemoteBody]):
+        if not isinstance(value, (b2.b2Body, RemoteBody)):
             raise TypeError("Body should be of type (Box2D.b2Body)")
         if self._body is not None:
             raise AttributeError("Can only set Body Property once")
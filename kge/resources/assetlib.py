@@ -9,13 +9,14 @@ from functools import partial
 import logging
 import threading
 import weakref
-from typing import Union
+from typing import Union, Optional
 
 import pyglet
 
 import kge
 import kge.resources.vfs as vfs
 from kge.resources import events
+from kge.resources.cache import cache
 from kge.core.system import System
 
 __all__ = 'AbstractAsset', 'Asset', 'AssetLoader',
@@ -32,6 +33,8 @@ class AbstractAsset(abc.ABC):
     This defines the common interface for virtual assets, proxy assets, and
     real/file assets.
     """
+    # the type of the asset in the cache of the decoded assets, None if it is not cached
+    cache_kind = None  # type: Optional[str]
 
     @abc.abstractmethod
     def load(self):
@@ -45,6 +48,22 @@ class AbstractAsset(abc.ABC):
         """
         return True
 
+    def retain(self):
+        """
+        Keep the decoded asset in the cache across scenes, until it is released
+        """
+        if self.cache_kind is not None:
+            if (self.cache_kind, self.name) not in cache:
+                self.load()
+            cache.retain(self.cache_kind, self.name)
+
+    def release(self):
+        """
+        Let the decoded asset be evicted from the cache once no scene uses it
+        """
+        if self.cache_kind is not None:
+            cache.release(self.cache_kind, self.name)
+
 
 _asset_cache = weakref.WeakValueDictionary()
 
@@ -0,0 +1,273 @@
+"""
+The cache of the decoded assets.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from kge.core import events
+from kge.core.events import Event
+from kge.core.service import Service
+from kge.core.system import System
+
+__all__ = 'AssetCache', 'AssetStats', 'AssetManager', 'Assets', 'cache',
+
+# 256 MiB
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class CachedAsset:
+    """
+    A decoded asset, with the scenes which use it
+    """
+    __slots__ = ("kind", "key", "value", "size", "scenes", "refs")
+
+    def __init__(self, kind: str, key: Hashable, value: Any, size: int):
+        self.kind = kind
+        self.key = key
+        self.value = value
+        self.size = size
+        # scenes in which the asset has been used
+        self.scenes = set()  # type: Set[Any]
+        # references held with 'retain', kept across scenes
+        self.refs = 0
+
+    @property
+    def evictable(self) -> bool:
+        return not self.scenes and self.refs == 0
+
+
+class AssetStats:
+    """
+    Memory stats of a type of asset
+    """
+    __slots__ = ("count", "bytes", "evictable", "hits", "misses", "evictions")
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.evictable = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"AssetStats(count={self.count}, bytes={self.bytes}, evictable={self.evictable}, " \
+               f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+
+class AssetCache:
+    """
+    Decoded assets (images, sounds...) by type and by key, least recently used first.
+
+    The assets are referenced by the scene in which they are used, when a scene stops
+    its assets become evictable, unless another scene uses them or they are retained.
+    Evictable assets are dropped, least recently used first, once the size of the cache
+    goes over the budget.
+        >>> cache = AssetCache(budget=64 * 1024 * 1024)
+        >>> cache.scope = scene
+        >>> cache.put("image", "player.png", img, img.width * img.height * 4)
+        >>> cache.get("image", "player.png")
+        >>> cache.release_scene(scene)
+    """
+
+    def __init__(self, budget: Optional[int] = DEFAULT_BUDGET):
+        """
+        :param budget: the maximum size of the cache in bytes, None for no limit
+        """
+        self.budget = budget
+        self.size = 0
+
+        # the scene in which the assets are used
+        self.scope = None  # type: Any
+
+        self._entries = OrderedDict()  # type: OrderedDict[Tuple[str, Hashable], CachedAsset]
+        self._stats = {}  # type: Dict[str, AssetStats]
+
+    def __contains__(self, item: Tuple[str, Hashable]):
+        return item in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        budget = "no budget" if self.budget is None else f"budget={self.budget}"
+        return f"AssetCache({len(self)} assets, {self.size} bytes, {budget})"
+
+    def _stat(self, kind: str) -> AssetStats:
+        try:
+            return self._stats[kind]
+        except KeyError:
+            stat = self._stats[kind] = AssetStats()
+            return stat
+
+    def _use(self, entry: CachedAsset):
+        if self.scope is not None:
+            entry.scenes.add(self.scope)
+        self._entries.move_to_end((entry.kind, entry.key))
+
+    def get(self, kind: str, key: Hashable) -> Any:
+        """
+        Get a decoded asset and mark it as used by the current scene, None if it is not in the cache
+        """
+        entry = self._entries.get((kind, key))
+        if entry is None:
+            self._stat(kind).misses += 1
+            return None
+
+        self._stat(kind).hits += 1
+        self._use(entry)
+        return entry.value
+
+    def put(self, kind: str, key: Hashable, value: Any, size: int) -> Any:
+        """
+        Add a decoded asset of 'size' bytes, used by the current scene
+        """
+        old = self._entries.pop((kind, key), None)
+        entry = CachedAsset(kind, key, value, size)
+        if old is not None:
+            self.size -= old.size
+            entry.scenes, entry.refs = old.scenes, old.refs
+
+        self._entries[(kind, key)] = entry
+        self.size += size
+        self._use(entry)
+        self.evict()
+        return value
+
+    def retain(self, kind: str, key: Hashable):
+        """
+        Keep an asset across scenes, until it is released
+        """
+        entry = self._entries.get((kind, key))
+        if entry is not None:
+            entry.refs += 1
+
+    def release(self, kind: str, key: Hashable):
+        """
+        Release an asset retained
+        """
+        entry = self._entries.get((kind, key))
+        if entry is not None and entry.refs > 0:
+            entry.refs -= 1
+            if entry.evictable:
+                self.evict()
+
+    def release_scene(self, scene: Any):
+        """
+        Remove the references of a scene, the assets it used become evictable
+        if no other scene uses them
+        """
+        for entry in self._entries.values():
+            entry.scenes.discard(scene)
+        self.evict()
+
+    def evict(self, budget: Optional[int] = None) -> int:
+        """
+        Drop the least recently used evictable assets until the cache fits in the budget
+
+        :param budget: the size to fit in, the budget of the cache by default
+        :return: the number of bytes freed
+        """
+        budget = self.budget if budget is None else budget
+        if budget is None or self.size <= budget:
+            return 0
+
+        freed = 0
+        for item, entry in list(self._entries.items()):
+            if self.size <= budget:
+                break
+            if entry.evictable:
+                del self._entries[item]
+                self.size -= entry.size
+                freed += entry.size
+                self._stat(entry.kind).evictions += 1
+        return freed
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, AssetStats]:
+        """
+        Get the memory stats by type of asset
+        """
+        stats = {}  # type: Dict[str, AssetStats]
+        for kind, stat in self._stats.items():
+            stats[kind] = copy = AssetStats()
+            copy.hits, copy.misses, copy.evictions = stat.hits, stat.misses, stat.evictions
+
+        for entry in self._entries.values():
+            try:
+                stat = stats[entry.kind]
+            except KeyError:
+                stat = stats[entry.kind] = AssetStats()
+            stat.count += 1
+            stat.bytes += entry.size
+            stat.evictable += entry.evictable
+        return stats
+
+
+# the cache of the decoded images & sounds
+cache = AssetCache()
+
+
+class AssetManager(System):
+    """
+    Scope the asset cache to the current scene, and release the assets of each
+    scene when it stops
+    """
+
+    def __init__(self, engine=None, asset_budget: Optional[int] = DEFAULT_BUDGET, **_):
+        super().__init__(engine, **_)
+        cache.budget = asset_budget
+
+    def on_scene_started(self, ev: events.SceneStarted, dispatch: Callable[[Event], None]):
+        cache.scope = self.engine.current_scene
+
+    def on_scene_continued(self, ev: events.SceneContinued, dispatch: Callable[[Event], None]):
+        cache.scope = self.engine.current_scene
+
+    def on_scene_stopped(self, ev: events.SceneStopped, dispatch: Callable[[Event], None]):
+        cache.release_scene(self.engine.current_scene)
+        cache.scope = None
+        self.logger.debug(f"Assets after the scene stopped : {cache!r}")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        cache.clear()
+
+
+class Assets(Service):
+    """
+    The cache of the decoded images & sounds
+    """
+    system_class = AssetManager
+    _system_instance: AssetManager
+
+    @property
+    def budget(self) -> Optional[int]:
+        return cache.budget
+
+    @budget.setter
+    def budget(self, val: Optional[int]):
+        if val is not None and (not isinstance(val, int) or val < 0):
+            raise ValueError("The budget should be a positive number of bytes or None")
+        cache.budget = val
+        cache.evict()
+
+    @property
+    def size(self) -> int:
+        return cache.size
+
+    @classmethod
+    def stats(cls) -> Dict[str, AssetStats]:
+        """
+        Get the memory stats by type of asset ('image', 'sound')
+        """
+        return cache.stats()
+
+    @classmethod
+    def evict(cls, budget: int = None) -> int:
+        """
+        Drop evictable assets until the cache fits in 'budget' bytes (its budget by default)
+        """
+        return cache.evict(budget)
@@ -0,0 +1,267 @@
+"""
+PACK FILES FOR ASSETS.
+
+A pack holds many files in one, so that they are opened at once and read
+through 'mmap' without copying them :
+
+    +--------+-------+-------+-----+-------+
+    | header | blob  | blob  | ... | index |
+    +--------+-------+-------+-----+-------+
+
+- header : magic, version, number of files, offset of the index
+- blobs : the content of the files, each one aligned on 'alignment' bytes
+- index : for each file, its offset, its size and its name (utf-8)
+
+Build a pack from a folder with :
+    python -m kge.resources.pack build assets -o assets.kpack
+"""
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+__all__ = 'Pack', 'PackedFile', 'write_pack', 'pack_folder',
+
+MAGIC = b"KGEPACK\0"
+VERSION = 1
+DEFAULT_ALIGNMENT = 16
+
+# magic, version, number of files, offset of the index
+HEADER = struct.Struct("<8sIIQ")
+# offset, size, length of the name
+ENTRY = struct.Struct("<QQH")
+
+
+def normalize(name: str) -> str:
+    """
+    Get the name of a file in a pack, with '/' as separator and without leading '/'
+    """
+    return name.replace("\\", "/").lstrip("/")
+
+
+class PackedFile(io.RawIOBase):
+    """
+    A read only file over a slice of a pack, reads copy only the bytes asked
+    """
+
+    def __init__(self, view: memoryview, name: str):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def getbuffer(self) -> memoryview:
+        """
+        Get the content of the file without copying it
+        """
+        return self._view
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class Pack:
+    """
+    A pack file mapped in memory.
+
+    Usage :
+        >>> pack = Pack("assets.kpack")
+        >>> "sprites/player.png" in pack
+        True
+        >>> data = pack.get("sprites/player.png")  # memoryview, no copy
+        >>> with pack.open("sprites/player.png") as file:
+        >>>     img = pyglet.image.load("player.png", file=file)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{self.path}' is not a kge pack")
+
+        self._index = {}  # type: Dict[str, Tuple[int, int]]
+        try:
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self):
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"'{self.path}' is not a kge pack")
+
+        magic, version, count, offset = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"'{self.path}' is not a kge pack")
+        if version != VERSION:
+            raise ValueError(f"The pack '{self.path}' has the version {version}, only the version {VERSION} is supported")
+
+        for _ in range(count):
+            start, size, length = ENTRY.unpack_from(self._map, offset)
+            offset += ENTRY.size
+            name = bytes(self._map[offset:offset + length]).decode("utf-8")
+            offset += length
+            self._index[name] = (start, size)
+
+    def __contains__(self, name: str):
+        return normalize(name) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"Pack('{self.path}', {len(self)} files)"
+
+    def size(self, name: str) -> int:
+        return self._index[normalize(name)][1]
+
+    def get(self, name: str) -> memoryview:
+        """
+        Get the content of a file without copying it, raise FileNotFoundError if the file is not in the pack
+        """
+        try:
+            start, size = self._index[normalize(name)]
+        except KeyError:
+            raise FileNotFoundError(f"'{name}' is not in the pack '{self.path}'")
+        return memoryview(self._map)[start:start + size]
+
+    def open(self, name: str) -> PackedFile:
+        """
+        Open a file of the pack for reading (binary)
+        """
+        return PackedFile(self.get(name), normalize(name))
+
+    def close(self):
+        """
+        Close the pack, the views and the files opened should have been released before :
+        raise BufferError if one is still alive, the pack is left open
+        """
+        self._map.close()
+        self._index.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def write_pack(path: Union[str, Path], files: Iterable[Tuple[str, Union[bytes, str, Path]]],
+               alignment: int = DEFAULT_ALIGNMENT) -> int:
+    """
+    Write a pack from files given as (name in the pack, content or path of the file)
+
+    :return: the number of files packed
+    """
+    if alignment < 1:
+        raise ValueError("The alignment should be at least 1")
+
+    index = []
+    with open(path, "wb") as out:
+        out.write(bytes(HEADER.size))
+
+        for name, source in files:
+            data = source if isinstance(source, (bytes, bytearray, memoryview)) else Path(source).read_bytes()
+
+            # align the blob
+            offset = out.tell()
+            padding = -offset % alignment
+            out.write(bytes(padding))
+            offset += padding
+
+            out.write(data)
+            index.append((normalize(name), offset, len(data)))
+
+        index_offset = out.tell()
+        for name, offset, size in index:
+            encoded = name.encode("utf-8")
+            out.write(ENTRY.pack(offset, size, len(encoded)))
+            out.write(encoded)
+
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, len(index), index_offset))
+    return len(index)
+
+
+def pack_folder(folder: Union[str, Path], path: Union[str, Path], prefix: str = "",
+                alignment: int = DEFAULT_ALIGNMENT) -> int:
+    """
+    Pack all the files of a folder, named by their path relative to the folder
+    (prefixed with 'prefix')
+
+    :return: the number of files packed
+    """
+    folder = Path(folder)
+    target = Path(path).resolve()
+    files = sorted(p for p in folder.rglob("*") if p.is_file() and p.resolve() != target)
+    return write_pack(path, ((f"{prefix}{p.relative_to(folder).as_posix()}", p) for p in files), alignment)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m kge.resources.pack", description="Build and list kge packs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="pack all the files of a folder")
+    build.add_argument("folder")
+    build.add_argument("-o", "--output", required=True, help="the pack file to write")
+    build.add_argument("--prefix", default="", help="prefix of the names of the files in the pack")
+    build.add_argument("--alignment", type=int, default=DEFAULT_ALIGNMENT, help="alignment of the files in bytes")
+
+    ls = commands.add_parser("list", help="list the files of a pack")
+    ls.add_argument("pack")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = pack_folder(args.folder, args.output, args.prefix, args.alignment)
+        print(f"Packed {count} files in '{args.output}' ({os.path.getsize(args.output)} bytes)")
+    else:
+        with Pack(args.pack) as pack:
+            for name in pack:
+                print(f"{pack.size(name):>12}  {name}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
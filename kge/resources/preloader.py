@@ -0,0 +1,140 @@
+"""
+Decode the assets of the scenes in background workers.
+"""
+import json
+import logging
+from concurrent import futures
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple, Union
+
+import kge.resources.vfs as vfs
+from kge.audio.sound import Sound
+from kge.graphics.image import Image
+from kge.resources.assetlib import AbstractAsset
+from kge.resources.cache import cache
+
+__all__ = 'AssetManifest', 'Preloader',
+
+logger = logging.getLogger(__name__)
+
+
+class AssetManifest:
+    """
+    The images & sounds of a scene, decoded in the background before the scene starts.
+
+    Usage :
+        >>> manifest = AssetManifest(images=["player.png", "tiles.png"], sounds=["jump.wav"])
+        >>> kge.run(setup, manifest=manifest)
+
+    Or in a scene class :
+        >>> class Level(Scene):
+        >>>     manifest = AssetManifest.from_file("level.json")
+    """
+
+    def __init__(self,
+                 images: Iterable[Union[str, Image]] = (),
+                 sounds: Iterable[Union[str, Sound]] = ()):
+        self.assets = []  # type: List[AbstractAsset]
+        self.assets.extend(i if isinstance(i, Image) else Image(i) for i in images)
+        self.assets.extend(s if isinstance(s, Sound) else Sound(s) for s in sounds)
+
+    @classmethod
+    def from_file(cls, path: str) -> "AssetManifest":
+        """
+        Read a manifest from a json file (resolved with 'kge.resources.vfs') like :
+            {"images": ["player.png", "tiles.png"], "sounds": ["jump.wav"]}
+        """
+        with vfs.open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(images=data.get("images", ()), sounds=data.get("sounds", ()))
+
+    def __iter__(self) -> Iterator[AbstractAsset]:
+        return iter(self.assets)
+
+    def __len__(self):
+        return len(self.assets)
+
+    def __repr__(self):
+        return f"AssetManifest({len(self)} assets)"
+
+
+class Preloader:
+    """
+    Decode assets in background workers.
+
+    Workers only decode the files ('read'), the decoded assets are added to the cache
+    ('store') on the main thread when the preloader is polled.
+        >>> preloader = Preloader(executor)
+        >>> preloader.request(Image("player.png"))
+        >>> ...
+        >>> for asset in preloader.poll():
+        >>>     print(f"{asset} loaded")
+    """
+
+    def __init__(self, executor: futures.Executor):
+        self._executor = executor
+        self._pending = {}  # type: Dict[Tuple[str, Hashable], Tuple[AbstractAsset, futures.Future]]
+        # assets decoded since there was nothing pending
+        self.loaded = 0
+
+    def __contains__(self, asset: AbstractAsset):
+        return (asset.cache_kind, asset.name) in self._pending
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def progress(self) -> float:
+        """
+        The ratio of the requested assets which have been decoded, 1 if there is nothing to decode
+        """
+        total = self.loaded + len(self._pending)
+        return 1. if total == 0 else self.loaded / total
+
+    @staticmethod
+    def preloadable(asset: AbstractAsset) -> bool:
+        """
+        Check if an asset can be decoded in the background
+        """
+        return asset.cache_kind is not None and hasattr(asset, "read") and hasattr(asset, "store")
+
+    def request(self, asset: AbstractAsset) -> bool:
+        """
+        Decode an asset in the background, if it is not decoded nor being decoded
+
+        :return: True while the asset is being decoded in the background,
+            False if it is ready or can't be preloaded, and should be loaded directly
+        """
+        if not self.preloadable(asset):
+            return False
+
+        key = (asset.cache_kind, asset.name)
+        if key in self._pending:
+            return True
+        if key in cache or asset.is_loaded():
+            return False
+
+        if not self._pending:
+            self.loaded = 0
+        self._pending[key] = asset, self._executor.submit(asset.read)
+        return True
+
+    def poll(self) -> List[AbstractAsset]:
+        """
+        Store the assets decoded since the last poll in the cache
+
+        :return: the assets stored
+        """
+        stored = []
+        for key, (asset, future) in list(self._pending.items()):
+            if not future.done():
+                continue
+
+            del self._pending[key]
+            try:
+                asset.store(future.result())
+            except Exception as e:
+                logger.error(f"There was an error when preloading {asset!r} : {e}")
+                continue
+            self.loaded += 1
+            stored.append(asset)
+        return stored
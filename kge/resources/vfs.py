@@ -6,10 +6,18 @@ Handles opening files from the Python "VFS".
 The VFS is the same file space that Python modules are imported from, so the
 module spam.eggs comes from spam/eggs.py, and you can load spam/foo.png that
 lives next to it.
+
+Files in mounted packs (see 'kge.resources.pack') are served first, the last
+pack mounted first :
+    >>> vfs.mount("assets.kpack")
+    >>> vfs.open("sprites/player.png")
 """
+import io
 import logging
 from pathlib import Path
 import sys
+from typing import List, Optional, Union
+
 try:
     import importlib.resources as impres
 except ImportError:
@@ -18,6 +26,49 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# mounted packs, the last mounted first
+_packs = []  # type: List["Pack"]
+
+
+def mount(pack: Union[str, Path, "Pack"]) -> "Pack":
+    """
+    Mount a pack, its files are served before the ones of the packs mounted before
+    and before the filesystem.
+    """
+    # imported here, so that 'python -m kge.resources.pack' does not find it already imported
+    from kge.resources.pack import Pack
+
+    if not isinstance(pack, Pack):
+        pack = Pack(pack)
+    _packs.insert(0, pack)
+    logger.debug("Mounted %r", pack)
+    return pack
+
+
+def unmount(pack: Union[str, Path, "Pack"]):
+    """
+    Unmount a pack (or the packs mounted from a path) and close it.
+
+    The files opened from the pack and the views got from it should be released before :
+    BufferError is raised if one is still alive, and the pack stays mounted.
+    """
+    from kge.resources.pack import Pack
+
+    for mounted in list(_packs):
+        if mounted is pack or (not isinstance(pack, Pack) and mounted.path == Path(pack)):
+            mounted.close()
+            _packs.remove(mounted)
+
+
+def find(filepath) -> Optional["Pack"]:
+    """
+    Get the mounted pack which serves a file, None if it is not in a pack
+    """
+    for pack in _packs:
+        if filepath in pack:
+            return pack
+    return None
+
 
 def _main_path():
     main = sys.modules['__main__']
@@ -52,6 +103,14 @@ def open(filepath, *, encoding=None, errors='strict'):
 
     Returns the open file and the base filename (suitable for filename-based type hinting).
     """
+    pack = find(filepath)
+    if pack is not None:
+        logger.debug("Opening %s from %r", filepath, pack)
+        file = pack.open(filepath)
+        if encoding is None:
+            return file
+        return io.TextIOWrapper(io.BufferedReader(file), encoding=encoding, errors=errors)
+
     modulename, filename = _splitpath(filepath)
 
     logger.debug("Opening %s (%s, %s)", filepath, modulename, filename)
@@ -87,6 +146,9 @@ def exists(filepath):
     """
     Checks if the given resource exists and is a resources.
     """
+    if find(filepath) is not None:
+        return True
+
     modulename, filename = _splitpath(filepath)
     if modulename == '__main__':
         # __main__ never has __spec__, so it can't resolve
@@ -1,11 +1,17 @@
 import logging
 from collections import defaultdict
-from typing import Any, Type, Dict, Set
+from typing import Any, Type, Dict, List, Set, Tuple
 
-from math import floor
+from math import floor, ceil
 
 from kge.utils.vector import Vector
 
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, it is only needed by 'ArraySpatialHash'
+    np = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,37 +61,79 @@ class SpatialHash(object):
         # types
         self._kinds = defaultdict(set)
 
+        # the cells each object is in, in order to move objects
+        self._cells = {}  # type: Dict[Any, Set[Tuple[int, int]]]
+
+    def __contains__(self, obj: Any):
+        return obj in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
     def _add(self, cell_coord, o):
         """Add the object o to the cell at cell_coord."""
         try:
-            self.table.setdefault(cell_coord, set()).add(o)
+            self.table[cell_coord].add(o)
         except KeyError:
             self.table[cell_coord] = {o}
 
-        for kind in type(o).mro():
-            self._kinds[kind].add(o)
-
     def _cells_for_rect(self, r: Box):
         """Return a set of the cells into which r extends."""
-        cells = set()
-        cy = floor(r.y1 / self.cell_size)
-        while (cy * self.cell_size) < r.y2:
-            cx = floor(r.x1 / self.cell_size)
-            while (cx * self.cell_size) < r.x2:
-                cells.add((int(cx), int(cy)))
-                cx += 1.0
-            cy += 1.0
-        return cells
+        return self._cells_for(r.center, r.size)
+
+    def _cells_for(self, position: Vector, size: Vector) -> Set[Tuple[int, int]]:
+        """Return a set of the cells covered by a box, a box always covers at least one cell."""
+        cs = self.cell_size
+        half_w, half_h = abs(size.x) / 2, abs(size.y) / 2
+
+        x1 = floor((position.x - half_w) / cs)
+        x2 = max(ceil((position.x + half_w) / cs), x1 + 1)
+        y1 = floor((position.y - half_h) / cs)
+        y2 = max(ceil((position.y + half_h) / cs), y1 + 1)
+
+        return {(cx, cy) for cy in range(y1, y2) for cx in range(x1, x2)}
 
     def add(self, position: Vector, size: Vector, obj: Any):
-        """Add an object obj with bounds r."""
+        """Add an object obj with bounds r, if it is already in, it is moved."""
+        self.update(position, size, obj)
+
+    def update(self, position: Vector, size: Vector, obj: Any):
+        """
+        Insert or move an object, only the cells it enters and leaves are modified
+        """
         if not isinstance(position, Vector) or not isinstance(size, Vector):
             raise TypeError("Position & Size should be vectors")
 
-        box = Box(position, size)
-        cells = self._cells_for_rect(box)
+        cells = self._cells_for(position, size)
+        old = self._cells.get(obj)
+
+        if old is None:
+            for kind in type(obj).mro():
+                self._kinds[kind].add(obj)
+
+            for c in cells:
+                self._add(c, obj)
+        elif old != cells:
+            for c in old - cells:
+                self._remove(c, obj)
+            for c in cells - old:
+                self._add(c, obj)
+
+        self._cells[obj] = cells
+
+    def discard(self, obj: Any):
+        """Remove an object from the hash if it is in"""
+        cells = self._cells.pop(obj, None)
+        if cells is None:
+            return
+
         for c in cells:
-            self._add(c, obj)
+            self._remove(c, obj)
+
+        for kind in type(obj).mro():
+            kinds = self._kinds.get(kind)
+            if kinds is not None:
+                kinds.discard(obj)
 
     def _remove(self, cell_coord, o):
         """Remove the object o from the cell at cell_coord."""
@@ -96,7 +144,7 @@ class SpatialHash(object):
         except KeyError as e:
             logger.error(f"KeyError {e}: {cell, type(cell), cell_coord}")
         else:
-            logger.debug(f"'{o}' removed from Spatial Hash")
+            logger.debug("'%s' removed from Spatial Hash", o)
 
         # Delete the cell from the hash if it is empty.
         if cell is not None:
@@ -107,27 +155,24 @@ class SpatialHash(object):
                     logger.error(f"KeyError {e}: {cell, type(cell), cell_coord}")
 
     def remove(self, position: Vector, size: Vector, obj: Any):
-        """Remove an object obj which had bounds r."""
+        """Remove an object obj which had bounds r, the bounds are kept for compatibility."""
         if not isinstance(position, Vector) or not isinstance(size, Vector):
             raise TypeError("Position & Size should be vectors")
 
-        box = Box(position, size)
-        cells = self._cells_for_rect(box)
-
-        for c in cells:
-            self._remove(c, obj)
+        self.discard(obj)
 
     def search(self, position: Vector, size: Vector, *type_: Type):
         """Get a set of all objects in a certain area"""
         if not isinstance(position, Vector) or not isinstance(size, Vector):
             raise TypeError("Position & Size should be vectors")
 
-        box = Box(position, size)
-        cells = self._cells_for_rect(box)
+        cells = self._cells_for(position, size)
 
         found = set()
+        table = self.table
         for c in cells:
-            found.update(self.table.get(c, set()))
+            if c in table:
+                found.update(table[c])
 
         # if type is given then intersect with the registered ones
         f = set()
@@ -141,6 +186,265 @@ class SpatialHash(object):
         return found
 
 
+# Cell coordinates are shifted to be positive before being packed in int64 keys,
+# coordinates should stay in ]-2^30, 2^30[
+_CELL_OFFSET = 1 << 30
+
+
+def _pack_cells(cx: "np.ndarray", cy: "np.ndarray") -> "np.ndarray":
+    """Pack arrays of cell coordinates into int64 keys"""
+    return ((cx + _CELL_OFFSET) << 32) | (cy + _CELL_OFFSET)
+
+
+def _expand_ranges(counts: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Get for each range of 'counts' its index repeated and the offsets in the range
+        >>> _expand_ranges(np.array([2, 0, 3]))
+        (array([0, 0, 2, 2, 2]), array([0, 1, 0, 1, 2]))
+    """
+    owners = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    offsets = np.arange(owners.size) - starts[owners]
+    return owners, offsets
+
+
+class ArraySpatialHash(object):
+    """
+    A spatial hash storing its boxes in NumPy arrays, made to answer many queries at once.
+
+    It has the same API as 'SpatialHash' for single objects, but 'search' returns only
+    the objects whose boxes overlap the searched area (not all the objects of the cells),
+    and 'search_many' answers a batch of queries with vectorized overlap tests.
+
+    Requires numpy (pip install numpy).
+    Example :
+        >>> hash = ArraySpatialHash(2)
+        >>> hash.add(Vector(0, 0), Vector(1, 1), player)
+        >>> hash.search_many([(0, 0), (5, 5)], [(1, 1), (2, 2)])
+        [{player}, set()]
+    """
+
+    def __init__(self, cell_size=10.0, capacity: int = 1024):
+        if np is None:
+            raise ImportError("ArraySpatialHash requires numpy, install it with 'pip install numpy'")
+
+        self.cell_size = float(cell_size)
+
+        # boxes as (x1, y1, x2, y2), indexed by slot
+        capacity = max(int(capacity), 1)
+        self._boxes = np.zeros((capacity, 4), dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._objects = [None] * capacity  # type: List[Any]
+        self._slots = {}  # type: Dict[Any, int]
+        self._free = list(range(capacity - 1, -1, -1))
+
+        # types
+        self._kinds = defaultdict(set)
+
+        # (cell key, slot) pairs sorted by key, rebuilt on the first query after a change
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._key_slots = np.zeros(0, dtype=np.int64)
+        self._dirty = False
+
+    def __contains__(self, obj: Any):
+        return obj in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _grow(self):
+        """Double the capacity of the arrays"""
+        capacity = len(self._objects)
+        self._boxes = np.concatenate([self._boxes, np.zeros((capacity, 4), dtype=np.float64)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity, dtype=bool)])
+        self._objects.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _cell_keys(self, boxes: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Get the cells covered by each box, as (index of the box, cell key) pairs,
+        a box always covers at least one cell.
+        """
+        cs = self.cell_size
+        x1 = np.floor(boxes[:, 0] / cs).astype(np.int64)
+        y1 = np.floor(boxes[:, 1] / cs).astype(np.int64)
+        x2 = np.maximum(np.ceil(boxes[:, 2] / cs).astype(np.int64), x1 + 1)
+        y2 = np.maximum(np.ceil(boxes[:, 3] / cs).astype(np.int64), y1 + 1)
+
+        width = x2 - x1
+        owners, offsets = _expand_ranges(width * (y2 - y1))
+        width = width[owners]
+        cx = x1[owners] + offsets % width
+        cy = y1[owners] + offsets // width
+        return owners, _pack_cells(cx, cy)
+
+    def _rebuild(self):
+        """Rebuild the sorted cell index from the alive boxes"""
+        slots = np.flatnonzero(self._alive)
+        owners, keys = self._cell_keys(self._boxes[slots])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._key_slots = slots[owners][order]
+        self._dirty = False
+
+    def add(self, position: Vector, size: Vector, obj: Any):
+        """Add an object obj with bounds r, if it is already in, it is moved."""
+        self.update(position, size, obj)
+
+    def update(self, position: Vector, size: Vector, obj: Any):
+        """
+        Insert or move an object, the cell index is rebuilt lazily on the next query
+        """
+        if not isinstance(position, Vector) or not isinstance(size, Vector):
+            raise TypeError("Position & Size should be vectors")
+
+        slot = self._slots.get(obj)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[obj] = slot
+            self._objects[slot] = obj
+            self._alive[slot] = True
+
+            for kind in type(obj).mro():
+                self._kinds[kind].add(obj)
+
+        half_w, half_h = abs(size.x) / 2, abs(size.y) / 2
+        self._boxes[slot] = (position.x - half_w, position.y - half_h, position.x + half_w, position.y + half_h)
+        self._dirty = True
+
+    def discard(self, obj: Any):
+        """Remove an object from the hash if it is in"""
+        slot = self._slots.pop(obj, None)
+        if slot is None:
+            return
+
+        self._alive[slot] = False
+        self._objects[slot] = None
+        self._free.append(slot)
+        self._dirty = True
+
+        for kind in type(obj).mro():
+            kinds = self._kinds.get(kind)
+            if kinds is not None:
+                kinds.discard(obj)
+
+    def remove(self, position: Vector, size: Vector, obj: Any):
+        """Remove an object obj which had bounds r, the bounds are kept for compatibility."""
+        if not isinstance(position, Vector) or not isinstance(size, Vector):
+            raise TypeError("Position & Size should be vectors")
+
+        self.discard(obj)
+
+    def search(self, position: Vector, size: Vector, *type_: Type):
+        """Get a set of all objects overlapping a certain area"""
+        if not isinstance(position, Vector) or not isinstance(size, Vector):
+            raise TypeError("Position & Size should be vectors")
+
+        return self.search_many([(position.x, position.y)], [(size.x, size.y)], *type_)[0]
+
+    def search_many(self, centers, sizes, *type_: Type) -> List[Set[Any]]:
+        """
+        Get the objects overlapping each area, 'centers' and 'sizes' are sequences (or arrays)
+        of (x, y) pairs, one set is returned per area.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        half = np.abs(np.asarray(sizes, dtype=np.float64).reshape(-1, 2)) / 2
+        if len(centers) != len(half):
+            raise ValueError("There should be as many sizes as centers")
+
+        found = [set() for _ in range(len(centers))]  # type: List[Set[Any]]
+
+        if self._dirty:
+            self._rebuild()
+        if not self._keys.size or not found:
+            return found
+
+        queries = np.hstack([centers - half, centers + half])
+
+        # Candidates : the boxes in the cells covered by each query
+        q_owners, q_keys = self._cell_keys(queries)
+        lo = np.searchsorted(self._keys, q_keys, side="left")
+        hi = np.searchsorted(self._keys, q_keys, side="right")
+        counts = hi - lo
+        owners, offsets = _expand_ranges(counts)
+        cand_q = q_owners[owners]
+        cand_slots = self._key_slots[lo[owners] + offsets]
+
+        # a box spanning several cells is a candidate once per cell
+        pairs = np.unique(cand_q * len(self._objects) + cand_slots)
+        cand_q, cand_slots = np.divmod(pairs, len(self._objects))
+
+        # Vectorized overlap test
+        q, b = queries[cand_q], self._boxes[cand_slots]
+        hits = (b[:, 0] < q[:, 2]) & (b[:, 2] > q[:, 0]) & (b[:, 1] < q[:, 3]) & (b[:, 3] > q[:, 1])
+
+        objects = self._objects
+        for i, slot in zip(cand_q[hits].tolist(), cand_slots[hits].tolist()):
+            found[i].add(objects[slot])
+
+        # if type is given then intersect with the registered ones
+        if type_:
+            kinds = set()
+            for t in type_:
+                if t in self._kinds:
+                    kinds.update(self._kinds[t])
+            found = [f & kinds for f in found]
+
+        return found
+
+
+def benchmark(n: int = 10_000, queries: int = 1_000, cell_size: float = 4.0):
+    """
+    Compare the search of 'SpatialHash' against the batched search of 'ArraySpatialHash'
+    """
+    import random
+    import time
+
+    rand = random.Random(0)
+    boxes = [(Vector(rand.uniform(-500, 500), rand.uniform(-500, 500)),
+              Vector(rand.uniform(.5, 3), rand.uniform(.5, 3))) for _ in range(n)]
+    areas = [(Vector(rand.uniform(-500, 500), rand.uniform(-500, 500)),
+              Vector(rand.uniform(5, 20), rand.uniform(5, 20))) for _ in range(queries)]
+
+    scalar = SpatialHash(cell_size)
+    start = time.perf_counter()
+    for i, (position, size) in enumerate(boxes):
+        scalar.add(position, size, i)
+    inserted = time.perf_counter()
+    for position, size in areas:
+        scalar.search(position, size)
+    searched = time.perf_counter()
+    print(f"SpatialHash      : insert {n} in {(inserted - start) * 1000:.2f} ms, "
+          f"{queries} searches in {(searched - inserted) * 1000:.2f} ms")
+
+    if np is None:
+        print("ArraySpatialHash : skipped, numpy is not installed")
+        return
+
+    arrays = ArraySpatialHash(cell_size, capacity=n)
+    centers = [(p.x, p.y) for p, _ in areas]
+    sizes = [(s.x, s.y) for _, s in areas]
+
+    # warm up, the first call of some numpy functions imports their modules
+    warm_up = ArraySpatialHash(cell_size)
+    warm_up.add(*areas[0], None)
+    warm_up.search_many(centers[:1], sizes[:1])
+
+    start = time.perf_counter()
+    for i, (position, size) in enumerate(boxes):
+        arrays.add(position, size, i)
+    inserted = time.perf_counter()
+    arrays._rebuild()
+    indexed = time.perf_counter()
+    arrays.search_many(centers, sizes)
+    searched = time.perf_counter()
+    print(f"ArraySpatialHash : insert {n} in {(inserted - start) * 1000:.2f} ms, "
+          f"index in {(indexed - inserted) * 1000:.2f} ms, "
+          f"{queries} searches in {(searched - indexed) * 1000:.2f} ms")
+
+
 if __name__ == '__main__':
     hash = SpatialHash(2)
 
@@ -200,3 +504,5 @@ if __name__ == '__main__':
 
     region = Box(Vector(.5, .5), Vector.Unit() / 2)
     print(hash.search(region.center, region.size, Entity, Obj))
+
+    benchmark()
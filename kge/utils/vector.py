@@ -1,14 +1,26 @@
-from typing import Union, Sequence, Any, List, Tuple
+from array import array
+from typing import Union, Sequence, Any, List, Tuple, Iterable, Iterator
 
 import math
 
+_new_object = object.__new__
+
 
 class Vector:
     """
     A class representing a vector
+
+    Vectors are mutable : 'x' and 'y' can be assigned and 'normalize' works in place,
+    the arithmetic operators always return new vectors
     """
+    __slots__ = ("x", "y")
+
     def __init__(self, arg1: Union["Vector", float, Tuple[float, float], List[float]] = 0.0, arg2: float = 0.0):
-        if isinstance(arg1, Vector):
+        # numbers first, it is the most common case
+        if isinstance(arg1, (int, float)) and isinstance(arg2, (int, float)):
+            self.x = arg1
+            self.y = arg2
+        elif isinstance(arg1, Vector):
             self.x = arg1.x
             self.y = arg1.y
         elif isinstance(arg1, (tuple, list)):
@@ -21,18 +33,25 @@ class Vector:
                     raise TypeError(
                         "Arguments of vectors should be either another Vector, a List or a tuple of two numbers, "
                         "or x and y values")
-        elif isinstance(arg1, (int, float)) and isinstance(arg2, (int, float)):
-            self.x = arg1
-            self.y = arg2
         else:
             raise TypeError(
                 f"Arguments of vectors should be either another Vector, a List or a tuple of two numbers, or x and y "
                 f"values not {type(arg1)}")
 
+    @staticmethod
+    def _new(x: float, y: float) -> "Vector":
+        """
+        Create a vector without checking the arguments, used internally in hot paths
+        """
+        v = _new_object(Vector)
+        v.x = x
+        v.y = y
+        return v
+
     def __eq__(self, other: "Vector"):
         if not isinstance(other, Vector):
             return False
-        return self.x == other[0] and self.y == other[1]
+        return self.x == other.x and self.y == other.y
 
     @classmethod
     def Up(cls) -> "Vector":
@@ -114,7 +133,7 @@ class Vector:
         return Vector(1, 1)
 
     def __abs__(self):
-        return Vector(abs(self.x), abs(self.y))
+        return Vector._new(abs(self.x), abs(self.y))
 
     def __iter__(self):
         yield self.x
@@ -202,7 +221,8 @@ class Vector:
             raise IndexError("Vectors have only two values")
 
     def normalize(self):
-        self.x, self.y = self.normalized().x, self.normalized().y
+        normalized = self.normalized()
+        self.x, self.y = normalized.x, normalized.y
 
     def angle_to(self, other: "Vector"):
         """
@@ -225,20 +245,24 @@ class Vector:
         return str(self)
 
     def __truediv__(self, other: float):
-        return Vector(self.x / other, self.y / other)
+        return Vector._new(self.x / other, self.y / other)
 
     def __rtruediv__(self, other: float):
-        return Vector(other / self.x, other / self.y)
+        return Vector._new(other / self.x, other / self.y)
 
     def __add__(self, other):
+        if type(other) is Vector:
+            return Vector._new(self.x + other.x, self.y + other.y)
         return Vector(self.x + other[0], self.y + other[1])
 
     __radd__ = __add__
 
     def __mul__(self, other: Union[float, "Vector", Sequence[Union[float, int]], Any]):
         if isinstance(other, (float, int)):
-            return Vector(self.x * other, self.y * other)
-        elif isinstance(other, (Vector, tuple, list)):
+            return Vector._new(self.x * other, self.y * other)
+        elif type(other) is Vector:
+            return Vector._new(self.x * other.x, self.y * other.y)
+        elif isinstance(other, (tuple, list)):
             return Vector(self.x * other[0], self.y * other[1])
         else:
             return other * tuple(self)
@@ -246,16 +270,18 @@ class Vector:
     __rmul__ = __mul__
 
     def __sub__(self, other: Union["Vector", Sequence[float]]):
+        if type(other) is Vector:
+            return Vector._new(self.x - other.x, self.y - other.y)
         return Vector(self.x - other[0], self.y - other[1])
 
     def __rsub__(self, other: Union["Vector", Sequence[float]]):
         return other - self
 
     def __neg__(self):
-        return Vector(-self.x, -self.y)
+        return Vector._new(-self.x, -self.y)
 
     def __invert__(self):
-        return Vector(-self.x, -self.y)
+        return Vector._new(-self.x, -self.y)
 
     def rotate(self, angle_d: float):
         """Rotate the vector by 'angle_d' degrees."""
@@ -278,12 +304,145 @@ class Vector:
         sin = math.sin(angle_radians)
         x = self.x * cos - self.y * sin
         y = self.x * sin + self.y * cos
-        return Vector(x, y)
+        return Vector._new(x, y)
 
     def __len__(self):
         return 2
 
 
+class Vec2Array:
+    """
+    A contiguous array of 2D points, stored as interleaved x, y doubles ('array.array').
+
+    Transform whole sets of points at once without allocating a Vector per point,
+    'data' can be given as is to pyglet vertex lists.
+        >>> points = Vec2Array([(0, 0), (1, 0), (1, 1)])
+        >>> points.scale(32).translate(10, 10)
+        >>> vertex_list.vertices = points.data
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, points: Iterable[Union[Vector, Sequence[float]]] = ()):
+        self.data = array("d")
+        self.extend(points)
+
+    @classmethod
+    def from_flat(cls, values: Iterable[float]) -> "Vec2Array":
+        """
+        Create an array from flat values (x1, y1, x2, y2, ...)
+        """
+        points = cls()
+        points.data = array("d", values)
+        if len(points.data) % 2:
+            raise ValueError("Flat values should contain pairs of x and y")
+        return points
+
+    @classmethod
+    def zeros(cls, n: int) -> "Vec2Array":
+        """
+        Create an array of 'n' points at the origin
+        """
+        points = cls()
+        points.data = array("d", bytes(16 * n))
+        return points
+
+    def copy(self) -> "Vec2Array":
+        points = Vec2Array()
+        points.data = array("d", self.data)
+        return points
+
+    def append(self, point: Union[Vector, Sequence[float]]):
+        x, y = point
+        self.data.append(x)
+        self.data.append(y)
+
+    def extend(self, points: Iterable[Union[Vector, Sequence[float]]]):
+        data = self.data
+        for x, y in points:
+            data.append(x)
+            data.append(y)
+
+    def __len__(self):
+        return len(self.data) // 2
+
+    def _index(self, item: int) -> int:
+        n = len(self.data) // 2
+        if item < 0:
+            item += n
+        if not 0 <= item < n:
+            raise IndexError("Vec2Array index out of range")
+        return 2 * item
+
+    def __getitem__(self, item: int) -> Vector:
+        i = self._index(item)
+        return Vector._new(self.data[i], self.data[i + 1])
+
+    def __setitem__(self, item: int, value: Union[Vector, Sequence[float]]):
+        i = self._index(item)
+        self.data[i], self.data[i + 1] = value
+
+    def __iter__(self) -> Iterator[Vector]:
+        it = iter(self.data)
+        new = Vector._new
+        for x, y in zip(it, it):
+            yield new(x, y)
+
+    def __repr__(self):
+        return f"Vec2Array({[tuple(v) for v in self]})"
+
+    @property
+    def xs(self) -> array:
+        """
+        A copy of the x values
+        """
+        return self.data[0::2]
+
+    @property
+    def ys(self) -> array:
+        """
+        A copy of the y values
+        """
+        return self.data[1::2]
+
+    def translate(self, dx: float, dy: float) -> "Vec2Array":
+        """
+        Move all the points in place
+        """
+        data = self.data
+        data[0::2] = array("d", [x + dx for x in data[0::2]])
+        data[1::2] = array("d", [y + dy for y in data[1::2]])
+        return self
+
+    def scale(self, sx: float, sy: float = None) -> "Vec2Array":
+        """
+        Scale all the points in place, 'sy' defaults to 'sx'
+        """
+        if sy is None:
+            sy = sx
+        data = self.data
+        data[0::2] = array("d", [x * sx for x in data[0::2]])
+        data[1::2] = array("d", [y * sy for y in data[1::2]])
+        return self
+
+    def rotate(self, angle_d: float) -> "Vec2Array":
+        """
+        Rotate all the points in place by 'angle_d' degrees around the origin
+        """
+        return self.transform(angle=math.radians(angle_d))
+
+    def transform(self, sx: float = 1., sy: float = 1., angle: float = 0., dx: float = 0., dy: float = 0.) -> "Vec2Array":
+        """
+        Scale, rotate by 'angle' radians then move all the points in place,
+        like the transform of an entity applied to the vertices of its shape
+        """
+        cos, sin = math.cos(angle), math.sin(angle)
+        data = self.data
+        xs, ys = data[0::2], data[1::2]
+        data[0::2] = array("d", [x * sx * cos - y * sy * sin + dx for x, y in zip(xs, ys)])
+        data[1::2] = array("d", [x * sx * sin + y * sy * cos + dy for x, y in zip(xs, ys)])
+        return self
+
+
 if __name__ == '__main__':
     A = Vector(-2, -2)
     B = Vector(2, 2)
@@ -316,4 +475,21 @@ if __name__ == '__main__':
 
     v1 = Vector.Up() * 4
     v2 = Vector.Up() * 4
-    print(v1.lerp(v2, .1), (v1 + v2) * .1)
\ No newline at end of file
+    print(v1.lerp(v2, .1), (v1 + v2) * .1)
+    # Scale 1000 points to pixels, one Vector per point vs one Vec2Array
+    import tracemalloc
+
+    points = [(i, -i) for i in range(1000)]
+    vectors = [Vector(p) for p in points]
+    array_ = Vec2Array(points)
+
+    tracemalloc.start()
+    pixels = [v * 32 for v in vectors]
+    per_vector = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    pixels_array = array_.copy().scale(32)
+    per_array = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"Vectors : {per_vector} bytes, Vec2Array : {per_array} bytes")
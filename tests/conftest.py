@@ -0,0 +1,38 @@
+import os
+
+# import kge without creating a GL context, the tests run without a display
+os.environ.setdefault("KGE_HEADLESS", "1")
+
+import pyglet
+import pytest
+
+import kge
+
+
+@pytest.fixture
+def headless():
+    """
+    Start a headless engine with a setup function, then simulate frames with 'engine.step(frames)'
+        >>> engine = headless(setup)
+        >>> engine.step(60)
+    """
+    engines = []
+
+    def start(setup, **engine_opts) -> kge.Engine:
+        engine = kge.make_engine(setup, headless=True, **engine_opts)
+        engine.__enter__()
+        engines.append(engine)
+        engine.init()
+        pyglet.clock.schedule(engine.loop_once)
+        return engine
+
+    yield start
+
+    for engine in engines:
+        pyglet.clock.unschedule(engine.loop_once)
+        engine.__exit__(None, None, None)
+
+    # services are created once, the next engine provides its own systems
+    for service in kge.ServiceProvider.services.values():
+        type(service).instance = None
+    kge.ServiceProvider.services.clear()
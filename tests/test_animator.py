@@ -0,0 +1,43 @@
+import pytest
+
+from kge import *
+
+
+class CountingAnimator(Animator):
+    """
+    Count its updates
+    """
+    updates = 0
+
+    def update(self, dispatch):
+        self.updates += 1
+
+
+def animated(name: str) -> Entity:
+    entity = Entity(name=name)
+    entity.addComponent(CountingAnimator(Animation(entity, [Frame(opacity=1)], name=name)))
+    return entity
+
+
+def test_every_animator_is_updated(headless):
+    dancers = []
+
+    def setup(scene: Scene):
+        for i in range(3):
+            dancers.append(animated(f"Dancer {i}"))
+            scene.add(dancers[-1])
+
+    engine = headless(setup)
+    engine.current_scene.rendered = True
+    engine.step(3)
+
+    updates = [dancer.getComponent(kind=Animator).updates for dancer in dancers]
+    assert updates[0] > 0
+    assert updates == [updates[0]] * 3
+
+
+def test_an_entity_has_one_animator():
+    # queries give one component of each type per entity, animators rely on it
+    dancer = animated("Dancer")
+    with pytest.raises(AttributeError):
+        dancer.addComponent(CountingAnimator(Animation(dancer, [Frame(opacity=1)], name="blink")))
@@ -0,0 +1,37 @@
+from kge import *
+
+
+def test_large_sprite_with_center_out_of_frame_is_in_frame(headless):
+    sprites = {}
+
+    def setup(scene: Scene):
+        # the centers are out of the frame, only the wide sprite reaches it
+        right = scene.main_camera.frame_right
+        sprites["wide"] = Sprite(name="Wide")
+        sprites["wide"].transform.scale = Vector(20, 1)
+        sprites["small"] = Sprite(name="Small")
+        scene.add(sprites["wide"], Vector(right + 5, 0))
+        scene.add(sprites["small"], Vector(right + 5, 2))
+
+    engine = headless(setup)
+    engine.step(2)
+
+    in_frame = engine.current_scene.entities_in_frame(Sprite)
+    assert sprites["wide"] in in_frame
+    assert sprites["small"] not in in_frame
+
+
+def test_sprite_resized_after_being_added_is_in_frame(headless):
+    sprites = {}
+
+    def setup(scene: Scene):
+        sprites["platform"] = Sprite(name="Platform")
+        scene.add(sprites["platform"], Vector(scene.main_camera.frame_right + 5, 0))
+
+    engine = headless(setup)
+    engine.step(2)
+    scene = engine.current_scene
+    assert sprites["platform"] not in scene.entities_in_frame(Sprite)
+
+    sprites["platform"].transform.scale = Vector(20, 1)
+    assert sprites["platform"] in scene.entities_in_frame(Sprite)
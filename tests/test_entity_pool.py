@@ -0,0 +1,27 @@
+from kge import *
+
+
+def test_entities_destroyed_while_acquired_are_replaced(headless):
+    pools = []
+
+    def setup(scene: Scene):
+        pool = EntityPool(lambda: Entity(name="Bullet"), size=3)
+        pool.fill(scene)
+        pools.append(pool)
+
+    engine = headless(setup)
+    engine.step(2)
+    pool = pools[0]
+
+    bullets = [pool.acquire(), pool.acquire()]
+    bullets[0].destroy()
+    engine.step(1)
+    assert (pool.free, pool.used) == (1, 1)
+
+    # releasing it after its destruction does nothing
+    pool.release(bullets[0])
+    assert (pool.free, pool.used) == (1, 1)
+
+    pool.fill(engine.current_scene)
+    assert (pool.free, pool.used) == (2, 1)
+    assert len(pool) == 3
@@ -0,0 +1,47 @@
+from kge import *
+
+
+class Spawner(Entity):
+    """
+    Add an entity to the scene on each update
+    """
+    spawned = None
+
+    def on_update(self, ev: events.Update, dispatch):
+        entity = Spawner()
+        entity.spawned = self.spawned
+        self.spawned.append(entity)
+        ev.scene.add(entity)
+
+
+def test_handler_assigned_on_instance_is_fired(headless):
+    updates = []
+
+    def setup(scene: Scene):
+        ticker = Entity(name="Ticker")
+        ticker.on_update = lambda ev, dispatch: updates.append(ev)
+        scene.add(ticker)
+
+    engine = headless(setup)
+    # the first frame starts the scene
+    engine.step(4)
+    assert len(updates) == 3
+
+
+def test_entities_added_while_dispatching(headless):
+    spawned = []
+
+    def setup(scene: Scene):
+        spawner = Spawner()
+        spawner.spawned = spawned
+        scene.add(spawner)
+
+    engine = headless(setup)
+    engine.step(4)
+
+    # the entities added by a handler get the event from the next frame on
+    assert len(spawned) == 1 + 2 + 4
+    scene = engine.current_scene
+    update = events.Update(0, scene)
+    assert scene.registered_entities(update) is scene.registered_entities(update)
+    assert len(scene.registered_entities(update)) == 8
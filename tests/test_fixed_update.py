@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+
+from kge import *
+from kge.core.constants import FIXED_DELTA_TIME
+
+
+class Recorder(Behaviour):
+    """
+    Log the fixed updates, with the height of the body seen, and the physics updates
+    """
+    log = None
+
+    def on_fixed_update(self, ev: events.FixedUpdate, dispatch):
+        body = self.entity.getComponent(kind=RigidBody).body
+        self.log.append(("F", None if body is None else body.position.y))
+
+    def on_physics_update(self, ev: events.PhysicsUpdate, dispatch):
+        self.log.append(("P", None))
+
+
+class Box(Entity):
+    """
+    Log the heights of its body seen by its fixed updates
+    """
+    heights = None
+
+    def on_fixed_update(self, ev: events.FixedUpdate, dispatch):
+        body = self.getComponent(kind=RigidBody).body
+        if body is not None:
+            self.heights.append(body.position.y)
+
+
+def falling(log, heights=None):
+    def setup(scene: Scene):
+        box = Box(name="Box")
+        box.heights = [] if heights is None else heights
+        box.addComponent(RigidBody())
+        box.addComponent(BoxCollider())
+        recorder = Recorder()
+        recorder.log = log
+        box.addComponent(recorder)
+        scene.add(box, Vector(0, 10))
+
+    return setup
+
+
+def test_fixed_updates_are_interleaved_with_physics_steps(headless):
+    log, heights = [], []
+    engine = headless(falling(log, heights))
+    engine.step(5)
+
+    # three fixed steps per frame
+    engine.time_step = 3 * FIXED_DELTA_TIME
+    del log[:], heights[:]
+    engine.step(4)
+
+    assert len(log) == 24
+    assert [kind for kind, _ in log] == ["F", "P"] * 12
+
+    # each fixed update sees the body moved by the step before it
+    for seen in ([y for kind, y in log if kind == "F"], heights):
+        assert len(seen) == 12
+        assert all(a > b for a, b in zip(seen, seen[1:]))
+
+
+def test_interpolation_alpha_is_set_after_the_steps(headless):
+    engine = headless(falling([]))
+    engine.step(5)
+
+    engine.time_step = 2.5 * FIXED_DELTA_TIME
+    engine.step(1)
+    assert abs(engine.interpolation_alpha - .5) < 1e-6
+
+
+@dataclass
+class Ping(Event):
+    scene: Scene = None
+
+
+class Pinger(Entity):
+    """
+    Dispatch a Ping (for the next frame) on each fixed update
+    """
+    log = None
+
+    def on_fixed_update(self, ev: events.FixedUpdate, dispatch):
+        self.log.append("A")
+        dispatch(Ping())
+        self.log.append("A done")
+
+
+class Listener(Entity):
+    log = None
+
+    def on_fixed_update(self, ev: events.FixedUpdate, dispatch):
+        self.log.append("B")
+
+    def on_ping(self, ev: Ping, dispatch):
+        self.log.append("Ping")
+
+
+def test_events_dispatched_by_fixed_updates_are_queued(headless):
+    log = []
+
+    def setup(scene: Scene):
+        pinger = Pinger()
+        pinger.log = log
+        listener = Listener()
+        listener.log = log
+        scene.add(pinger)
+        scene.add(listener)
+
+    engine = headless(setup)
+    engine.time_step = FIXED_DELTA_TIME
+    engine.step(5)
+
+    # the fixed updates of a step all run before the pings they dispatched
+    first = log.index("A")
+    assert log[first:first + 3] == ["A", "A done", "B"]
+    assert "Ping" in log[first + 3:]
+    assert log.count("Ping") <= log.count("A")
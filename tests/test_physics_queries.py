@@ -0,0 +1,44 @@
+from kge import *
+
+
+def walls(scene: Scene):
+    for i, position in enumerate((Vector(5, 0), Vector(0, 5), Vector(-5, -5))):
+        wall = Entity(name=f"Wall {i}")
+        wall.addComponent(RigidBody(RigidBodyType.STATIC))
+        wall.addComponent(BoxCollider())
+        scene.add(wall, position)
+
+
+def test_ray_cast_many_hits_like_ray_cast(headless):
+    engine = headless(walls)
+    engine.step(5)
+
+    origins = [Vector(0, 0), Vector(0, 0), Vector(0, 0)]
+    directions = [Vector(1, 0), Vector(0, 1), Vector(-1, 0)]
+    batch = Physics.ray_cast_many(origins, directions, 20)
+
+    assert batch.hits == 2
+    for (collider, point, normal), origin, direction in zip(batch, origins, directions):
+        single = Physics.ray_cast(origin, direction, 20)
+        assert collider is single.collider
+        if collider is not None:
+            assert (point.x, point.y) == (single.point.x, single.point.y)
+            assert (normal.x, normal.y) == (single.normal.x, single.normal.y)
+
+    wall, point, normal = batch[0]
+    assert wall.entity.name == "Wall 0"
+    assert (point.x, point.y) == (4.5, 0)
+    assert (normal.x, normal.y) == (-1, 0)
+
+
+def test_batched_region_queries_find_like_single_queries(headless):
+    engine = headless(walls)
+    engine.step(5)
+
+    centers = [Vector(5, 0), Vector(2, 2), Vector(-5, -5)]
+    found = Physics.query_regions(centers, [Vector(2, 2)] * 3)
+    assert [[c.entity.name for c in colliders] for colliders in found] == [["Wall 0"], [], ["Wall 2"]]
+    assert found == [Physics.query_region(c, Vector(2, 2)).colliders for c in centers]
+
+    overlaps = Physics.overlap_circles(centers, 1)
+    assert overlaps == [Physics.overlap_circle(c, 1).colliders for c in centers]
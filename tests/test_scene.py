@@ -0,0 +1,59 @@
+import pytest
+
+from kge import *
+
+
+class Watcher(Behaviour):
+    """
+    Log the enable seen by the component
+    """
+    log = None
+
+    def on_enable_entity(self, ev: events.EnableEntity, dispatch):
+        if ev.entity is self.entity:
+            self.log.add(("EnableEntity", self.entity.name))
+
+
+class Crate(Entity):
+    """
+    Log when its rigid body is enabled
+    """
+    log = None
+
+    def __init__(self, **_):
+        super().__init__()
+
+    def on_entity_enabled(self, ev: events.EntityEnabled, dispatch):
+        self.log.add(("EntityEnabled", self.name))
+
+
+def crates(log, bulk):
+    def setup(scene: Scene):
+        entities = []
+        for i in range(3):
+            crate = Crate(name=f"Crate {i}")
+            crate.log = log
+            crate.addComponent(RigidBody())
+            crate.addComponent(BoxCollider())
+            watcher = Watcher()
+            watcher.log = log
+            crate.addComponent(watcher)
+            entities.append((crate, Vector(i * 2, 0), 0))
+
+        if bulk:
+            scene.addAll(*entities)
+        else:
+            for crate, position, layer in entities:
+                scene.add(crate, position, layer)
+
+    return setup
+
+
+@pytest.mark.parametrize("bulk", [False, True], ids=["add", "addAll"])
+def test_added_entities_are_enabled(headless, bulk):
+    log = set()
+    engine = headless(crates(log, bulk))
+    engine.step(3)
+
+    # the same events as 'add', for every entity
+    assert log == {(kind, f"Crate {i}") for kind in ("EnableEntity", "EntityEnabled") for i in range(3)}
@@ -0,0 +1,46 @@
+from collections import deque
+
+from kge.core.scheduler import FrameScheduler
+
+
+class Engine:
+    """
+    The part of the engine used by the scheduler, events are logged when dispatched
+    """
+
+    def __init__(self, *events):
+        self._event_queue = deque(events)
+        self.log = []
+        self.reactions = {}
+
+    def dispatch_event(self, event, on_main=False):
+        self.log.append(event)
+        for reaction in self.reactions.get(event, ()):
+            reaction()
+
+
+def test_events_are_dispatched_in_order():
+    engine = Engine("FixedUpdate 1", "PhysicsUpdate 1", "FixedUpdate 2", "PhysicsUpdate 2")
+    FrameScheduler(engine).run_frame()
+    assert engine.log == ["FixedUpdate 1", "PhysicsUpdate 1", "FixedUpdate 2", "PhysicsUpdate 2"]
+
+
+def test_immediate_events_are_dispatched_next():
+    engine = Engine("DestroyEntity", "Update", "LateUpdate")
+    engine.reactions["DestroyEntity"] = [lambda: engine._event_queue.appendleft("EntityDestroyed")]
+
+    scheduler = FrameScheduler(engine)
+    scheduler.run_frame()
+    assert engine.log == ["DestroyEntity", "EntityDestroyed", "Update", "LateUpdate"]
+    assert scheduler.events_per_frame == 4
+
+
+def test_replaced_queue_is_read():
+    engine = Engine("StopScene", "Update")
+
+    def flush():
+        engine._event_queue = deque(["SceneStopped"])
+
+    engine.reactions["StopScene"] = [flush]
+    FrameScheduler(engine).run_frame()
+    assert engine.log == ["StopScene", "SceneStopped"]
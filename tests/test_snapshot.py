@@ -0,0 +1,59 @@
+import pytest
+
+from kge import *
+
+
+def stack(scene: Scene):
+    ground = Entity(name="Ground")
+    ground.scale = Vector(20, 1)
+    ground.addComponent(RigidBody(RigidBodyType.STATIC))
+    ground.addComponent(BoxCollider())
+    scene.add(ground, Vector(0, -3))
+
+    for i in range(5):
+        box = Entity(name=f"Box {i}")
+        box.addComponent(RigidBody())
+        box.addComponent(BoxCollider())
+        scene.add(box, Vector(i * .7 - 1.5, i * 1.2))
+
+
+def positions(scene: Scene):
+    return {e.name: tuple(e.getComponent(kind=RigidBody).body.position) for e in scene.all}
+
+
+@pytest.mark.parametrize("rebuild", [False, True])
+def test_restore_simulates_the_same_steps(headless, rebuild):
+    engine = headless(stack)
+    engine.step(30)
+    scene = engine.current_scene
+
+    recorder = SnapshotRecorder(scene, rebuild=rebuild)
+    snapshot = recorder.snapshot()
+    engine.step(40)
+    first = positions(scene)
+
+    recorder.restore(snapshot)
+    engine.step(40)
+    second = positions(scene)
+
+    recorder.restore(snapshot)
+    engine.step(40)
+    assert positions(scene) == second
+    if rebuild:
+        # the world rebuilt by the snapshot is the one rebuilt by the restore
+        assert first == second
+
+
+def test_restore_puts_back_the_bodies(headless):
+    engine = headless(stack)
+    engine.step(10)
+    scene = engine.current_scene
+
+    recorder = SnapshotRecorder(scene)
+    snapshot = recorder.snapshot()
+    before = positions(scene)
+    engine.step(20)
+    assert positions(scene) != before
+
+    recorder.restore(snapshot)
+    assert positions(scene) == before
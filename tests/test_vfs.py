@@ -0,0 +1,34 @@
+import pytest
+
+import kge.resources.vfs as vfs
+from kge.resources.pack import write_pack
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / "assets.kpack"
+    write_pack(path, [("sprites/player.png", b"player"), ("sounds/jump.wav", b"jump")])
+    yield path
+    vfs._packs.clear()
+
+
+def test_unmount_with_open_file_keeps_pack_mounted(pack_path):
+    pack = vfs.mount(pack_path)
+    file = vfs.open("sprites/player.png")
+
+    with pytest.raises(BufferError):
+        vfs.unmount(pack)
+    assert vfs.find("sprites/player.png") is pack
+    assert file.read() == b"player"
+    with vfs.open("sounds/jump.wav") as other:
+        assert other.read() == b"jump"
+
+    file.close()
+    vfs.unmount(pack)
+    assert vfs.find("sprites/player.png") is None
+
+
+def test_unmount_by_path(pack_path):
+    vfs.mount(pack_path)
+    vfs.unmount(str(pack_path))
+    assert vfs.find("sounds/jump.wav") is None